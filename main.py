@@ -3,12 +3,18 @@ import sys
 import math
 from enum import Enum
 import random
+import numpy as np
+
+from src.systems.projectile_system import ProjectilePool
 
 # Game Constants
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 FPS = 60
 GRAVITY = 0.5
 
+# Shared by every fighter
+PROJECTILES = ProjectilePool(capacity=4096)
+
 # Character Classes
 class CharacterClass(Enum):
     SHADOW = 1
@@ -17,31 +23,6 @@ class CharacterClass(Enum):
     MAGE = 4
     BERSERKER = 5
 
-class Projectile:
-    def __init__(self, x, y, direction, speed, damage, owner):
-        self.x = x
-        self.y = y
-        self.direction = direction
-        self.speed = speed
-        self.damage = damage
-        self.owner = owner
-        self.lifetime = 60  # frames until disappearance
-    
-    def update(self):
-        self.x += self.speed * self.direction
-        self.lifetime -= 1
-        return self.lifetime > 0
-    
-    def draw(self, screen):
-        pygame.draw.line(screen, (100, 100, 100), 
-                         (self.x, self.y), 
-                         (self.x - 15 * self.direction, self.y), 2)
-        pygame.draw.polygon(screen, (200, 200, 200), [
-            (self.x, self.y - 3),
-            (self.x, self.y + 3),
-            (self.x + 10 * self.direction, self.y)
-        ])
-
 class StickFighter:
     def __init__(self, x, y, char_class):
         self.x = x
@@ -53,7 +34,6 @@ class StickFighter:
         self.health = 100
         self.stamina = 100
         self.char_class = char_class
-        self.projectiles = []
         self.setup_class_attributes()
         
     def setup_class_attributes(self):
@@ -84,14 +64,14 @@ class StickFighter:
         
         # Archer shoots projectile
         if self.char_class == CharacterClass.ARCHER:
-            self.projectiles.append(Projectile(
+            PROJECTILES.spawn(
                 self.x + (30 if self.facing_right else -30),
                 self.y - 20,
                 direction,
                 10,
                 15,
                 self
-            ))
+            )
             return None
             
         return pygame.Rect(
@@ -117,20 +97,16 @@ class StickFighter:
             )
         elif self.special_ability == "rapid_fire" and self.char_class == CharacterClass.ARCHER:
             direction = 1 if self.facing_right else -1
-            for i in range(self.arrow_count):
-                self.projectiles.append(Projectile(
-                    self.x + (30 if self.facing_right else -30),
-                    self.y - 20 - i*10,
-                    direction,
-                    12,
-                    10,
-                    self
-                ))
+            PROJECTILES.spawn_many(
+                self.x + (30 if self.facing_right else -30),
+                self.y - 20 - np.arange(self.arrow_count) * 10,
+                direction,
+                12,
+                10,
+                self
+            )
     
     def update(self):
-        # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update()]
-        
         # Apply gravity
         self.vel_y += GRAVITY
         
@@ -179,6 +155,17 @@ class Game:
         else:
             self.player.move(0)
     
+    def update_projectiles(self):
+        """Move all projectiles and apply their hits in one batch"""
+        PROJECTILES.update()
+        fighters = (self.player, self.enemy)
+        damage = PROJECTILES.collide(fighters, [
+            (f.x - 15, f.y - 55, 30, 85) for f in fighters
+        ])
+        for fighter, amount in zip(fighters, damage):
+            if amount:
+                fighter.health = max(0, fighter.health - amount)
+    
     def draw(self):
         self.screen.fill((240, 240, 245))  # Light gray background
         
@@ -186,8 +173,7 @@ class Game:
         pygame.draw.rect(self.screen, (50, 50, 50), (0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100))
         
         # Draw projectiles
-        for projectile in self.player.projectiles + self.enemy.projectiles:
-            projectile.draw(self.screen)
+        PROJECTILES.draw(self.screen)
         
         # Draw fighters
         self.draw_fighter(self.player)
@@ -245,6 +231,7 @@ class Game:
             # Update game state
             self.player.update()
             self.enemy.update()
+            self.update_projectiles()
             
             # Simple AI for enemy
             if random.random() < 0.02:
@@ -1,17 +1,22 @@
 """Health component for fighters"""
-from dataclasses import dataclass
+from .store import ColumnField
 
-@dataclass
 class HealthComponent:
-    max_health: int
-    current_health: int = None
-    
-    def __post_init__(self):
-        self.current_health = self.current_health or self.max_health
-        
+    """View over an entity's health columns in a ComponentStore"""
+    current_health = ColumnField("health")
+    max_health = ColumnField("max_health")
+    regen = ColumnField("regen")
+    dead = ColumnField("dead", bool)
+
+    def __init__(self, max_health, current_health=None, *, store, entity=None):
+        self.store = store
+        self.entity = self.store.create() if entity is None else entity
+        self.max_health = max_health
+        self.current_health = current_health or max_health
+
     def take_damage(self, amount):
         self.current_health = max(0, self.current_health - amount)
         return self.current_health <= 0
-        
+
     def heal(self, amount):
         self.current_health = min(self.max_health, self.current_health + amount)
@@ -0,0 +1,104 @@
+"""Array-backed component storage
+
+Health and weapon data for every entity live in typed NumPy columns
+indexed by entity id; HealthComponent and WeaponComponent are thin views
+over one row. Per-frame systems run over whole columns at once, or over
+just the rows of the entities that are due to update.
+"""
+import numpy as np
+
+# Column name -> dtype
+COLUMNS = {
+    # Health
+    "health": np.float32,
+    "max_health": np.float32,
+    "regen": np.float32,       # Heal-over-time per frame
+    "dead": np.bool_,
+    # Weapon
+    "cooldown": np.int32,
+    "cooldown_max": np.int32,
+    "damage": np.float32,
+    "range": np.float32
+}
+
+class ComponentStore:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.alive = np.zeros(capacity, dtype=np.bool_)
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.count = 0  # One past the highest entity id handed out
+        self._free = []
+
+    def create(self):
+        """Allocate an entity id with zeroed components"""
+        if self._free:
+            entity = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow(self.capacity * 2)
+            entity = self.count
+            self.count += 1
+        for name in COLUMNS:
+            getattr(self, name)[entity] = 0
+        self.alive[entity] = True
+        return entity
+
+    def release(self, entity):
+        self.alive[entity] = False
+        self._free.append(entity)
+
+    def _grow(self, capacity):
+        def grown(column):
+            bigger = np.zeros(capacity, dtype=column.dtype)
+            bigger[:len(column)] = column
+            return bigger
+        self.alive = grown(self.alive)
+        for name in COLUMNS:
+            setattr(self, name, grown(getattr(self, name)))
+        self.capacity = capacity
+
+    # Systems; rows limits them to an array of entity ids, all entities by default
+
+    def tick_cooldowns(self, rows=None):
+        if rows is None:
+            cooldown = self.cooldown[:self.count]
+            np.subtract(cooldown, 1, out=cooldown, where=cooldown > 0)
+        else:
+            cooldown = self.cooldown[rows]
+            self.cooldown[rows] = cooldown - (cooldown > 0)
+
+    def apply_regen(self, rows=None):
+        rows = slice(0, self.count) if rows is None else rows
+        health = self.health[rows]
+        healing = self.alive[rows] & ~self.dead[rows] & (self.regen[rows] > 0)
+        self.health[rows] = np.where(healing, np.minimum(health + self.regen[rows], self.max_health[rows]),
+                                     health)
+
+    def check_deaths(self, rows=None):
+        """Mark and return entities whose health just reached zero"""
+        ids = np.arange(self.count) if rows is None else np.asarray(rows)
+        has_health = self.max_health[ids] > 0
+        died = self.alive[ids] & has_health & ~self.dead[ids] & (self.health[ids] <= 0)
+        self.dead[ids[died]] = True
+        return ids[died]
+
+    def update(self, rows=None):
+        """Run every per-frame component system; returns newly dead entities"""
+        self.tick_cooldowns(rows)
+        self.apply_regen(rows)
+        return self.check_deaths(rows)
+
+class ColumnField:
+    """Descriptor exposing one store column as a component attribute"""
+    def __init__(self, column, cast=float):
+        self.column = column
+        self.cast = cast
+
+    def __get__(self, component, owner=None):
+        if component is None:
+            return self
+        return self.cast(getattr(component.store, self.column)[component.entity])
+
+    def __set__(self, component, value):
+        getattr(component.store, self.column)[component.entity] = value
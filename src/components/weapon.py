@@ -2,7 +2,8 @@
 import pygame
 import random
 from enum import Enum
-from dataclasses import dataclass
+
+from .store import ColumnField
 
 class WeaponType(Enum):
     SWORD = 1
@@ -11,20 +12,29 @@ class WeaponType(Enum):
     WHIP = 4
     GUN = 5
 
-@dataclass
-class WeaponTrail:
-    points: list
-    color: tuple
-    lifetime: int
+# Trail points kept per weapon; one point per frame, so this is also the lifetime
+TRAIL_LENGTHS = {
+    WeaponType.SWORD: 12,
+    WeaponType.HAMMER: 8,
+    WeaponType.SPEAR: 20,
+    WeaponType.WHIP: 32,
+    WeaponType.GUN: 6
+}
+TRAIL_FADE_LEVELS = 16
 
-@dataclass
 class WeaponComponent:
-    weapon_type: WeaponType
-    damage: int = 10
-    range: float = 50.0
-    cooldown: int = 0
+    """Weapon view over ComponentStore columns; trails stay on the object"""
+    damage = ColumnField("damage")
+    range = ColumnField("range")
+    cooldown = ColumnField("cooldown", int)
+    cooldown_max = ColumnField("cooldown_max", int)
     
-    def __post_init__(self):
+    def __init__(self, weapon_type, store, entity=None):
+        self.weapon_type = weapon_type
+        self.store = store
+        self.entity = self.store.create() if entity is None else entity
+        self.cooldown = 0
+        
         # Set weapon-specific properties
         if self.weapon_type == WeaponType.SWORD:
             self.damage = 15
@@ -51,17 +61,32 @@ class WeaponComponent:
             self.range = 200
             self.cooldown_max = 60
             self.trail_color = (255, 255, 100)
+        
+        # Fixed-capacity ring buffer of trail points
+        self.trail_capacity = TRAIL_LENGTHS[self.weapon_type]
+        self.trail_lifetime = self.trail_capacity  # Frames a point lives; <= capacity
+        self._trail_x = [0.0] * self.trail_capacity
+        self._trail_y = [0.0] * self.trail_capacity
+        self._trail_born = [0] * self.trail_capacity
+        self._trail_head = 0  # Oldest point
+        self._trail_count = 0
+        self._trail_clock = 0
+        
+        # Scratch polyline and fade palette reused by draw_trails
+        self._trail_points = [[0, 0] for _ in range(self.trail_capacity)]
+        self._trail_palette = [
+            tuple(int(c * (i + 1) / TRAIL_FADE_LEVELS) for c in self.trail_color)
+            for i in range(TRAIL_FADE_LEVELS)
+        ]
     
     def update(self):
-        """Update weapon state"""
-        if self.cooldown > 0:
-            self.cooldown -= 1
-        
-        # Update trails
-        for trail in self.trails[:]:
-            trail.lifetime -= 1
-            if trail.lifetime <= 0:
-                self.trails.remove(trail)
+        """Update weapon visuals (cooldowns tick in ComponentStore.update)"""
+        # Age trails by advancing the head past expired points
+        self._trail_clock += 1
+        while (self._trail_count
+               and self._trail_clock - self._trail_born[self._trail_head] >= self.trail_lifetime):
+            self._trail_head = (self._trail_head + 1) % self.trail_capacity
+            self._trail_count -= 1
     
     def start_attack(self):
         """Initiate weapon attack"""
@@ -72,25 +97,78 @@ class WeaponComponent:
         return False
     
     def add_trail(self, start_pos, end_pos):
-        """Add visual trail effect"""
-        self.trails.append(WeaponTrail(
-            points=[start_pos, end_pos],
-            color=self.trail_color,
-            lifetime=10
-        ))
+        """Add visual trail effect (start_pos seeds an empty trail)"""
+        if self._trail_count == 0:
+            self._push_trail_point(start_pos)
+        self._push_trail_point(end_pos)
+    
+    def _push_trail_point(self, pos):
+        capacity = self.trail_capacity
+        if self._trail_count == capacity:
+            # Full: overwrite the oldest point
+            self._trail_head = (self._trail_head + 1) % capacity
+            self._trail_count -= 1
+        tail = (self._trail_head + self._trail_count) % capacity
+        self._trail_x[tail] = pos[0]
+        self._trail_y[tail] = pos[1]
+        self._trail_born[tail] = self._trail_clock
+        self._trail_count += 1
+    
+    def set_trail_scale(self, scale):
+        """Shorten trail lifetime for lower effect quality"""
+        self.trail_lifetime = max(2, min(self.trail_capacity, round(self.trail_capacity * scale)))
+    
+    def clear_trails(self):
+        self._trail_head = 0
+        self._trail_count = 0
+    
+    def draw_trails(self, surface, camera_offset, view=None):
+        """Draw the trail as one polyline, faded by the age of its newest point.
+        
+        With a world-space view rect, trails entirely outside it are skipped.
+        """
+        count = self._trail_count
+        if count < 2:
+            return
+        capacity = self.trail_capacity
+        points = self._trail_points
+        ox, oy = camera_offset
+        index = self._trail_head
+        min_x = min_y = float("inf")
+        max_x = max_y = float("-inf")
+        for i in range(count):
+            x = self._trail_x[index]
+            y = self._trail_y[index]
+            min_x, max_x = min(min_x, x), max(max_x, x)
+            min_y, max_y = min(min_y, y), max(max_y, y)
+            point = points[i]
+            point[0] = x + ox
+            point[1] = y + oy
+            index = (index + 1) % capacity
+        if view is not None and (max_x < view.left or min_x > view.right
+                                 or max_y < view.top or min_y > view.bottom):
+            return
+        # Pad with the newest point so the scratch list never changes length
+        last = points[count - 1]
+        for i in range(count, capacity):
+            points[i][0] = last[0]
+            points[i][1] = last[1]
+        pygame.draw.lines(surface, self._trail_fade_color(), False, points, 3)
+    
+    def trail_snapshot(self):
+        """(world points, color) of the current trail for a frame snapshot, or None"""
+        count = self._trail_count
+        if count < 2:
+            return None
+        capacity = self.trail_capacity
+        head = self._trail_head
+        points = tuple((self._trail_x[(head + i) % capacity], self._trail_y[(head + i) % capacity])
+                       for i in range(count))
+        return points, self._trail_fade_color()
     
-    def draw_trails(self, surface, camera_offset):
-        """Draw weapon trails"""
-        for trail in self.trails:
-            if len(trail.points) >= 2:
-                adjusted_points = [
-                    (p[0] + camera_offset[0], p[1] + camera_offset[1])
-                    for p in trail.points
-                ]
-                pygame.draw.line(
-                    surface,
-                    trail.color,
-                    adjusted_points[0],
-                    adjusted_points[1],
-                    3
-                )
+    def _trail_fade_color(self):
+        """Palette entry for the age of the newest point"""
+        newest = (self._trail_head + self._trail_count - 1) % self.trail_capacity
+        freshness = 1 - (self._trail_clock - self._trail_born[newest]) / self.trail_lifetime
+        level = max(0, min(TRAIL_FADE_LEVELS - 1, int(freshness * TRAIL_FADE_LEVELS)))
+        return self._trail_palette[level]
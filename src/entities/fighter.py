@@ -6,27 +6,39 @@ from dataclasses import dataclass
 
 # Local imports
 from ..components.health import HealthComponent
-from ..components.weapon import WeaponComponent
+from ..components.weapon import WeaponComponent, WeaponType
+from ..components.store import ComponentStore
 
 @dataclass
 class FighterState:
     grounded: bool = False
     attacking: bool = False
     fast_falling: bool = False
+    is_stunned: bool = False
+    stamina: float = 100
+    recovery_frames: int = 0
 
 class Fighter:
-    def __init__(self, x, y, is_player=False):
+    def __init__(self, x, y, is_player=False, name=None, store=None):
         self.x = x
         self.y = y
         self.vel_x = 0
         self.vel_y = 0
         self.is_player = is_player
+        self.name = name  # Key into data/fighters.json, if any
+        self.facing = 1 if is_player else -1
+        self.combat_id = -1  # Assigned by CombatSystem.register
         
-        # Initialize components
-        self.health = HealthComponent(max_health=100)
+        # Initialize components; both share one entity row in the store.
+        # Without a shared store the fighter owns one and updates it itself.
+        self.owns_store = store is None
+        self.store = store or ComponentStore(capacity=1)
+        self.entity = self.store.create()
+        self.health = HealthComponent(max_health=100, store=self.store, entity=self.entity)
         self.weapon = WeaponComponent(
-            weapon_type=WeaponComponent.WeaponType.SWORD if is_player 
-                      else WeaponComponent.WeaponType.HAMMER
+            weapon_type=WeaponType.SWORD if is_player 
+                      else WeaponType.HAMMER,
+            store=self.store, entity=self.entity
         )
         
         # Initialize state
@@ -36,14 +48,28 @@ class Fighter:
         self.physics = {
             "gravity": 0.5,
             "acceleration": 0.2,
-            "max_speed": 5
+            "max_speed": 5,
+            "jump_force": 10
         }
     
-    def update(self):
+    @property
+    def hitbox(self):
+        return pygame.Rect(self.x - 15, self.y - 30, 30, 60)
+    
+    def update(self, stage=None):
+        if self.state.recovery_frames > 0:
+            self.state.recovery_frames -= 1
+        if self.owns_store:
+            self.store.update()
+        self.weapon.update()
+        
         # Apply gravity
         if not self.state.grounded:
             self.vel_y += self.physics["gravity"]
         
-        # Update position
-        self.x += self.vel_x
-        self.y += self.vel_y
+        # Update position, stopping at stage geometry
+        if stage is None:
+            self.x += self.vel_x
+            self.y += self.vel_y
+        else:
+            self.state.grounded = stage.move_body(self)
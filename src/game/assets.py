@@ -0,0 +1,301 @@
+"""Background asset preloading with an on-disk surface cache
+
+Everything a match needs (baked backgrounds, the sprite atlas, fonts,
+sounds and hitbox masks) is built on a worker thread while the menu is
+up. Baked surfaces are stored as raw RGBA buffers plus a JSON manifest
+under a versioned cache directory, so later launches memory-map them
+instead of redrawing. The worker only does file I/O and decoding;
+display-format conversion and anything SDL wants created on the main
+thread (fonts, the mixer) happen in pump(), spread over menu frames.
+"""
+import hashlib
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+ASSET_VERSION = 1
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache", "assets"
+)
+
+# (name, size, bold) warmed by the preloader
+FONTS = (
+    ('Arial', 16, False), ('Arial', 20, True), ('Arial', 24, False),
+    ('Arial', 24, True), ('Arial', 32, False), ('Arial', 64, True)
+)
+
+_fonts = {}
+_fonts_lock = threading.Lock()
+
+def get_font(name, size, bold=False):
+    """Shared SysFont instance; building one scans system fonts, so never do it per frame"""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        with _fonts_lock:
+            font = _fonts.get(key)
+            if font is None:
+                font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+def _to_bytes(surface):
+    tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+    return tobytes(surface, "RGBA")
+
+class SurfaceCache:
+    """Raw RGBA surfaces keyed by name, invalidated by a parameter key"""
+    def __init__(self, directory=CACHE_DIR, version=ASSET_VERSION):
+        self.directory = os.path.join(directory, f"v{version}")
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    @staticmethod
+    def key_for(*params):
+        return hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+
+    def load(self, name, key):
+        """Memory-mapped (surface, meta), or None if missing or stale"""
+        entry = self.manifest.get(name)
+        if not entry or entry["key"] != key:
+            return None
+        width, height = entry["size"]
+        try:
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                # Copy-on-write so frombuffer gets a writable buffer without touching the file
+                pixels = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+        if len(pixels) != width * height * 4:
+            pixels.close()
+            return None
+        surface = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+        # frombuffer does not own the memory; keep the map alive with the surface
+        return surface, entry.get("meta"), pixels
+
+    def store(self, name, key, surface, meta=None):
+        filename = f"{name}-{key}.rgba"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, filename)
+            with open(path + ".tmp", "wb") as f:
+                f.write(_to_bytes(surface))
+            os.replace(path + ".tmp", path)
+            with self._lock:
+                old = self.manifest.get(name)
+                self.manifest[name] = {
+                    "key": key, "file": filename,
+                    "size": list(surface.get_size()), "meta": meta
+                }
+                with open(self.manifest_path + ".tmp", "w") as f:
+                    json.dump(self.manifest, f, indent=1)
+                os.replace(self.manifest_path + ".tmp", self.manifest_path)
+            if old and old["file"] != filename:
+                os.remove(os.path.join(self.directory, old["file"]))
+        except OSError as e:
+            print(f"Could not cache asset {name}: {e}")
+
+class AssetPreloader:
+    """Runs asset jobs on a worker thread and finishes surfaces on the main thread.
+
+    Jobs are added before start(); results end up in assets by name.
+    """
+    def __init__(self, cache=None):
+        self.cache = cache or SurfaceCache()
+        self.assets = {}
+        self.timings = {}  # Job name -> worker milliseconds
+        self.errors = {}
+        self._jobs = []
+        self._finishing = queue.Queue()
+        self._done = threading.Event()
+        self._completed = 0
+        self._thread = None
+
+    def add(self, name, loader, finish=None):
+        """Plain job; loader() runs on the worker.
+
+        The result is stored as is, or passed through finish(result) on the
+        main thread when given.
+        """
+        self._jobs.append((name, loader, finish, False))
+
+    def add_surface(self, name, params, builder, finish=None):
+        """Cached surface job.
+
+        builder() returns (surface, meta) with a JSON-able meta and is only
+        called on a cache miss. On the main thread the surface is converted
+        to the display format, then finish(surface, meta) may turn it into
+        the stored asset.
+        """
+        key = SurfaceCache.key_for(name, params)
+        self._jobs.append((name, (key, builder), finish or (lambda surface, meta: surface), True))
+
+    @property
+    def progress(self):
+        total = len(self._jobs)
+        return self._completed / total if total else 1.0
+
+    @property
+    def ready(self):
+        return self._done.is_set() and self._finishing.empty()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._work, name="asset-preloader", daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        for name, job, finish, is_surface in self._jobs:
+            start = time.perf_counter()
+            try:
+                if is_surface:
+                    self._finishing.put((name, self._build_surface(name, *job), finish, True))
+                elif finish is None:
+                    self.assets[name] = job()
+                    self._completed += 1
+                else:
+                    self._finishing.put((name, job(), finish, False))
+            except Exception as e:  # One bad asset should not take down the menu
+                print(f"Asset {name} failed: {e}")
+                self.errors[name] = e
+                self._completed += 1
+            self.timings[name] = (time.perf_counter() - start) * 1000
+        self._done.set()
+
+    def _build_surface(self, name, key, builder):
+        cached = self.cache.load(name, key)
+        if cached is not None:
+            return cached
+        surface, meta = builder()
+        self.cache.store(name, key, surface, meta)
+        return surface, meta, None
+
+    def pump(self, budget_ms=2.0):
+        """Finish queued jobs on the main thread until the budget is spent"""
+        deadline = time.perf_counter() + budget_ms / 1000
+        while time.perf_counter() < deadline:
+            try:
+                name, result, finish, is_surface = self._finishing.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if is_surface:
+                    self.assets[name] = self._finish_surface(name, *result, finish)
+                else:
+                    self.assets[name] = finish(result)
+            except Exception as e:
+                print(f"Asset {name} failed: {e}")
+                self.errors[name] = e
+            self._completed += 1
+
+    def _finish_surface(self, name, surface, meta, pixels, finish):
+        if pygame.display.get_surface() is not None:
+            # Converted copies no longer need the mapped file
+            surface = surface.convert_alpha()
+            if pixels is not None:
+                pixels.close()
+        elif pixels is not None:
+            self.assets[name + ".pixels"] = pixels
+        return finish(surface, meta)
+
+    def wait(self, timeout=None):
+        """Block until every job is done and finished; returns assets"""
+        self._done.wait(timeout)
+        while not self._finishing.empty():
+            self.pump(budget_ms=float("inf"))
+        return self.assets
+
+# Standard match assets
+
+def bake_arena_background(size, floor_height=50):
+    """Arena backdrop with the gradient floor drawn once"""
+    width, height = size
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 255))
+    for y in range(height - floor_height, height):
+        shade = 30 + (y - (height - floor_height))
+        pygame.draw.line(surface, (shade, shade, shade + 20, 255), (0, y), (width, y))
+    return surface, None
+
+def bake_sprite_atlas(glow_colors):
+    """Projectile sprites and per-class head glows packed in one row"""
+    from ..systems.projectile_system import ProjectileKind, render_sprite
+
+    sprites = []  # (name, surface, offset)
+    for kind in ProjectileKind:
+        for direction in (1, -1):
+            surface, offset = render_sprite(kind, direction)
+            sprites.append((f"projectile:{int(kind)}:{direction}", surface, offset))
+    for name, color in glow_colors:
+        glow = pygame.Surface((24, 24), pygame.SRCALPHA)
+        pygame.draw.circle(glow, (*color, 50), (12, 12), 12)
+        sprites.append((f"glow:{name}", glow, (-12, -12)))
+
+    width = sum(s.get_width() for _, s, _ in sprites)
+    height = max(s.get_height() for _, s, _ in sprites)
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    meta = {}
+    x = 0
+    for name, surface, offset in sprites:
+        atlas.blit(surface, (x, 0))
+        meta[name] = [x, 0, surface.get_width(), surface.get_height(), *offset]
+        x += surface.get_width()
+    return atlas, meta
+
+def cut_atlas(atlas, meta):
+    """name -> (subsurface, offset)"""
+    return {
+        name: (atlas.subsurface((x, y, w, h)), (dx, dy))
+        for name, (x, y, w, h, dx, dy) in meta.items()
+    }
+
+def locate_fonts():
+    """Resolve font files; fills pygame's system font table without touching SDL_ttf"""
+    return {key: pygame.font.match_font(key[0], bold=key[2]) for key in FONTS}
+
+def create_fonts(paths):
+    """Main thread: open the fonts locate_fonts found"""
+    return {key: get_font(*key) for key in paths}
+
+def prepare_sounds():
+    """Sample arrays for the mixer format the main thread will open"""
+    from ..systems.sound_system import MIXER_DEFAULTS, SoundBank
+    return SoundBank().prepare(*(pygame.mixer.get_init() or MIXER_DEFAULTS))
+
+def create_sounds(prepared):
+    """Main thread: open the mixer and wrap the prepared arrays"""
+    from ..systems.sound_system import SoundSystem
+    return SoundSystem(prepared=prepared)
+
+def load_combat_tables():
+    """Compile every weapon and fighter special and prime their hitbox masks"""
+    from ..systems.combat_system import CombatSystem
+
+    template = CombatSystem()
+    frame_data = template.frame_data
+    for weapon_type in frame_data.weapons:
+        for name in [None, *frame_data.fighters]:
+            for table in frame_data.for_fighter(weapon_type, name):
+                template.hitbox_shapes.for_table(table)
+    return template
+
+def queue_match_assets(preloader, screen_size, glow_colors=()):
+    """Add the standard jobs for starting a match"""
+    preloader.add_surface("arena_background", (screen_size,),
+                          lambda: bake_arena_background(screen_size))
+    glow_colors = tuple((name, tuple(color)) for name, color in glow_colors)
+    preloader.add_surface("sprite_atlas", (glow_colors,),
+                          lambda: bake_sprite_atlas(glow_colors), finish=cut_atlas)
+    preloader.add("fonts", locate_fonts, finish=create_fonts)
+    preloader.add("sound", prepare_sounds, finish=create_sounds)
+    preloader.add("combat", load_combat_tables)
+    return preloader
@@ -0,0 +1,143 @@
+"""Rolling in-game frame capture
+
+FrameCapture keeps the last few seconds of downscaled frames in a ring
+of surfaces. Grabbing costs one scale blit into a preallocated slot.
+save_clip() hands the ring's surfaces to a background writer thread and
+refills the ring lazily, so the frame loop never copies or encodes.
+
+The writer encodes PNGs with zlib rather than pygame.image.save: zlib
+releases the GIL while compressing, image.save holds it and stalls the
+main thread for its whole duration.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+CAPTURE_DIR = "captures"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def encode_png(surface, level=6):
+    """RGB PNG bytes of a surface"""
+    width, height = surface.get_size()
+    rows = np.frombuffer(pygame.image.tobytes(surface, "RGB"), dtype=np.uint8).reshape(height, width * 3)
+    # Filter type 0 (none) at the start of every scanline
+    scanlines = np.hstack((np.zeros((height, 1), dtype=np.uint8), rows))
+    return (PNG_SIGNATURE
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), level))
+            + _png_chunk(b"IEND", b""))
+
+class FrameCapture:
+    def __init__(self, seconds=5.0, fps=60, size=(320, 180), every=1, out_dir=CAPTURE_DIR):
+        self.size = tuple(size)
+        self.every = every  # Keep every n-th frame
+        self.fps = fps / every
+        self.out_dir = out_dir
+        self._ring = [None] * max(1, int(seconds * self.fps))
+        self._frames = [0] * len(self._ring)
+        self._head = 0       # Next slot to write
+        self._count = 0      # Filled slots
+        self._seen = 0
+        self._jobs = queue.Queue()
+        self._thread = None
+        self.saved = []      # Clip directories written so far
+
+    def grab(self, screen, frame=None):
+        """Downscale this frame into the ring; call after drawing, before flip"""
+        self._seen += 1
+        if (self._seen - 1) % self.every:
+            return
+        slot = self._ring[self._head]
+        if slot is None:
+            slot = self._ring[self._head] = pygame.Surface(self.size, 0, screen)
+        pygame.transform.scale(screen, self.size, slot)
+        self._frames[self._head] = self._seen if frame is None else frame
+        self._head = (self._head + 1) % len(self._ring)
+        self._count = min(self._count + 1, len(self._ring))
+
+    def save_clip(self, seconds=None, label=None):
+        """Queue the last seconds of frames (all buffered by default) for writing.
+
+        Returns the clip directory; files appear there as the writer gets to them.
+        """
+        count = self._count if seconds is None else min(self._count, max(1, int(seconds * self.fps)))
+        if not count:
+            return None
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+        path = self._claim_dir(stamp + (f"-{label}" if label else ""))
+        if path is None:
+            return None
+        size = len(self._ring)
+        slots = [(self._head - count + i) % size for i in range(count)]
+        frames = [(self._frames[i], self._ring[i]) for i in slots]
+        # The writer owns these surfaces now; grab() allocates fresh ones as it reaches each slot
+        for i in slots:
+            self._ring[i] = None
+        self._count -= count
+
+        self._start_writer()
+        self._jobs.put((path, frames))
+        return path
+
+    def _claim_dir(self, name):
+        """Create a fresh clip directory, suffixing a counter if name is taken"""
+        base = os.path.join(self.out_dir, name)
+        for n in range(1000):
+            path = base if n == 0 else f"{base}-{n}"
+            try:
+                os.makedirs(path)
+                return path
+            except FileExistsError:
+                continue
+            except OSError as e:
+                print(f"Capture to {path} failed: {e}")
+                return None
+        print(f"Capture to {base} failed: too many clips with this name")
+        return None
+
+    def _start_writer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._write_clips, name="capture-writer", daemon=True)
+            self._thread.start()
+
+    def _write_clips(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            path, frames = job
+            try:
+                for i, (_, surface) in enumerate(frames):
+                    with open(os.path.join(path, f"frame_{i:05d}.png"), "wb") as f:
+                        f.write(encode_png(surface))
+                with open(os.path.join(path, "clip.json"), "w") as f:
+                    json.dump({"fps": self.fps, "size": self.size,
+                               "frames": [frame for frame, _ in frames]}, f)
+                self.saved.append(path)
+            except OSError as e:
+                print(f"Capture to {path} failed: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def flush(self):
+        """Wait for every queued clip to be written"""
+        if self._thread is not None:
+            self._jobs.join()
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join()
+        self._thread = None
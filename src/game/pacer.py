@@ -0,0 +1,115 @@
+"""High-precision frame pacing
+
+pygame's Clock.tick sleeps in whole milliseconds and lands frames
+unevenly. FramePacer sleeps coarsely until just before the deadline and
+covers the rest by yielding (power saving) or spinning (low jitter). It
+keeps a frame-time histogram and counts deadlines that work overran.
+"""
+import time
+from enum import Enum
+
+class PacingMode(Enum):
+    POWER_SAVING = "power"  # Sleep close to the deadline, then yield the CPU
+    LOW_JITTER = "jitter"   # Sleep earlier, then spin on perf_counter
+
+# How early the coarse sleep stops, leaving room for timer slack
+SLEEP_MARGIN = {
+    PacingMode.POWER_SAVING: 0.001,
+    PacingMode.LOW_JITTER: 0.002
+}
+# Low-jitter mode widens its margin to recent sleep overshoot, up to this
+MAX_SLEEP_MARGIN = 0.004
+
+class FramePacer:
+    def __init__(self, fps=60, mode=PacingMode.LOW_JITTER, bin_ms=0.25, max_ms=50):
+        self.mode = mode
+        self.set_fps(fps)
+        self.bin_ms = bin_ms
+        self.histogram = [0] * (int(max_ms / bin_ms) + 1)  # Last bin collects everything slower
+        self.frames = 0
+        self.missed = 0
+        self.last_frame_ms = 0.0
+        self._deadline = None
+        self._last = None
+        self._overshoot = 0.0  # Decaying worst coarse-sleep overshoot, seconds
+
+    def set_fps(self, fps):
+        """fps of 0 runs uncapped; frame times are still recorded"""
+        self.fps = fps
+        self.period = 1.0 / fps if fps else 0.0
+        self._deadline = None
+
+    def remaining_ms(self):
+        """Time left before this frame's deadline; slack for GC and other idle work"""
+        if self._deadline is None:
+            return 0.0
+        return (self._deadline - time.perf_counter()) * 1000
+
+    def tick(self, mode=None):
+        """Wait for the next frame deadline; returns the frame time in ms"""
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now + self.period
+            self._last = now
+            return 0.0
+
+        deadline = self._deadline
+        if not self.period:
+            self._deadline = now
+        elif now > deadline:
+            # Overran: start a fresh schedule instead of bursting to catch up
+            self.missed += 1
+            self._deadline = now + self.period
+        else:
+            self._wait(deadline, mode or self.mode)
+            self._deadline = deadline + self.period
+
+        end = time.perf_counter()
+        frame_ms = (end - self._last) * 1000
+        self._last = end
+        self.last_frame_ms = frame_ms
+        self.frames += 1
+        self.histogram[min(len(self.histogram) - 1, int(frame_ms / self.bin_ms))] += 1
+        return frame_ms
+
+    def _wait(self, deadline, mode):
+        margin = SLEEP_MARGIN[mode]
+        if mode == PacingMode.LOW_JITTER:
+            margin = min(MAX_SLEEP_MARGIN, max(margin, self._overshoot * 1.25))
+        wake = deadline - margin
+        coarse = wake - time.perf_counter()
+        if coarse > 0:
+            time.sleep(coarse)
+            self._overshoot = max(time.perf_counter() - wake, self._overshoot * 0.99)
+        if mode == PacingMode.POWER_SAVING:
+            while time.perf_counter() < deadline:
+                time.sleep(0)
+        else:
+            while time.perf_counter() < deadline:
+                pass
+
+    def get_fps(self):
+        return 1000 / self.last_frame_ms if self.last_frame_ms else 0.0
+
+    def percentile(self, p):
+        """Frame time in ms at percentile p, to histogram bin resolution"""
+        target = self.frames * p / 100
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return (i + 1) * self.bin_ms
+        return 0.0
+
+    def reset(self):
+        self.histogram = [0] * len(self.histogram)
+        self.frames = 0
+        self.missed = 0
+
+    def report(self):
+        target = self.period * 1000
+        rate = f"{self.fps} fps" if self.fps else "uncapped"
+        return (f"{self.frames} frames at {rate} ({self.mode.name.lower()}): "
+                f"p50 {self.percentile(50):.2f} ms p99 {self.percentile(99):.2f} ms "
+                f"p99.9 {self.percentile(99.9):.2f} ms (target {target:.2f}) | "
+                f"{self.missed} missed deadlines")
@@ -0,0 +1,175 @@
+"""Threaded simulation/render pipeline
+
+Overlapping simulation with drawing only pays off when there is a spare
+core and the draw calls release the GIL; measure with
+
+    python -m src.game.pipeline [frames]
+"""
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import pygame
+
+
+@dataclass(frozen=True)
+class FighterSnapshot:
+    x: float
+    y: float
+    is_player: bool
+    current_health: float
+    max_health: int
+    trail: tuple = None  # (world points, color) of the weapon trail, if any
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    frame: int
+    fighters: tuple
+    sparks: tuple  # (x, y, size, color) per hit spark
+    camera_offset: tuple  # Screen shake
+    view: tuple = (0, 0, 1280, 720)  # Visible world rect
+
+
+def frame_snapshot(frame, fighters, combat, render):
+    """FrameSnapshot of a simulation as seen through a RenderSystem's camera"""
+    return FrameSnapshot(
+        frame=frame,
+        fighters=tuple(
+            FighterSnapshot(f.x, f.y, f.is_player,
+                            f.health.current_health, f.health.max_health,
+                            f.weapon.trail_snapshot())
+            for f in fighters
+        ),
+        sparks=tuple((s.x, s.y, s.size, s.color) for s in combat.hit_sparks),
+        camera_offset=tuple(render.camera_offset),
+        view=render.camera.view()
+    )
+
+
+class SnapshotBuffer:
+    """Double buffer handing immutable frame snapshots from simulation to render"""
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._fresh = False
+        self._closed = False
+        self._input = None  # Latest keyboard state from the render thread
+        self._cond = threading.Condition()
+
+    def publish(self, snapshot):
+        """Write snapshot into the back slot and swap (waits while the front is unread)"""
+        with self._cond:
+            while self._fresh and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return False
+            back = 1 - self._front
+            self._slots[back] = snapshot
+            self._front = back
+            self._fresh = True
+            self._cond.notify_all()
+            return True
+
+    def acquire(self, timeout=None, input_state=None):
+        """Wait for the next snapshot; None once the buffer is closed.
+
+        input_state, if given, is handed to the simulation for the frame
+        this acquire lets it start.
+        """
+        with self._cond:
+            if input_state is not None:
+                self._input = input_state
+            while not self._fresh and not self._closed:
+                if not self._cond.wait(timeout):
+                    return None
+            if not self._fresh:
+                return None
+            self._fresh = False
+            self._cond.notify_all()
+            return self._slots[self._front]
+
+    def input_state(self):
+        with self._cond:
+            return self._input
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ThreadedPipeline:
+    """Runs Game.update on a worker thread while the main thread draws.
+
+    The simulation of frame N+1 overlaps with drawing frame N; the buffer
+    never lets the simulation run more than one frame ahead. The keyboard
+    is sampled on the main thread, which pumps events, and handed over
+    with each frame.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.buffer = SnapshotBuffer()
+        self._thread = None
+
+    def start(self):
+        self.game.input.keys = pygame.key.get_pressed()  # Input for the first frame
+        self._thread = threading.Thread(target=self._simulate, name="simulation", daemon=True)
+        self._thread.start()
+
+    def _simulate(self):
+        try:
+            while self.game.running:
+                keys = self.buffer.input_state()
+                if keys is not None:
+                    self.game.input.keys = keys
+                self.game.update()
+                if not self.buffer.publish(self.game.snapshot()):
+                    break
+        finally:
+            self.buffer.close()
+
+    def next_frame(self, timeout=None):
+        """Latest simulated frame for the render thread; samples the keyboard for the next one"""
+        return self.buffer.acquire(timeout, pygame.key.get_pressed())
+
+    def stop(self):
+        self.game.running = False
+        self.buffer.close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.game.input.keys = None
+
+
+def benchmark(frames=600, repeats=3):
+    """Compare serial and threaded loops, uncapped, on a headless display.
+
+    Runs alternate between the modes; each mode reports its best run.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.main import Game
+
+    results = {}
+    for _ in range(repeats):
+        for threaded in (False, True):
+            game = Game(threaded=threaded)
+            start = time.perf_counter()
+            game.run(max_frames=frames, fps=0)
+            elapsed = time.perf_counter() - start
+            game.gc.close()
+            mode = "threaded" if threaded else "serial"
+            results[mode] = min(results.get(mode, float("inf")), elapsed / frames * 1000)
+    pygame.quit()
+
+    for mode, ms in results.items():
+        print(f"{mode:>8}: {ms:.3f} ms/frame ({1000 / ms:.0f} fps)")
+    print(f" speedup: {results['serial'] / results['threaded']:.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
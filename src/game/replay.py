@@ -0,0 +1,130 @@
+"""Match replays
+
+A replay is the RNG seed, the fighters' names and both players' button
+bits for every frame.
+Given those the simulation is deterministic, so ReplayPlayer re-runs a
+recorded match exactly, and its keyframes let a player start mid-match.
+"""
+import pickle
+import random
+import struct
+import zlib
+
+from ..systems.combat_system import CombatSystem
+from ..systems.input_system import InputBuffer, apply_buttons, read_buttons
+from ..systems.render_system import RenderSystem
+from .pipeline import frame_snapshot
+from .scheduler import SystemScheduler
+from .simulation import Simulation
+
+MAGIC = b"SCRP"
+VERSION = 3  # Bumped whenever simulation rules change, since old inputs would play out differently
+# magic, version, seed, fps, frames, names length; then the names and zlib'd button bytes
+HEADER = struct.Struct("<4sHIIIH")
+
+class ReplayFormatError(ValueError):
+    pass
+
+class Replay:
+    def __init__(self, seed=None, fps=60, buttons=None, names=(None, None)):
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.fps = fps
+        self.names = tuple(names)  # data/fighters.json keys, None for plain fighters
+        self.buttons = bytearray(buttons or b"")  # Two bytes per frame: p1, p2
+
+    def __len__(self):
+        return len(self.buttons) // 2
+
+    def record(self, p1, p2):
+        """Append one frame of InputBuffers"""
+        self.buttons += bytes((read_buttons(p1), read_buttons(p2)))
+
+    def bits(self, frame):
+        return self.buttons[frame * 2], self.buttons[frame * 2 + 1]
+
+    def save(self, path):
+        names = "\n".join(name or "" for name in self.names).encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.fps, len(self), len(names)))
+            f.write(names)
+            f.write(zlib.compress(bytes(self.buttons), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ReplayFormatError(f"{path}: truncated header")
+        magic, version, seed, fps, frames, names_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayFormatError(f"{path}: not a version {VERSION} replay")
+        start = HEADER.size + names_length
+        names = tuple(name or None for name in data[HEADER.size:start].decode().split("\n"))
+        if len(names) != 2:
+            raise ReplayFormatError(f"{path}: expected 2 fighter names, got {len(names)}")
+        try:
+            buttons = zlib.decompress(data[start:])
+        except zlib.error as e:
+            raise ReplayFormatError(f"{path}: corrupt input data: {e}") from None
+        if len(buttons) != frames * 2:
+            raise ReplayFormatError(f"{path}: {len(buttons) // 2} frames of input, header says {frames}")
+        return cls(seed, fps, buttons, names)
+
+class ReplayPlayer:
+    """Re-runs a Replay headlessly, tracking the camera the way Game does.
+
+    Systems are created in the same order as Game's so the seeded RNG
+    hands out the same values, and stepped on the same schedule so
+    effects decay at Game's 30 Hz; pygame must be initialised for the
+    RenderSystem.
+    """
+    def __init__(self, replay, viewport_size=(1280, 720), world_size=None, internal_size=None):
+        self.replay = replay
+        random.seed(replay.seed)
+        self.combat = CombatSystem()
+        self.render = RenderSystem(viewport_size, world_size, internal_size)
+        self.render.rng.seed(replay.seed)
+        self.sim = Simulation(self.combat, names=replay.names)
+        self.render.stage = self.sim.stage
+        self.render.camera.follow(self.sim.fighters)
+        self.inputs = (InputBuffer(), InputBuffer())
+        self.frame = 0
+        self.scheduler = SystemScheduler(60)
+        self.scheduler.register("simulation", lambda: self.sim.step(self.inputs), rate=60)
+        self.scheduler.register("camera", lambda: self.render.camera.follow(self.sim.fighters),
+                                after=("simulation",))
+        self.scheduler.register("effects", self.render.update, rate=30,
+                                after=("camera",), takes_frames=True)
+
+    @property
+    def done(self):
+        return self.frame >= len(self.replay)
+
+    def step(self):
+        for buffer, bits in zip(self.inputs, self.replay.bits(self.frame)):
+            apply_buttons(buffer, bits)
+        self.scheduler.tick()
+        self.frame += 1
+
+    def snapshot(self):
+        return frame_snapshot(self.frame, self.sim.fighters, self.combat, self.render)
+
+    def keyframe(self):
+        """Everything step() reads or mutates, pickled"""
+        render = self.render
+        return pickle.dumps((self.frame, self.sim, render.camera, render.screen_shake,
+                             render.camera_offset, render.effects, render.rng, random.getstate()),
+                            pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, keyframe):
+        render = self.render
+        (self.frame, self.sim, render.camera, render.screen_shake,
+         render.camera_offset, render.effects, render.rng, state) = pickle.loads(keyframe)
+        self.combat = self.sim.combat
+        render.stage = self.sim.stage
+        random.setstate(state)
+        # Line the schedule up with the restored frame, as if it had run from 0
+        self.scheduler.frame = self.frame
+        for system in self.scheduler.systems.values():
+            last = self.frame - 1 - (self.frame - 1 - system.phase) % system.interval
+            system.last_frame = last if last >= 0 else -1
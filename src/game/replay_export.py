@@ -0,0 +1,149 @@
+"""Offline replay-to-frames exporter
+
+Renders recorded matches to a raw RGB frame stream or PNG strips as fast
+as the machine allows. One sequential simulation pass (no drawing)
+collects a keyframe at the start of every chunk; a process pool then
+renders the chunks offscreen in parallel, each worker restoring its
+keyframe and stepping only its own frame range. Raw chunks are stitched
+in frame order at the end.
+
+    python -m src.game.replay_export match.replay out/ --workers 8
+    python -m src.game.replay_export match.replay out/ --format png --strip 10 --size 640x360
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i out/frames.rgb clip.mp4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import pygame
+
+from src.game.replay import Replay, ReplayPlayer
+from src.main import ARENA_SIZE, parse_size
+
+RAW, PNG = "raw", "png"
+MIN_CHUNK = 60
+
+def plan_chunks(frames, workers, strip=1, chunk=None):
+    """Contiguous [start, end) ranges, a few per worker, aligned to whole strips"""
+    if chunk is None:
+        chunk = max(MIN_CHUNK, -(-frames // (workers * 4)))
+    chunk = -(-chunk // strip) * strip
+    return [(start, min(frames, start + chunk)) for start in range(0, frames, chunk)]
+
+def collect_keyframes(replay, starts, size):
+    """Run the match once without drawing, pickling the state at each chunk start"""
+    player = ReplayPlayer(replay, world_size=ARENA_SIZE, internal_size=size)
+    keyframes = {}
+    for start in sorted(starts):
+        while player.frame < start:
+            player.step()
+        keyframes[start] = player.keyframe()
+    return keyframes
+
+def _init_worker():
+    pygame.init()
+
+def render_chunk(replay, keyframe, start, end, size, fmt, strip, out_dir):
+    """Render frames [start, end) into out_dir; returns the files written in order"""
+    player = ReplayPlayer(replay, world_size=ARENA_SIZE, internal_size=size)
+    player.restore(keyframe)
+    screen = pygame.Surface(size)
+    written = []
+    if fmt == RAW:
+        path = os.path.join(out_dir, f"chunk_{start:07d}.rgb")
+        with open(path, "wb") as f:
+            while player.frame < end:
+                player.step()
+                player.render.draw_frame(screen, player.snapshot())
+                f.write(pygame.image.tobytes(screen, "RGB"))
+        written.append(path)
+    else:
+        sheet = pygame.Surface((size[0], size[1] * strip))
+        while player.frame < end:
+            first = player.frame
+            count = min(strip, end - first)
+            for row in range(count):
+                player.step()
+                player.render.draw_frame(screen, player.snapshot())
+                sheet.blit(screen, (0, row * size[1]))
+            image = sheet if count == strip else sheet.subsurface((0, 0, size[0], size[1] * count))
+            path = os.path.join(out_dir, f"frame_{first:07d}.png" if strip == 1 else f"strip_{first:07d}.png")
+            pygame.image.save(image, path)
+            written.append(path)
+    return written
+
+def stitch(chunk_paths, out_path):
+    """Concatenate raw chunks in frame order, removing them as we go"""
+    with open(out_path, "wb") as out:
+        for path in chunk_paths:
+            with open(path, "rb") as f:
+                while True:
+                    block = f.read(1 << 22)
+                    if not block:
+                        break
+                    out.write(block)
+            os.remove(path)
+
+def export(replay_path, out_dir, workers=None, fmt=RAW, size=(1280, 720), strip=1, chunk=None):
+    replay = Replay.load(replay_path)
+    frames = len(replay)
+    workers = workers or os.cpu_count() or 1
+    strip = strip if fmt == PNG else 1
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = plan_chunks(frames, workers, strip, chunk)
+
+    start_time = time.perf_counter()
+    pygame.init()
+    keyframes = collect_keyframes(replay, [start for start, _ in chunks], size)
+    keyframe_time = time.perf_counter() - start_time
+
+    results = {}
+    # spawn: workers must not inherit the parent's initialised SDL state
+    with ProcessPoolExecutor(workers, get_context("spawn"), initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(render_chunk, replay, keyframes[start], start, end, size, fmt, strip, out_dir): start
+            for start, end in chunks
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    ordered = [path for start, _ in chunks for path in results[start]]
+
+    if fmt == RAW:
+        stitch(ordered, os.path.join(out_dir, "frames.rgb"))
+        with open(os.path.join(out_dir, "frames.json"), "w") as f:
+            json.dump({"width": size[0], "height": size[1], "fps": replay.fps,
+                       "frames": frames, "pix_fmt": "rgb24"}, f, indent=2)
+    elapsed = time.perf_counter() - start_time
+    print(f"{frames} frames in {len(chunks)} chunks on {workers} workers: {elapsed:.2f} s "
+          f"({frames / elapsed:.0f} fps, {frames / replay.fps / elapsed:.1f}x real time; "
+          f"keyframe pass {keyframe_time:.2f} s)")
+    return ordered
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render recorded StickClash matches to frames")
+    parser.add_argument("replays", nargs="+", help="Replay files; the last argument is the output directory")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=(RAW, PNG), default=RAW)
+    parser.add_argument("--size", type=parse_size, default=(1280, 720), metavar="WxH")
+    parser.add_argument("--strip", type=int, default=1, help="Frames stacked per PNG")
+    parser.add_argument("--chunk", type=int, default=None, help="Frames per work unit")
+    args = parser.parse_args(argv)
+    if len(args.replays) < 2:
+        parser.error("need at least one replay and an output directory")
+
+    *replays, out_dir = args.replays
+    for path in replays:
+        target = out_dir if len(replays) == 1 else os.path.join(
+            out_dir, os.path.splitext(os.path.basename(path))[0])
+        export(path, target, args.workers, args.format, args.size, max(1, args.strip), args.chunk)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Per-system scheduling
+
+SystemScheduler runs registered systems once per game frame in
+dependency and priority order, each at its own rate. Rates are converted
+to frame intervals at the nominal fps: a 15 Hz system runs every 4th
+frame, and with takes_frames it is passed how many frames the run covers.
+Throttled systems get phase offsets so their runs land on different
+frames instead of piling onto the same one. A system with a change key
+runs only on frames where the key differs from its last run.
+
+Costs are kept per system and reported the way AllocationTracker reports
+allocations, against optional budgets in ms per run.
+"""
+import heapq
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+
+class SchedulerError(ValueError):
+    pass
+
+@dataclass
+class ScheduledSystem:
+    name: str
+    func: object
+    interval: int = 1         # Frames between runs
+    phase: int = 0            # Runs on frames where frame % interval == phase
+    priority: int = 0         # Lower runs first among systems whose deps are met
+    after: tuple = ()         # Names of systems that must run earlier in the frame
+    changed: object = None    # Callable returning a key; skip runs while it is unchanged
+    takes_frames: bool = False
+    last_frame: int = -1
+    last_key: object = None
+    # Cost since the last reset
+    runs: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    order: int = 0            # Registration index, the final tie-break
+
+class SystemScheduler:
+    def __init__(self, fps=60, budgets=None, window=120):
+        self.fps = fps
+        self.budgets = dict(budgets or {})  # System name -> max avg ms per run
+        self.systems = {}
+        self.frame = 0
+        self.frames = 0                       # Since the last reset
+        self.frame_ms = deque(maxlen=window)  # Scheduled work per frame
+        self._order = None
+
+    def register(self, name, func, rate=None, priority=0, after=(), changed=None, takes_frames=False):
+        """Add a system; rate in Hz (None runs every frame)"""
+        if name in self.systems:
+            raise SchedulerError(f"system {name!r} is already registered")
+        system = ScheduledSystem(name, func, self._interval(rate), 0, priority, tuple(after),
+                                 changed, takes_frames, order=len(self.systems))
+        system.phase = self._quietest_phase(system.interval)
+        self.systems[name] = system
+        self._order = None
+        return system
+
+    def set_rate(self, name, rate):
+        system = self.systems[name]
+        del self.systems[name]
+        system.interval = self._interval(rate)
+        system.phase = self._quietest_phase(system.interval)
+        self.systems[name] = system
+
+    def _interval(self, rate):
+        if rate is None or rate >= self.fps:
+            return 1
+        return max(1, round(self.fps / rate))
+
+    def _quietest_phase(self, interval):
+        """Phase whose frames already carry the fewest throttled runs"""
+        if interval == 1:
+            return 0
+        throttled = [s for s in self.systems.values() if s.interval > 1]
+        horizon = math.lcm(interval, *(s.interval for s in throttled))
+        load = [0] * horizon
+        for system in throttled:
+            for frame in range(system.phase, horizon, system.interval):
+                load[frame] += 1
+        return min(range(interval), key=lambda phase: sum(load[phase::interval]))
+
+    def order(self):
+        """Systems sorted so dependencies come first, then by priority and registration"""
+        if self._order is None:
+            waiting = {name: set(system.after) for name, system in self.systems.items()}
+            for name, deps in waiting.items():
+                missing = deps - self.systems.keys()
+                if missing:
+                    raise SchedulerError(f"{name!r} runs after unknown system(s) {sorted(missing)}")
+            ready = [(s.priority, s.order, s.name) for s in self.systems.values() if not s.after]
+            heapq.heapify(ready)
+            order = []
+            while ready:
+                name = heapq.heappop(ready)[2]
+                order.append(self.systems[name])
+                for other, deps in waiting.items():
+                    if name in deps:
+                        deps.discard(name)
+                        if not deps:
+                            system = self.systems[other]
+                            heapq.heappush(ready, (system.priority, system.order, other))
+            if len(order) != len(self.systems):
+                stuck = sorted(name for name, deps in waiting.items() if deps)
+                raise SchedulerError(f"dependency cycle between {stuck}")
+            self._order = order
+        return self._order
+
+    def tick(self):
+        """Run every system due this frame"""
+        frame = self.frame
+        spent = 0.0
+        for system in self.order():
+            if frame % system.interval != system.phase:
+                continue
+            if system.changed is not None:
+                key = system.changed()
+                if key == system.last_key and system.last_frame >= 0:
+                    continue
+                system.last_key = key
+            frames = frame - system.last_frame if system.last_frame >= 0 else system.interval
+            start = time.perf_counter()
+            if system.takes_frames:
+                system.func(frames)
+            else:
+                system.func()
+            elapsed = (time.perf_counter() - start) * 1000
+            system.last_frame = frame
+            system.runs += 1
+            system.total_ms += elapsed
+            system.max_ms = max(system.max_ms, elapsed)
+            spent += elapsed
+        self.frame_ms.append(spent)
+        self.frame += 1
+        self.frames += 1
+
+    # Reporting
+
+    def summary(self):
+        """name -> (runs per frame, avg ms per run, max ms, avg ms per frame) since the last reset"""
+        frames = self.frames or 1
+        return {
+            name: (s.runs / frames, s.total_ms / s.runs if s.runs else 0.0, s.max_ms, s.total_ms / frames)
+            for name, s in self.systems.items()
+        }
+
+    def report(self):
+        recent = sorted(self.frame_ms)
+        worst = recent[-1] if recent else 0.0
+        p99 = recent[min(len(recent) - 1, int(len(recent) * 0.99))] if recent else 0.0
+        lines = [f"System cost over {self.frames} frames (scheduled work p99 {p99:.2f} ms, max {worst:.2f} ms):",
+                 f"  {'system':16} {'every':>6} {'runs/f':>6} {'ms/run':>7} {'max ms':>7} {'ms/f':>6}"]
+        summary = self.summary()
+        for system in self.order():
+            runs, per_run, worst_run, per_frame = summary[system.name]
+            every = "change" if system.changed is not None else f"{system.interval}"
+            budget = self.budgets.get(system.name)
+            flag = f"  > budget {budget}" if budget is not None and per_run > budget else ""
+            lines.append(f"  {system.name:16} {every:>6} {runs:6.2f} {per_run:7.3f} {worst_run:7.3f} "
+                         f"{per_frame:6.3f}{flag}")
+        return "\n".join(lines)
+
+    def check_budgets(self):
+        """(name, avg ms per run, budget) for every system over its budget"""
+        summary = self.summary()
+        return [(name, summary[name][1], budget) for name, budget in self.budgets.items()
+                if name in summary and summary[name][1] > budget]
+
+    def reset(self):
+        for system in self.systems.values():
+            system.runs = 0
+            system.total_ms = 0.0
+            system.max_ms = 0.0
+        self.frames = 0
+        self.frame_ms.clear()
@@ -0,0 +1,83 @@
+"""Headless match simulation"""
+from ..components.store import ComponentStore
+from ..entities.fighter import Fighter
+from ..systems.combat_system import CombatSystem
+from ..systems.frame_data import AttackType
+from ..systems.stage import get_stage
+
+class Simulation:
+    """One match of fighters and combat, with no display or input devices.
+    
+    A shared ComponentStore may be passed in to batch component systems
+    across many matches; its owner then updates the rows of every match it
+    steps, once per step.
+    Stages are static and may be shared too; the default is the arena.
+    names are the fighters' data/fighters.json keys, for their specials.
+    """
+    def __init__(self, combat=None, store=None, stage=None, names=(None, None)):
+        self.combat = combat or CombatSystem()
+        self.owns_store = store is None
+        self.store = store or ComponentStore()
+        self.stage = stage or get_stage()
+        (x1, y1), (x2, y2) = self.stage.spawns[:2]
+        self.fighters = [
+            Fighter(x1, y1, is_player=True, name=names[0], store=self.store),
+            Fighter(x2, y2, is_player=False, name=names[1], store=self.store)
+        ]
+        for fighter in self.fighters:
+            self.combat.register(fighter)
+        self.frame = 0
+
+    def step(self, inputs):
+        """Advance one frame; inputs holds one InputBuffer per fighter"""
+        for fighter, buffer in zip(self.fighters, inputs):
+            self._apply_input(fighter, buffer)
+
+        # Update combat
+        p1, p2 = self.fighters
+        self.combat.process_attack(p1, p2)
+        self.combat.process_attack(p2, p1)
+        self.combat.update()
+
+        # Update components column-wise, then entities
+        if self.owns_store:
+            self.store.update()
+        for fighter in self.fighters:
+            fighter.update(self.stage)
+        self.frame += 1
+
+    def release(self):
+        """Free this match's rows in a shared store"""
+        for fighter in self.fighters:
+            self.store.release(fighter.entity)
+
+    def _apply_input(self, fighter, buffer):
+        # Accelerate toward the held direction
+        target = 0
+        if buffer.move_left != buffer.move_right:
+            fighter.facing = -1 if buffer.move_left else 1
+            target = fighter.facing * fighter.physics["max_speed"]
+        accel = fighter.physics["acceleration"]
+        fighter.vel_x += max(-accel, min(accel, target - fighter.vel_x))
+
+        if buffer.jump and fighter.state.grounded:
+            fighter.vel_y = -fighter.physics["jump_force"]
+            fighter.state.grounded = False
+
+        if buffer.special:
+            self.combat.start_attack(fighter, AttackType.SPECIAL)
+        elif buffer.heavy:
+            self.combat.start_attack(fighter, AttackType.HEAVY)
+        elif buffer.attack:
+            self.combat.start_attack(fighter, AttackType.LIGHT)
+
+    @property
+    def finished(self):
+        return any(f.health.dead or f.health.current_health <= 0 for f in self.fighters)
+
+    def winner(self):
+        """Index of the fighter with more health left, or -1 on a draw"""
+        p1, p2 = (f.health.current_health for f in self.fighters)
+        if p1 == p2:
+            return -1
+        return 0 if p1 > p2 else 1
@@ -0,0 +1,187 @@
+"""Retained-mode UI
+
+Widgets keep their rendered surfaces and repaint only when marked dirty:
+a label when its text changes, a button when its text or hover state
+does. UIRoot.draw() repaints just the dirty areas over the background and
+returns the changed rects for pygame.display.update(), an empty list when
+nothing changed, so an idle menu does no drawing at all.
+Fonts come from the shared get_font cache.
+"""
+import pygame
+
+from .assets import get_font
+
+class Widget:
+    def __init__(self, rect, children=()):
+        self.rect = pygame.Rect(rect)
+        self.parent = None
+        self.children = []
+        self.visible = True
+        self.dirty = True
+        self._painted = None  # Screen area covered by the last paint
+        for child in children:
+            self.add(child)
+
+    def add(self, child):
+        child.parent = self
+        self.children.append(child)
+        child.dirty = True
+        return child
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def set_visible(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+
+    def dirty_area(self):
+        """Where a repaint must happen: the new rect, wherever we were drawn before, and our children"""
+        area = self.rect if self._painted is None else self.rect.union(self._painted)
+        return area.unionall([child.dirty_area() for child in self.children])
+
+    def paint(self, surface):
+        """Draw this widget alone; the root draws children after their parent"""
+
+    def handle_event(self, event):
+        """Offer the event to visible children, topmost first; True stops propagation"""
+        for child in reversed(self.children):
+            if child.visible and child.handle_event(event):
+                return True
+        return False
+
+class UIRoot(Widget):
+    def __init__(self, size, background):
+        super().__init__((0, 0) + tuple(size))
+        self.background = pygame.Surface(size)
+        if isinstance(background, pygame.Surface):
+            self.background.blit(background, (0, 0))
+        else:
+            self.background.fill(background)
+        self._full = True
+
+    def invalidate(self):
+        """Repaint everything next draw, e.g. after something else drew on the screen"""
+        self._full = True
+
+    def draw(self, screen):
+        """Repaint dirty widgets; returns the rects that changed on screen"""
+        if self._full:
+            self._full = False
+            screen.blit(self.background, (0, 0))
+            self._paint_tree(screen, self, None)
+            self._clean(self)
+            return [screen.get_rect()]
+
+        areas = []
+        self._collect(self, areas)
+        for area in areas:
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            self._paint_tree(screen, self, area)
+        screen.set_clip(None)
+        return areas
+
+    def _collect(self, widget, areas):
+        """Dirty areas, one per topmost dirty widget (its repaint covers its children)"""
+        if widget.dirty:
+            areas.append(widget.dirty_area())
+            self._clean(widget)
+            return
+        if widget.visible:
+            for child in widget.children:
+                self._collect(child, areas)
+
+    def _clean(self, widget):
+        widget.dirty = False
+        for child in widget.children:
+            self._clean(child)
+
+    def _paint_tree(self, screen, widget, area):
+        if not widget.visible:
+            widget._painted = None
+            return
+        if area is None or widget.rect.colliderect(area):
+            widget.paint(screen)
+            widget._painted = pygame.Rect(widget.rect)
+        for child in widget.children:
+            self._paint_tree(screen, child, area)
+
+class Panel(Widget):
+    def __init__(self, rect, color=None, border_radius=0, children=()):
+        super().__init__(rect, children)
+        self.color = color
+        self.border_radius = border_radius
+
+    def paint(self, surface):
+        if self.color is not None:
+            pygame.draw.rect(surface, self.color, self.rect, 0, self.border_radius)
+
+class Label(Widget):
+    def __init__(self, pos, text, font=("Arial", 16), color=(255, 255, 255), anchor="topleft"):
+        super().__init__((pos, (0, 0)))
+        self.font = get_font(*font)
+        self.color = color
+        self.anchor = anchor
+        self.pos = pos
+        self.text = None
+        self.set_text(text)
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        self._image = self.font.render(text, True, self.color)
+        self.rect = self._image.get_rect(**{self.anchor: self.pos})
+        self.dirty = True
+
+    def paint(self, surface):
+        surface.blit(self._image, self.rect)
+
+class Button(Widget):
+    def __init__(self, x, y, text, action=None, size=(300, 80), font=("Arial", 32)):
+        super().__init__((x, y) + tuple(size))
+        self.action = action
+        self.color = (70, 70, 70)
+        self.hover_color = (100, 100, 100)
+        self.text_color = (255, 255, 255)
+        self.font = get_font(*font)
+        self.hovered = False
+        self.text = None
+        self.set_text(text)
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        # Both faces are prebuilt, so hovering is a blit, not a font render
+        self._faces = {hovered: self._build_face(hovered) for hovered in (False, True)}
+        self.dirty = True
+
+    def _build_face(self, hovered):
+        face = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(face, self.hover_color if hovered else self.color, face.get_rect(), border_radius=10)
+        text = self.font.render(self.text, True, self.text_color)
+        face.blit(text, text.get_rect(center=face.get_rect().center))
+        return face
+
+    def set_hovered(self, hovered):
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.dirty = True
+
+    def check_click(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.set_hovered(self.rect.collidepoint(event.pos))
+        elif event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            if self.action:
+                self.action()
+            return True
+        return False
+
+    def paint(self, surface):
+        surface.blit(self._faces[self.hovered], self.rect)
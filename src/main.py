@@ -2,80 +2,286 @@
 import pygame
 import sys
 import os
+import random
+import time
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import systems
-from systems.input_system import InputSystem
-from systems.combat_system import CombatSystem
-from systems.render_system import RenderSystem
-from entities.fighter import Fighter
+from src.systems.input_system import InputSystem
+from src.systems.combat_system import CombatSystem
+from src.systems.render_system import RenderSystem
+from src.systems.telemetry import CombatTelemetry
+from src.systems.sound_system import SoundSystem
+from src.systems.quality import QualityGovernor
+from src.systems.hot_reload import FrameDataReloader
+from src.systems.ai_system import AIController
+from src.net.shared_state import DEFAULT_NAME, SharedStateWriter
+from src.systems.alloc_tracker import AllocationTracker, instrument_game
+from src.game.simulation import Simulation
+from src.game.gc_scheduler import GCScheduler
+from src.game.pacer import FramePacer, PacingMode
+from src.game.pipeline import ThreadedPipeline, frame_snapshot
+from src.game.replay import Replay
+from src.game.capture import FrameCapture
+from src.game.scheduler import SystemScheduler
+
+ARENA_SIZE = (1280 * 3, 720 * 2)
 
 class Game:
-    def __init__(self):
+    def __init__(self, threaded=False, telemetry=False, internal_size=None, smooth=False,
+                 hot_reload=False, track_allocs=False, pacing=PacingMode.LOW_JITTER, record=False,
+                 capture_seconds=None, cpu_opponent=False, shared_state=None, fighter_names=(None, None)):
+        if cpu_opponent and shared_state:
+            # The CPU's buffer would silently win over player 2's shared-memory ring
+            raise ValueError("cpu_opponent and shared_state both drive player 2; pick one")
         # Initialize pygame
         pygame.init()
         self.screen = pygame.display.set_mode((1280, 720))
         pygame.display.set_caption("StickClash 2.0")
-        self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(60, pacing)
         self.running = True
-        
+        self.threaded = threaded
+        self.frame = 0
+        self.quality = QualityGovernor()
+        self._quality_changed = False
+        self.reloader = None
+        self.allocs = None
+        self.gc = GCScheduler()
+        self.replay = None
+        self.capture = None
+        self.ai = None
+        self.shared = None
+        self.scheduler = SystemScheduler(60)
+
         try:
+            if record:
+                # Seed before any system draws from the RNG; ReplayPlayer does the same
+                self.replay = Replay(names=fighter_names)
+                random.seed(self.replay.seed)
+
             # Initialize systems
             self.input = InputSystem()
             self.combat = CombatSystem()
-            self.render = RenderSystem()
-            
+            self.render = RenderSystem((1280, 720), ARENA_SIZE, internal_size, smooth)
+            self.sound = SoundSystem()
+            if self.sound.enabled:
+                self.combat.sound = self.sound
+            if telemetry:
+                self.combat.telemetry = CombatTelemetry()
+            if hot_reload:
+                self.reloader = FrameDataReloader([self.combat]).start()
+            if capture_seconds:
+                # F12 saves the last capture_seconds of gameplay
+                self.capture = FrameCapture(capture_seconds)
+            if track_allocs:
+                self.allocs = instrument_game(AllocationTracker(), self).start()
+
             # Create fighters
-            self.player1 = Fighter(300, 360, is_player=True)
-            self.player2 = Fighter(900, 360, is_player=False)
-            
+            self.sim = Simulation(self.combat, names=fighter_names)
+            self.player1, self.player2 = self.sim.fighters
+            self.render.stage = self.sim.stage
+            self.render.camera.follow(self.sim.fighters)
+            if cpu_opponent:
+                self.ai = AIController(self.player2, self.player1)
+            if shared_state:
+                # Bots read state and send inputs through shared memory
+                self.shared = SharedStateWriter(shared_state)
+                for player, ring in zip(("player1", "player2"), self.shared.inputs):
+                    self.input.bind_source(player, ring)
+            self._register_systems()
+
             print("All systems initialized successfully")
         except Exception as e:
             print(f"Initialization failed: {e}")
             self.running = False
-    
+
+    def _register_systems(self):
+        """Per-frame systems, their rates and order; see SystemScheduler"""
+        scheduler = self.scheduler
+        scheduler.register("input", self.input.process_inputs)
+        controls = ("input",)
+        if self.ai:
+            scheduler.register("ai", self.ai.update, rate=15, after=("input",))
+            controls += ("ai",)
+        # Physics and combat, fixed step
+        scheduler.register("simulation", self._step_simulation, rate=60, after=controls)
+        scheduler.register("camera", lambda: self.render.camera.follow(self.sim.fighters),
+                           after=("simulation",))
+        scheduler.register("effects", self.render.update, rate=30, after=("camera",), takes_frames=True)
+        scheduler.register("hud", lambda: self.render.update_hud(self.sim.fighters, self.combat),
+                           after=("simulation",), changed=self._hud_state)
+        if self.shared:
+            scheduler.register("export", lambda: self.shared.publish(self.sim.frame, self.sim.fighters,
+                                                                     self.combat), after=("simulation",))
+
+    def _hud_state(self):
+        return tuple((round(f.health.current_health), self.combat.states[f.combat_id].combo_count)
+                     for f in self.sim.fighters)
+
+    def _step_simulation(self):
+        p1 = self.input.get_input_state("player1")
+        p2 = self.ai.buffer if self.ai else self.input.get_input_state("player2")
+        if self.replay is not None:
+            self.replay.record(p1, p2)
+        self.sim.step((p1, p2))
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-    
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F12 and self.capture:
+                path = self.capture.save_clip()
+                if path:
+                    print(f"Saving capture to {path}")
+
     def update(self):
         if not self.running:
             return
-            
-        # Process inputs
-        inputs = self.input.process_inputs()
-        
-        # Update combat
-        self.combat.update(self.player1, self.player2)
-        
-        # Update entities
-        self.player1.update()
-        self.player2.update()
-    
-    def render(self):
-        if not self.running:
+        if self._quality_changed:
+            self._quality_changed = False
+            self.apply_quality()
+        if self.reloader:
+            # Frame boundary: swap in any data the watcher recompiled
+            self.reloader.apply()
+
+        self.scheduler.tick()
+        self.frame += 1
+
+    def snapshot(self):
+        """Immutable copy of everything draw() needs"""
+        return frame_snapshot(self.frame, (self.player1, self.player2), self.combat, self.render)
+
+    def draw(self, snapshot):
+        if snapshot is None:
             return
-            
-        self.screen.fill((0, 0, 0))
-        
-        # Render entities
-        self.render.draw_fighter(self.screen, self.player1)
-        self.render.draw_fighter(self.screen, self.player2)
-        
+
+        # Render entities (clears its own target)
+        self.render.draw_frame(self.screen, snapshot)
+        if self.capture:
+            self.capture.grab(self.screen, snapshot.frame)
+
         pygame.display.flip()
-    
-    def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(60)
+
+    def apply_quality(self):
+        """Push the governor's current effect settings into every system"""
+        settings = self.quality.settings
+        self.combat.set_quality(settings)
+        self.render.effects_quality = settings
+        for fighter in self.sim.fighters:
+            fighter.weapon.set_trail_scale(settings.trail_scale)
+
+    def _finish_frame(self, start):
+        """After flip: feed the quality governor, then spend leftover frame time on GC"""
+        elapsed = (time.perf_counter() - start) * 1000
+        # Applied at the start of the next update, on whichever thread simulates.
+        # Effect quality changes spark counts, so it stays fixed while recording a replay.
+        if self.quality.record(elapsed) and self.replay is None:
+            self._quality_changed = True
+        if self.allocs:
+            self.allocs.end_frame()
+        self.gc.idle(self.pacer.remaining_ms())
+
+    def run(self, max_frames=None, fps=60):
+        if self.threaded:
+            self._run_threaded(max_frames, fps)
+            return
+        frames = 0
+        self.quality.budget_ms = 1000 / (fps or 60)
+        self.pacer.set_fps(fps)
+        self.gc.after_load()
+        self.gc.begin_match()
+        try:
+            while self.running:
+                start = time.perf_counter()
+                self.handle_events()
+                self.update()
+                self.draw(self.snapshot())
+                self._finish_frame(start)
+                self.pacer.tick()
+                frames += 1
+                if max_frames and frames >= max_frames:
+                    break
+        finally:
+            self.gc.end_match()
+
+    def _run_threaded(self, max_frames, fps):
+        """Simulate on a worker thread, draw and pump events here"""
+        self.gc.after_load()
+        pipeline = ThreadedPipeline(self)
+        pipeline.start()
+        frames = 0
+        try:
+            self.quality.budget_ms = 1000 / (fps or 60)
+            self.pacer.set_fps(fps)
+            self.gc.begin_match()
+            while self.running:
+                self.handle_events()
+                snapshot = pipeline.next_frame(timeout=0.5)
+                start = time.perf_counter()
+                self.draw(snapshot)
+                self._finish_frame(start)
+                self.pacer.tick()
+                frames += 1
+                if max_frames and frames >= max_frames:
+                    break
+        finally:
+            pipeline.stop()
+            self.gc.end_match()
+
+def parse_size(text):
+    """'640x360' -> (640, 360)"""
+    width, height = text.lower().split("x")
+    return int(width), int(height)
 
 if __name__ == "__main__":
-    game = Game()
+    internal_size = None
+    record_path = None
+    capture_seconds = None
+    shared_state = None
+    fighter_names = (None, None)
+    for arg in sys.argv[1:]:
+        if arg.startswith("--internal-res="):
+            internal_size = parse_size(arg.split("=", 1)[1])
+        elif arg.startswith("--record="):
+            record_path = arg.split("=", 1)[1]
+        elif arg == "--shared-state" or arg.startswith("--shared-state="):
+            shared_state = arg.split("=", 1)[1] if "=" in arg else DEFAULT_NAME
+        elif arg == "--capture" or arg.startswith("--capture="):
+            capture_seconds = float(arg.split("=", 1)[1]) if "=" in arg else 5.0
+        elif arg.startswith("--fighters="):
+            # data/fighters.json names, e.g. --fighters=Ghostblade,Brawler
+            fighter_names = tuple(name or None for name in arg.split("=", 1)[1].split(",", 1))
+            fighter_names += (None,) * (2 - len(fighter_names))
+    if shared_state and "--cpu" in sys.argv:
+        sys.exit("--cpu and --shared-state both drive player 2; pick one")
+    game = Game(threaded="--threaded" in sys.argv, telemetry="--telemetry" in sys.argv,
+                internal_size=internal_size, smooth="--smooth" in sys.argv,
+                hot_reload="--hot-reload" in sys.argv, track_allocs="--track-allocs" in sys.argv,
+                pacing=PacingMode.POWER_SAVING if "--power-saving" in sys.argv else PacingMode.LOW_JITTER,
+                record=record_path is not None, capture_seconds=capture_seconds,
+                cpu_opponent="--cpu" in sys.argv, shared_state=shared_state,
+                fighter_names=fighter_names)
     game.run()
+    if game.replay is not None:
+        game.replay.save(record_path)
+        print(f"Saved {len(game.replay)} frame replay to {record_path}")
+    if game.reloader:
+        game.reloader.stop()
+    if game.capture:
+        game.capture.close()
+    if game.shared:
+        game.input.sources.clear()
+        game.shared.close()
+    if game.allocs:
+        print(game.allocs.report())
+        game.allocs.stop()
+    print(game.scheduler.report())
+    print(game.pacer.report())
+    print(game.gc.report())
+    game.gc.close()
+    if game.combat.telemetry:
+        game.combat.telemetry.close()
     pygame.quit()
     sys.exit()
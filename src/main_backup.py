@@ -4,10 +4,24 @@ STICK CLASH - Rebuilt Core
 
 # Phase 1: Essentials
 import pygame
-from random import randint, random
+import sys
+import os
+import random
+from random import randint
 import math
+import time
 from enum import Enum
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.game.assets import AssetPreloader, get_font, queue_match_assets
+from src.systems.projectile_system import ProjectilePool
+from src.systems.stage import get_stage
+from src.systems.quality import QualityGovernor
+from src.systems.alloc_tracker import AllocationTracker
+from src.game.gc_scheduler import GCScheduler
+from src.game.pacer import FramePacer, PacingMode
+from src.game.ui import Button, Label, Panel, UIRoot, Widget
+
 # Phase 2: Pygame initialization
 pygame.init()
 pygame.mixer.init()
@@ -19,6 +33,12 @@ GRAVITY = 0.5
 GROUND_Y = SCREEN_HEIGHT - 50
 BASE_HEALTH = 300
 BASE_DAMAGE = 10
+PROJECTILES = ProjectilePool(capacity=4096)
+STAGE = get_stage("classic")
+STICK_FIGHTER_BOX = (-25, -60, 25, 0)  # Relative to the feet
+QUALITY = QualityGovernor(budget_ms=1000 / FPS)
+GLOW_SPRITES = {}  # CharacterClass -> head glow, filled from the preloaded atlas
+MENU_IDLE_TIMEOUT_MS = 1000  # Longest an idle menu sleeps waiting for input
 
 # Phase 4: Class definitions (everything below can use constants)
 class CharacterClass(Enum):
@@ -28,45 +48,13 @@ class CharacterClass(Enum):
     MAGE = 4
     BERSERKER = 5
 
-class Projectile:
-    def __init__(self, x, y, direction, speed, damage, owner, projectile_type="arrow"):
-        self.x = x
-        self.y = y
-        self.direction = direction
-        self.speed = speed
-        self.damage = damage
-        self.owner = owner
-        self.lifetime = 60
-        self.type = projectile_type
-        self.width = 15 if projectile_type == "arrow" else 25
-        self.height = 5 if projectile_type == "arrow" else 25
-    
-    def update(self):
-        self.x += self.speed * self.direction
-        self.lifetime -= 1
-        return self.lifetime > 0
-    
-    def get_hitbox(self):
-        return pygame.Rect(
-            self.x - self.width//2,
-            self.y - self.height//2,
-            self.width,
-            self.height
-        )
-    
-    def draw(self, screen):
-        if self.type == "arrow":
-            pygame.draw.line(screen, (100, 100, 100), 
-                            (self.x, self.y), 
-                            (self.x - 15 * self.direction, self.y), 2)
-            pygame.draw.polygon(screen, (200, 200, 200), [
-                (self.x, self.y - 3),
-                (self.x, self.y + 3),
-                (self.x + 10 * self.direction, self.y)
-            ])
-        elif self.type == "fireball":
-            pygame.draw.circle(screen, (255, 100, 0), (int(self.x), int(self.y)), 12)
-            pygame.draw.circle(screen, (255, 200, 0), (int(self.x), int(self.y)), 8)
+CLASS_COLORS = {
+    CharacterClass.SHADOW: (150, 150, 200),
+    CharacterClass.TANK: (200, 100, 100),
+    CharacterClass.ARCHER: (100, 200, 150),
+    CharacterClass.MAGE: (200, 100, 200),
+    CharacterClass.BERSERKER: (200, 50, 50)
+}
 
 class StickFighter:
     def __init__(self, x, y, char_class):
@@ -80,7 +68,6 @@ class StickFighter:
         self.max_health = BASE_HEALTH
         self.stamina = 100
         self.char_class = char_class
-        self.projectiles = []
         self.combo_count = 0
         self.last_hit_time = 0
         self.combo_multiplier = 1.0
@@ -138,10 +125,12 @@ class StickFighter:
 
     def draw(self, screen):
         # Hit flash overlay
+        quality = QUALITY.settings
         if hasattr(self, 'hit_flash') and self.hit_flash > 0:
-            flash_surf = pygame.Surface((50,80), pygame.SRCALPHA)
-            flash_surf.fill((255,255,255, min(150, self.hit_flash*30)))
-            screen.blit(flash_surf, (self.x-25, self.y-60))
+            if quality.flash:
+                flash_surf = pygame.Surface((50,80), pygame.SRCALPHA)
+                flash_surf.fill((255,255,255, min(150, self.hit_flash*30)))
+                screen.blit(flash_surf, (self.x-25, self.y-60))
             
             # Directional streak
             streak_len = 10 + (5-self.hit_flash)*3
@@ -150,37 +139,34 @@ class StickFighter:
                            (self.x + self.hit_direction*streak_len, self.y-30), 3)
             self.hit_flash -= 1
         
-        # Anti-aliased limbs
-        limb_thickness = 3
-        colors = {
-            CharacterClass.SHADOW: (150, 150, 200),
-            CharacterClass.TANK: (200, 100, 100),
-            CharacterClass.ARCHER: (100, 200, 150),
-            CharacterClass.MAGE: (200, 100, 200),
-            CharacterClass.BERSERKER: (200, 50, 50)
-        }
-        pygame.draw.aaline(screen, colors[self.char_class], 
-                          (self.x, self.y-30), (self.x, self.y-10), limb_thickness)
+        # Anti-aliased limbs, plain lines when the governor is shedding load
+        draw_limb = pygame.draw.aaline if quality.aa_limbs else pygame.draw.line
+        colors = CLASS_COLORS
+        draw_limb(screen, colors[self.char_class],
+                  (self.x, self.y-30), (self.x, self.y-10))
         # Arms
         arm_angle = math.sin(pygame.time.get_ticks()/200)*0.3 if not self.attacking else 1.0
-        pygame.draw.aaline(screen, colors[self.char_class], 
-                          (self.x, self.y-25), (self.x-15*arm_angle, self.y-15), limb_thickness)
-        pygame.draw.aaline(screen, colors[self.char_class], 
-                          (self.x, self.y-25), (self.x+15*arm_angle, self.y-15), limb_thickness)
+        draw_limb(screen, colors[self.char_class],
+                  (self.x, self.y-25), (self.x-15*arm_angle, self.y-15))
+        draw_limb(screen, colors[self.char_class],
+                  (self.x, self.y-25), (self.x+15*arm_angle, self.y-15))
         # Legs
         leg_sway = math.sin(pygame.time.get_ticks()/300)*0.2
-        pygame.draw.aaline(screen, colors[self.char_class], 
-                          (self.x, self.y-10), (self.x-12, self.y+20+leg_sway*10), limb_thickness)
-        pygame.draw.aaline(screen, colors[self.char_class], 
-                          (self.x, self.y-10), (self.x+12, self.y+20-leg_sway*10), limb_thickness)
+        draw_limb(screen, colors[self.char_class],
+                  (self.x, self.y-10), (self.x-12, self.y+20+leg_sway*10))
+        draw_limb(screen, colors[self.char_class],
+                  (self.x, self.y-10), (self.x+12, self.y+20-leg_sway*10))
         # Glowing head
-        glow_surf = pygame.Surface((24,24), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (*colors[self.char_class], 50), (12,12), 12)
-        screen.blit(glow_surf, (self.x-12, self.y-52))
+        if quality.glow:
+            glow_surf = GLOW_SPRITES.get(self.char_class)
+            if glow_surf is None:
+                glow_surf = pygame.Surface((24,24), pygame.SRCALPHA)
+                pygame.draw.circle(glow_surf, (*colors[self.char_class], 50), (12,12), 12)
+            screen.blit(glow_surf, (self.x-12, self.y-52))
         
         # Combo text
         if self.combo_count > 1:
-            combo_font = pygame.font.SysFont('Arial', 24, bold=True)
+            combo_font = get_font('Arial', 24, bold=True)
             combo_text = f"{self.combo_count} HIT!"
             text_surf = combo_font.render(combo_text, True, 
                 (255, 255, 0) if self.combo_count < 5 else 
@@ -199,22 +185,16 @@ class StickFighter:
         self.last_hit_time = current_time
 
     def update(self):
-        # Movement
-        self.x += self.vel_x
-        self.y += self.vel_y
+        # Movement against the stage, then gravity unless standing on something
+        if STAGE.move_body(self, STICK_FIGHTER_BOX):
+            self.jumping = False
+        else:
+            self.vel_y += GRAVITY
         
         # Attack cooldown
         if self.attack_frame > 0:
             self.draw_attack(pygame.display.get_surface())
             
-        # Gravity
-        if self.y < GROUND_Y:
-            self.vel_y += GRAVITY
-        else:
-            self.y = GROUND_Y
-            self.vel_y = 0
-            self.jumping = False
-            
         # Stamina regen
         if self.stamina < 100:
             self.stamina += 0.5
@@ -232,12 +212,8 @@ class StickFighter:
         else:
             self.vel_x = 0
 
-        for proj in self.projectiles:
-            if not proj.update():
-                self.projectiles.remove(proj)
-
     def draw_damage(self, screen, amount, x, y):
-        damage_font = pygame.font.SysFont('Arial', 20, bold=True)
+        damage_font = get_font('Arial', 20, bold=True)
         color = (
             (150, 150, 255) if amount < 15 else
             (255, 200, 100) if amount < 30 else
@@ -251,30 +227,18 @@ class MenuState(Enum):
     SETTINGS = 2
     IN_GAME = 3
 
-class Button:
-    def __init__(self, x, y, text, action=None):
-        self.rect = pygame.Rect(x, y, 300, 80)
-        self.text = text
-        self.action = action
-        self.color = (70, 70, 70)
-        self.hover_color = (100, 100, 100)
-        self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont('Arial', 32)
-        
-    def draw(self, screen):
-        mouse_pos = pygame.mouse.get_pos()
-        color = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=10)
-        text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
-        
-    def check_click(self, pos):
-        return self.rect.collidepoint(pos)
+CLASS_DESCRIPTIONS = {
+    CharacterClass.SHADOW: "Quick attacks\nLow damage\nHigh mobility",
+    CharacterClass.TANK: "Slow but tough\nHigh health\nPowerful strikes",
+    CharacterClass.ARCHER: "Ranged attacks\nKeep distance\nPrecision hits",
+    CharacterClass.MAGE: "Area attacks\nSpecial effects\nComplex",
+    CharacterClass.BERSERKER: "Rage mechanic\nDamage boosts\nHigh risk"
+}
 
 class MainMenu:
+    """Menu screens as a retained widget tree; draw() repaints only what changed"""
     def __init__(self):
-        self.state = MenuState.MAIN
+        self._state = MenuState.MAIN
         self.buttons = [
             Button(SCREEN_WIDTH//2 - 150, 250, "Play", self.start_game),
             Button(SCREEN_WIDTH//2 - 150, 350, "Settings", self.open_settings),
@@ -282,6 +246,7 @@ class MainMenu:
         ]
         self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.setup_background()
+        self.ui = self._build_ui()
         
     def setup_background(self):
         # Animated background
@@ -290,69 +255,54 @@ class MainMenu:
             x = randint(0, SCREEN_WIDTH)
             y = randint(0, SCREEN_HEIGHT)
             pygame.draw.circle(self.background, (60, 60, 80), (x, y), 2)
+
+    def _build_ui(self):
+        root = UIRoot((SCREEN_WIDTH, SCREEN_HEIGHT), (20, 20, 40))
+        root.add(Label((SCREEN_WIDTH//2, 100), "STICK CLASH", ("Arial", 64, True), (255, 200, 100), "midtop"))
+
+        # Class previews, shown on the class select screen
+        self.class_select = root.add(Widget((100, 250, 1000, 230)))
+        for i, char_class in enumerate(CharacterClass):
+            x = 200 + (i * 200)
+            self.class_select.add(Panel((x-50, 250, 100, 150), CLASS_COLORS[char_class], 10))
+            self.class_select.add(Label((x, 420), char_class.name, ("Arial", 24), anchor="midtop"))
+            for j, line in enumerate(CLASS_DESCRIPTIONS[char_class].split("\n")):
+                self.class_select.add(Label((x, 450 + (j*20)), line, ("Arial", 16), (240,240,240), "midtop"))
+        self.class_select.set_visible(False)
+
+        for button in self.buttons:
+            root.add(button)
+        root.add(Label((20, SCREEN_HEIGHT - 30), "v0.1 Prototype", ("Arial", 16), (150, 150, 150)))
+        return root
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        if self._state == MenuState.IN_GAME:
+            # The match drew over everything
+            self.ui.invalidate()
+        self._state = state
+        self.class_select.set_visible(state == MenuState.CLASS_SELECT)
         
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, timeout_ms=0):
+        """Dispatch queued input, first blocking up to timeout_ms for some if there is none"""
+        events = pygame.event.get()
+        if not events and timeout_ms:
+            event = pygame.event.wait(timeout_ms)
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                for button in self.buttons:
-                    if button.check_click(event.pos):
-                        if button.action:
-                            button.action()
+            self.ui.handle_event(event)
     
     def draw(self, screen):
-        screen.fill((20, 20, 40))
-        
-        # Title
-        title_font = pygame.font.SysFont('Arial', 64, bold=True)
-        title = title_font.render("STICK CLASH", True, (255, 200, 100))
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 100))
-        
-        # Class previews
-        if self.state == MenuState.CLASS_SELECT:
-            class_colors = {
-                CharacterClass.SHADOW: (150, 150, 200),
-                CharacterClass.TANK: (200, 100, 100),
-                CharacterClass.ARCHER: (100, 200, 150),
-                CharacterClass.MAGE: (200, 100, 200),
-                CharacterClass.BERSERKER: (200, 50, 50)
-            }
-            
-            for i, char_class in enumerate(CharacterClass):
-                x = 200 + (i * 200)
-                pygame.draw.rect(screen, class_colors[char_class], 
-                                (x-50, 250, 100, 150), 0, 10)
-                
-                # Class name
-                class_font = pygame.font.SysFont('Arial', 24)
-                class_text = class_font.render(char_class.name, True, (255,255,255))
-                screen.blit(class_text, (x - class_text.get_width()//2, 420))
-                
-                # Class descriptions
-                descriptions = {
-                    CharacterClass.SHADOW: "Quick attacks\nLow damage\nHigh mobility",
-                    CharacterClass.TANK: "Slow but tough\nHigh health\nPowerful strikes",
-                    CharacterClass.ARCHER: "Ranged attacks\nKeep distance\nPrecision hits",
-                    CharacterClass.MAGE: "Area attacks\nSpecial effects\nComplex",
-                    CharacterClass.BERSERKER: "Rage mechanic\nDamage boosts\nHigh risk"
-                }
-                
-                desc_font = pygame.font.SysFont('Arial', 16)
-                lines = descriptions[char_class].split('\\n')
-                for j, line in enumerate(lines):
-                    desc_text = desc_font.render(line, True, (240,240,240))
-                    screen.blit(desc_text, (x - desc_text.get_width()//2, 450 + (j*20)))
-                
-        # Draw buttons
-        for button in self.buttons:
-            button.draw(screen)
-        
-        # Version
-        version_font = pygame.font.SysFont('Arial', 16)
-        version = version_font.render("v0.1 Prototype", True, (150, 150, 150))
-        screen.blit(version, (20, SCREEN_HEIGHT - 30))
+        """Repaint changed widgets; returns the dirty rects for pygame.display.update"""
+        return self.ui.draw(screen)
     
     def start_game(self):
         self.state = MenuState.IN_GAME
@@ -369,22 +319,67 @@ class Game:
         # Core systems (safe - uses only Phase 1-3 items)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("StickClash")
-        self.clock = pygame.time.Clock()
+        # Matches pace for even frame times; menus sleep on the event queue instead
+        self.pacer = FramePacer(FPS, PacingMode.POWER_SAVING)
         
         # Game objects (initialized later)
         self.menu = None
         self.player = None
         self.enemy = None
+        self.assets = {}
         
         # Effects systems (initialized last)
         self._init_game_objects()
         self._init_effects()
         
         self.running = True
+        self.allocs = None
+        self.gc = GCScheduler()
+    
+    def track_allocations(self, report_every=600):
+        """Debug mode: per-system allocation report every report_every match frames"""
+        self.allocs = AllocationTracker(window=report_every)
+        for owner, method_name in (
+            (StickFighter, "update"),
+            (StickFighter, "draw"),
+            (Game, "draw_arena"),
+            (Game, "update_shake"),
+            (PROJECTILES, "update"),
+            (PROJECTILES, "collide"),
+            (PROJECTILES, "draw")
+        ):
+            self.allocs.wrap(owner, method_name)
+        self.allocs.start()
     
     def _init_game_objects(self):
         """Initialize objects that need constants"""
         self.menu = MainMenu()
+        # Build match assets in the background while the menu is up
+        self.preloader = queue_match_assets(
+            AssetPreloader(), (SCREEN_WIDTH, SCREEN_HEIGHT),
+            [(c.name, color) for c, color in CLASS_COLORS.items()]
+        )
+        self.preloader.start()
+
+    def _start_match(self):
+        start = pygame.time.get_ticks()
+        self.assets = self.preloader.wait()
+        atlas = self.assets.get("sprite_atlas", {})
+        PROJECTILES.load_sprites({
+            (int(kind), int(direction)): sprite
+            for name, sprite in atlas.items() if name.startswith("projectile:")
+            for kind, direction in [name.split(":")[1:]]
+        })
+        GLOW_SPRITES.update({
+            c: atlas["glow:" + c.name][0] for c in CharacterClass if "glow:" + c.name in atlas
+        })
+        self.player = StickFighter(300, 400, CharacterClass.MAGE)
+        self.enemy = StickFighter(900, 400, CharacterClass.TANK)
+        # Surfaces, fonts and tables are loaded for good; keep them out of every future GC pass
+        self.gc.after_load()
+        self.gc.begin_match()
+        self.pacer.set_fps(FPS)  # Fresh schedule; the menu did not tick it
+        print(f"Match ready in {pygame.time.get_ticks() - start} ms")
         
     def _init_effects(self):
         """Final initialization stage"""
@@ -414,9 +409,13 @@ class Game:
     
     def draw_arena(self, screen):
         # Gradient floor
-        for y in range(SCREEN_HEIGHT-50, SCREEN_HEIGHT):
-            shade = 30 + (y - (SCREEN_HEIGHT-50))
-            pygame.draw.line(screen, (shade, shade, shade+20), (0,y), (SCREEN_WIDTH,y))
+        background = self.assets.get("arena_background")
+        if background is not None:
+            screen.blit(background, (0, 0))
+        else:
+            for y in range(SCREEN_HEIGHT-50, SCREEN_HEIGHT):
+                shade = 30 + (y - (SCREEN_HEIGHT-50))
+                pygame.draw.line(screen, (shade, shade, shade+20), (0,y), (SCREEN_WIDTH,y))
         
         # Ambient particles
         for p in self.particles:
@@ -431,27 +430,50 @@ class Game:
         while self.running:
             if self.menu.state == MenuState.IN_GAME:
                 if not self.player:
-                    self.player = StickFighter(300, 400, CharacterClass.MAGE)
-                    self.enemy = StickFighter(900, 400, CharacterClass.TANK)
+                    self._start_match()
+                frame_start = time.perf_counter()
                 self.player.update()
                 self.enemy.update()
+                PROJECTILES.update(STAGE)
+                fighters = (self.player, self.enemy)
+                damage = PROJECTILES.collide(fighters, [
+                    (f.x - 25, f.y - 60, 50, 80) for f in fighters
+                ])
+                for fighter, amount in zip(fighters, damage):
+                    if amount:
+                        fighter.take_damage(amount, 0)
                 self.screen.fill((0, 0, 0))
                 self.draw_arena(self.screen)
                 self.player.draw(self.screen)
                 self.enemy.draw(self.screen)
-                for proj in self.player.projectiles + self.enemy.projectiles:
-                    proj.draw(self.screen)
+                PROJECTILES.draw(self.screen)
                 self.update_shake()
                 self.screen.blit(self.screen, (self.shake_offset[0], self.shake_offset[1]))
                 pygame.display.flip()
+                frame_ms = (time.perf_counter() - frame_start) * 1000
+                QUALITY.record(frame_ms)
+                if self.allocs:
+                    self.allocs.end_frame()
+                    if len(self.allocs.window) == self.allocs.window.maxlen:
+                        print(self.allocs.report())
+                        self.allocs.window.clear()
+                self.gc.idle(self.pacer.remaining_ms())
+                self.pacer.tick(PacingMode.LOW_JITTER)
             else:
-                self.menu.handle_events()
-                self.menu.draw(self.screen)
-                pygame.display.flip()
-            self.clock.tick(60)
+                # Idle menus block on input; while assets load, wake every frame to finish them
+                loading = not self.preloader.ready
+                self.menu.handle_events(1000 // FPS if loading else MENU_IDLE_TIMEOUT_MS)
+                dirty = self.menu.draw(self.screen)
+                if dirty:
+                    pygame.display.update(dirty)
+                if loading:
+                    self.preloader.pump()
 
 if __name__ == "__main__":
     game = Game()
+    if "--track-allocs" in sys.argv:
+        game.track_allocations()
     game.run()
+    game.gc.close()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,236 @@
+"""Multi-match asyncio arena server
+
+Hosts many headless Simulations in one process. Clients connect over a
+local TCP socket, are paired into matches, and stream button states; all
+due matches are stepped together on a shared 60 Hz tick grid.
+
+    python -m src.net.arena_server --port 7777
+    python -m src.net.load_client --players 400
+"""
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.components.store import ComponentStore
+from src.game.simulation import Simulation
+from src.systems.combat_system import CombatSystem
+from src.systems.input_system import InputBuffer, apply_buttons
+
+# Client -> server: (kind, payload) pairs
+CLIENT_MESSAGE = struct.Struct("<cB")
+JOIN = b"J"
+INPUT = b"I"
+
+# Server -> client, each prefixed by its kind byte
+ASSIGN = struct.Struct("<cIB")      # b"A", match id, slot
+STATE = struct.Struct("<cI6f")      # b"S", frame, x1, y1, x2, y2, hp1, hp2
+END = struct.Struct("<cIb")         # b"E", match id, winner slot (-1 draw)
+SERVER_MESSAGES = {b"A": ASSIGN, b"S": STATE, b"E": END}
+
+# Skip state updates to clients whose socket buffer is backed up
+MAX_PENDING_BYTES = 64 * 1024
+
+class ArenaMatch:
+    def __init__(self, match_id, combat, store, writers, first_tick, max_frames):
+        self.match_id = match_id
+        self.sim = Simulation(combat, store)
+        self.inputs = (InputBuffer(), InputBuffer())
+        self.writers = list(writers)
+        self.next_tick = first_tick
+        self.max_frames = max_frames
+
+    @property
+    def finished(self):
+        return (self.sim.finished or self.sim.frame >= self.max_frames
+                or not any(self.writers))
+
+    def state_message(self):
+        p1, p2 = self.sim.fighters
+        return STATE.pack(b"S", self.sim.frame, p1.x, p1.y, p2.x, p2.y,
+                          p1.health.current_health, p2.health.current_health)
+
+class TickStats:
+    """Rolling throughput and jitter counters between reports"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.ticks = 0
+        self.overruns = 0
+        self.jitter = []
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+class ArenaServer:
+    def __init__(self, host="127.0.0.1", port=7777, tick_rate=60,
+                 max_frames=60 * 99, report_every=5.0):
+        self.host = host
+        self.port = port
+        self.dt = 1.0 / tick_rate
+        self.max_frames = max_frames
+        self.report_every = report_every
+        self.matches = {}
+        self.waiting = []
+        self.clients = {}  # writer -> (match, slot)
+        self.stats = TickStats()
+        self._next_match_id = 0
+        self._grid_start = time.perf_counter()
+
+        # One set of compiled frame data and hitbox masks for every match
+        template = CombatSystem()
+        self._frame_data = template.frame_data
+        self._hitbox_shapes = template.hitbox_shapes
+
+        # Components of every match in one store, updated once per tick
+        self.store = ComponentStore(capacity=1024)
+
+    def _next_grid_tick(self):
+        """Align new matches to the shared tick grid so they step together"""
+        elapsed = time.perf_counter() - self._grid_start
+        return self._grid_start + (int(elapsed / self.dt) + 1) * self.dt
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                kind, payload = CLIENT_MESSAGE.unpack(await reader.readexactly(CLIENT_MESSAGE.size))
+                if kind == JOIN:
+                    self._join(writer)
+                elif kind == INPUT and writer in self.clients:
+                    match, slot = self.clients[writer]
+                    apply_buttons(match.inputs[slot], payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._leave(writer)
+            writer.close()
+
+    def _join(self, writer):
+        if writer in self.clients or writer in self.waiting:
+            return
+        self.waiting.append(writer)
+        if len(self.waiting) < 2:
+            return
+        players = (self.waiting.pop(0), self.waiting.pop(0))
+        match = ArenaMatch(
+            self._next_match_id,
+            CombatSystem(self._frame_data, self._hitbox_shapes),
+            self.store, players, self._next_grid_tick(), self.max_frames
+        )
+        self._next_match_id += 1
+        self.matches[match.match_id] = match
+        for slot, player in enumerate(players):
+            self.clients[player] = (match, slot)
+            self._send(player, ASSIGN.pack(b"A", match.match_id, slot))
+
+    def _leave(self, writer):
+        if writer in self.waiting:
+            self.waiting.remove(writer)
+        entry = self.clients.pop(writer, None)
+        if entry:
+            match, slot = entry
+            match.writers[slot] = None
+
+    def _send(self, writer, data, droppable=False):
+        if writer is None or writer.is_closing():
+            return
+        if droppable and writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            return
+        writer.write(data)
+
+    def step_due(self, now):
+        """Step every match whose tick has come due"""
+        finished = []
+        due = [match for match in self.matches.values() if match.next_tick <= now]
+        if due:
+            # One batched update over just the components of matches stepping this tick
+            self.store.update(np.fromiter((f.entity for match in due for f in match.sim.fighters),
+                                          dtype=np.intp))
+        for match in due:
+            self.stats.jitter.append(now - match.next_tick)
+            match.sim.step(match.inputs)
+            self.stats.steps += 1
+            match.next_tick += self.dt
+            if match.next_tick < now:
+                # Fell more than a tick behind; resync instead of bursting
+                self.stats.overruns += 1
+                match.next_tick = self._next_grid_tick()
+            if match.finished:
+                finished.append(match)
+                continue
+            state = match.state_message()
+            for writer in match.writers:
+                self._send(writer, state, droppable=True)
+
+        for match in finished:
+            del self.matches[match.match_id]
+            match.sim.release()
+            end = END.pack(b"E", match.match_id, match.sim.winner())
+            for writer in match.writers:
+                self.clients.pop(writer, None)
+                self._send(writer, end)
+
+    async def run_scheduler(self):
+        next_report = time.perf_counter() + self.report_every
+        while True:
+            now = time.perf_counter()
+            self.step_due(now)
+            self.stats.ticks += 1
+            if now >= next_report:
+                self.report()
+                next_report = now + self.report_every
+
+            if self.matches:
+                wake = min(match.next_tick for match in self.matches.values())
+            else:
+                wake = self._next_grid_tick()
+            await asyncio.sleep(max(0.0, wake - time.perf_counter()))
+
+    def report(self):
+        stats = self.stats
+        wall = time.perf_counter() - stats.wall_start
+        cpu = time.process_time() - stats.cpu_start
+        utilization = cpu / wall if wall else 0
+        matches = len(self.matches)
+        if stats.jitter:
+            jitter = np.array(stats.jitter) * 1000
+            p50, p99, worst = np.percentile(jitter, 50), np.percentile(jitter, 99), jitter.max()
+        else:
+            p50 = p99 = worst = 0.0
+        capacity = matches / utilization if utilization else 0
+        print(f"{matches} matches, {len(self.waiting)} waiting | "
+              f"{stats.steps / wall:.0f} steps/s | cpu {utilization:.0%} | "
+              f"~{capacity:.0f} matches/core | jitter p50 {p50:.2f} ms "
+              f"p99 {p99:.2f} ms max {worst:.2f} ms | {stats.overruns} overruns")
+        stats.reset()
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"Arena server listening on {self.host}:{self.port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_scheduler())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash headless arena server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--max-frames", type=int, default=60 * 99, help="Round length in frames")
+    parser.add_argument("--report-every", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    server = ArenaServer(args.host, args.port, args.tick_rate, args.max_frames, args.report_every)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Local load generator for the arena server
+
+Simulates N players that join, mash buttons at the tick rate and rejoin
+when their match ends.
+
+    python -m src.net.load_client --players 400 --duration 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.net.arena_server import CLIENT_MESSAGE, JOIN, INPUT, SERVER_MESSAGES
+from src.systems.input_system import LEFT, RIGHT, JUMP, LIGHT, HEAVY, SPECIAL
+
+class LoadStats:
+    def __init__(self):
+        self.connected = 0
+        self.matches = 0
+        self.states = 0
+        self.ends = 0
+
+async def _receive(reader, stats, rejoin):
+    while True:
+        kind = await reader.readexactly(1)
+        message = SERVER_MESSAGES[kind]
+        await reader.readexactly(message.size - 1)
+        if kind == b"A":
+            stats.matches += 1
+        elif kind == b"S":
+            stats.states += 1
+        elif kind == b"E":
+            stats.ends += 1
+            rejoin()
+
+async def player(host, port, stats, deadline, input_rate):
+    reader, writer = await asyncio.open_connection(host, port)
+    stats.connected += 1
+    join = CLIENT_MESSAGE.pack(JOIN, 0)
+    writer.write(join)
+    receiver = asyncio.create_task(_receive(reader, stats, lambda: writer.write(join)))
+
+    rng = random.Random()
+    bits = 0
+    try:
+        while time.perf_counter() < deadline and not receiver.done():
+            # Hold a direction for a while, tap attacks now and then
+            if rng.random() < 0.05:
+                bits = rng.choice((0, LEFT, RIGHT))
+            if rng.random() < 0.02:
+                bits |= JUMP
+            attack = rng.choice((0,) * 12 + (LIGHT, HEAVY, SPECIAL))
+            writer.write(CLIENT_MESSAGE.pack(INPUT, bits | attack))
+            bits &= ~JUMP
+            await writer.drain()
+            await asyncio.sleep(1.0 / input_rate)
+    finally:
+        receiver.cancel()
+        writer.close()
+
+async def run(players, host, port, duration, input_rate):
+    stats = LoadStats()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(player(host, port, stats, deadline, input_rate))
+             for _ in range(players)]
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(5)
+        elapsed = time.perf_counter() - start
+        print(f"{stats.connected}/{players} connected | {stats.matches} joins | "
+              f"{stats.ends} match ends | {stats.states / elapsed:.0f} states/s")
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        print(f"{len(errors)} players failed, first: {errors[0]!r}")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash arena load generator")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--input-rate", type=float, default=60.0, help="Inputs per second per player")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.players, args.host, args.port, args.duration, args.input_rate))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
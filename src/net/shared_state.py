@@ -0,0 +1,316 @@
+"""Shared-memory game state for out-of-process bots and tools
+
+The game publishes every frame's fighter state into a fixed-layout
+multiprocessing.shared_memory block guarded by a seqlock: the writer
+bumps the sequence to odd, writes, then bumps it to even, and readers
+retry when the sequence was odd or moved under them. Readers get NumPy
+views straight onto the block, so nothing is serialized.
+
+Bots send buttons back through one single-producer ring per player in
+the same block; InputSystem polls them each frame. The header records
+the writer's pid, so a second game refuses a block that is still in
+use and only replaces one whose writer has exited.
+
+    python -m src.main --shared-state
+    python -m src.net.shared_state watch
+    python -m src.net.shared_state bot --player 2
+"""
+import argparse
+import os
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.systems.input_system import LEFT, RIGHT, JUMP, LIGHT, HEAVY, SPECIAL, apply_buttons
+
+DEFAULT_NAME = "stickclash"
+MAGIC = 0x53435353  # "SSCS"
+VERSION = 2
+MAX_FIGHTERS = 2
+RING_CAPACITY = 64
+# Buttons that count if pressed in any entry consumed this frame, so taps are never lost
+PRESSES = JUMP | LIGHT | HEAVY | SPECIAL
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"), ("version", "<u2"), ("fighter_count", "<u2"),
+    ("writer_pid", "<u4"),
+    ("seq", "<u8"),           # Seqlock: odd while the writer is mid-update
+    ("frame", "<u8"),
+    ("published_ns", "<u8")   # time.monotonic_ns() at publish
+], align=True)
+FIGHTER_DTYPE = np.dtype([
+    ("x", "<f4"), ("y", "<f4"), ("vel_x", "<f4"), ("vel_y", "<f4"),
+    ("health", "<f4"), ("max_health", "<f4"),
+    ("cooldown", "<i4"), ("cooldown_max", "<i4"),
+    ("facing", "i1"), ("grounded", "u1"), ("stunned", "u1"), ("attack", "i1"),
+    ("attack_frame", "<u2"), ("combo_count", "<u2"), ("combo_timer", "<u2"), ("recovery_frames", "<u2")
+], align=True)
+RING_HEADER_DTYPE = np.dtype([
+    ("head", "<u8"),  # Entries written; only the bot advances it
+    ("tail", "<u8")   # Entries consumed; only the game advances it
+], align=True)
+INPUT_DTYPE = np.dtype([("frame", "<u8"), ("bits", "u1")], align=True)  # Frame the bot was reacting to
+
+def _aligned(offset, alignment=64):
+    return -(-offset // alignment) * alignment
+
+# Block layout: header, fighters, then per player a ring header and its entries
+FIGHTERS_OFFSET = _aligned(HEADER_DTYPE.itemsize)
+RINGS_OFFSET = _aligned(FIGHTERS_OFFSET + FIGHTER_DTYPE.itemsize * MAX_FIGHTERS)
+RING_SIZE = _aligned(RING_HEADER_DTYPE.itemsize + INPUT_DTYPE.itemsize * RING_CAPACITY)
+BLOCK_SIZE = RINGS_OFFSET + RING_SIZE * MAX_FIGHTERS
+
+class SharedStateError(RuntimeError):
+    pass
+
+# Blocks this process's writers own; the tracker entry is theirs to drop at unlink
+_written = set()
+
+def _attach(name):
+    """Open an existing block without letting this process's resource tracker unlink it at exit"""
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+        if name not in _written:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # Windows frees a block with its last handle, so an existing one is always in use
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class InputRing:
+    """Single-producer, single-consumer ring of button states for one player"""
+    def __init__(self, buf, offset):
+        self.header = np.ndarray((), RING_HEADER_DTYPE, buf, offset)
+        self.entries = np.ndarray((RING_CAPACITY,), INPUT_DTYPE, buf, offset + RING_HEADER_DTYPE.itemsize)
+        self.bits = None  # Consumer side: buttons held since the last entry
+
+    # Bot side
+
+    def push(self, bits, frame=0):
+        """Queue a button state; False if the game has not kept up and the ring is full"""
+        head = int(self.header["head"])
+        if head - int(self.header["tail"]) >= RING_CAPACITY:
+            return False
+        self.entries[head % RING_CAPACITY] = (frame, bits)
+        self.header["head"] = head + 1  # Publish after the entry is written
+        return True
+
+    # Game side
+
+    def consume(self):
+        """Buttons for this frame: latest state, plus any press seen since the last frame.
+
+        With nothing new the latest state is held, without the earlier presses.
+        """
+        head = int(self.header["head"])
+        tail = int(self.header["tail"])
+        if head == tail:
+            return self.bits
+        tail = max(tail, head - RING_CAPACITY)
+        pressed = 0
+        for i in range(tail, head):
+            pressed |= int(self.entries[i % RING_CAPACITY]["bits"])
+        self.bits = int(self.entries[(head - 1) % RING_CAPACITY]["bits"])
+        self.header["tail"] = head
+        return self.bits | (pressed & PRESSES)
+
+    def poll(self, buffer):
+        """InputSystem source hook: fill buffer; False until a bot has sent anything"""
+        bits = self.consume()
+        if bits is None:
+            return False
+        apply_buttons(buffer, bits)
+        return True
+
+class SharedStateBlock:
+    """Typed views over one block; see SharedStateWriter and SharedStateReader"""
+    def __init__(self, shm):
+        self.shm = shm
+        buf = shm.buf
+        self.header = np.ndarray((), HEADER_DTYPE, buf, 0)
+        self.fighters = np.ndarray((MAX_FIGHTERS,), FIGHTER_DTYPE, buf, FIGHTERS_OFFSET)
+        self.inputs = [InputRing(buf, RINGS_OFFSET + i * RING_SIZE) for i in range(MAX_FIGHTERS)]
+
+    def close(self):
+        # Every view must go before the mapping can close
+        for ring in self.inputs:
+            ring.header = ring.entries = None
+        self.header = self.fighters = None
+        self.inputs = []
+        self.shm.close()
+
+class SharedStateWriter(SharedStateBlock):
+    def __init__(self, name=DEFAULT_NAME):
+        try:
+            shm = shared_memory.SharedMemory(name, create=True, size=BLOCK_SIZE)
+        except FileExistsError:
+            self._remove_stale(name)
+            shm = shared_memory.SharedMemory(name, create=True, size=BLOCK_SIZE)
+        shm.buf[:BLOCK_SIZE] = bytes(BLOCK_SIZE)
+        _written.add(name)
+        super().__init__(shm)
+        self.name = name
+        self._staging = np.zeros(MAX_FIGHTERS, FIGHTER_DTYPE)
+        self.header["fighter_count"] = MAX_FIGHTERS
+        self.header["version"] = VERSION
+        self.header["writer_pid"] = os.getpid()
+        self.header["magic"] = MAGIC  # Last, so readers never see a half-initialised block
+
+    @staticmethod
+    def _remove_stale(name):
+        """Unlink a block left behind by a game that did not shut down cleanly.
+
+        Raises SharedStateError if the block is not one of ours or its
+        writer is still running.
+        """
+        stale = _attach(name)
+        try:
+            if stale.size < BLOCK_SIZE:
+                raise SharedStateError(f"shared memory {name!r} exists and is not a game state block")
+            header = np.ndarray((), HEADER_DTYPE, stale.buf, 0)
+            magic, version, pid = int(header["magic"]), int(header["version"]), int(header["writer_pid"])
+            del header
+            if magic != MAGIC or version != VERSION:
+                raise SharedStateError(f"shared memory {name!r} exists and is not a version {VERSION} "
+                                       f"game state block")
+            if _pid_alive(pid):
+                raise SharedStateError(f"shared memory {name!r} is in use by process {pid}; "
+                                       f"pick another name with --shared-state=NAME")
+        finally:
+            stale.close()
+        # Reopen tracked, so unlink() balances this process's resource tracker
+        stale = shared_memory.SharedMemory(name)
+        stale.close()
+        stale.unlink()
+
+    def publish(self, frame, fighters, combat):
+        staging = self._staging
+        for i, fighter in enumerate(fighters[:MAX_FIGHTERS]):
+            state = combat.states[fighter.combat_id] if fighter.combat_id >= 0 else None
+            staging[i] = (
+                fighter.x, fighter.y, fighter.vel_x, fighter.vel_y,
+                fighter.health.current_health, fighter.health.max_health,
+                fighter.weapon.cooldown, fighter.weapon.cooldown_max,
+                fighter.facing, fighter.state.grounded, fighter.state.is_stunned,
+                state.attack if state else -1,
+                state.attack_frame if state else 0,
+                state.combo_count if state else 0,
+                state.combo_timer if state else 0,
+                fighter.state.recovery_frames
+            )
+        header = self.header
+        seq = int(header["seq"])
+        header["seq"] = seq + 1
+        self.fighters[:] = staging
+        header["frame"] = frame
+        header["published_ns"] = time.monotonic_ns()
+        header["seq"] = seq + 2
+
+    def close(self):
+        super().close()
+        self.shm.unlink()
+        _written.discard(self.name)
+
+class SharedStateReader(SharedStateBlock):
+    def __init__(self, name=DEFAULT_NAME):
+        super().__init__(_attach(name))
+        if int(self.header["magic"]) != MAGIC or int(self.header["version"]) != VERSION:
+            self.close()
+            raise SharedStateError(f"shared memory {name!r} is not a version {VERSION} game state block")
+        self.out = np.zeros(MAX_FIGHTERS, FIGHTER_DTYPE)
+        self.retries = 0  # Reads that raced the writer
+
+    def read(self, out=None):
+        """Consistent (frame, published_ns, fighters) copy; fighters is out, reused every call"""
+        out = self.out if out is None else out
+        header = self.header
+        while True:
+            seq = int(header["seq"])
+            if not seq & 1:
+                np.copyto(out, self.fighters)
+                frame, published = int(header["frame"]), int(header["published_ns"])
+                if int(header["seq"]) == seq:
+                    return frame, published, out
+            self.retries += 1
+            time.sleep(0)
+
+    def wait_frame(self, after, timeout=1.0):
+        """Spin-yield until a frame newer than after is published; None on timeout"""
+        deadline = time.perf_counter() + timeout
+        while int(self.header["frame"]) <= after or int(self.header["seq"]) & 1:
+            if time.perf_counter() > deadline:
+                return None
+            time.sleep(0.0005)
+        return self.read()
+
+def watch(reader, seconds):
+    frame, _, _ = reader.read()
+    start, frames, lag = time.perf_counter(), 0, []
+    while time.perf_counter() - start < seconds:
+        result = reader.wait_frame(frame)
+        if result is None:
+            print("No new frames")
+            continue
+        frame, published, fighters = result
+        lag.append((time.monotonic_ns() - published) / 1e6)
+        frames += 1
+        if frames % 60 == 0:
+            p1, p2 = fighters
+            print(f"frame {frame}: p1 ({p1['x']:.0f}, {p1['y']:.0f}) {p1['health']:.0f} hp | "
+                  f"p2 ({p2['x']:.0f}, {p2['y']:.0f}) {p2['health']:.0f} hp | "
+                  f"read lag avg {sum(lag) / len(lag):.3f} ms | {reader.retries} retries")
+            lag.clear()
+
+def bot(reader, player, seconds, reach=60):
+    """Walk toward the opponent and attack when in reach"""
+    me, them = player - 1, 2 - player
+    ring = reader.inputs[me]
+    frame, _, _ = reader.read()
+    start, sent = time.perf_counter(), 0
+    while time.perf_counter() - start < seconds:
+        result = reader.wait_frame(frame)
+        if result is None:
+            continue
+        frame, _, fighters = result
+        dx = float(fighters[them]["x"] - fighters[me]["x"])
+        toward = RIGHT if dx > 0 else LEFT
+        facing_ok = (fighters[me]["facing"] > 0) == (dx > 0)
+        bits = toward if abs(dx) > reach or not facing_ok else (LIGHT if frame % 20 < 10 else HEAVY)
+        sent += ring.push(bits, frame)
+    print(f"Sent {sent} inputs; p{player} {reader.read()[2][me]['health']:.0f} hp, "
+          f"opponent {reader.read()[2][them]['health']:.0f} hp")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read StickClash shared game state")
+    parser.add_argument("mode", choices=("watch", "bot"))
+    parser.add_argument("--name", default=DEFAULT_NAME)
+    parser.add_argument("--player", type=int, choices=(1, 2), default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    reader = SharedStateReader(args.name)
+    try:
+        if args.mode == "watch":
+            watch(reader, args.seconds)
+        else:
+            bot(reader, args.player, args.seconds)
+    finally:
+        reader.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
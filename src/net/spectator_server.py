@@ -0,0 +1,301 @@
+"""Spectator broadcast server
+
+Streams one live match to many local spectators. Each tick the match
+state is quantized into a fixed-layout record, XOR-delta encoded against
+the last snapshot a client acknowledged and zlib-compressed. Encodings
+are cached per baseline, so clients that acked the same tick share one
+encoded message. Clients whose socket buffers back up are skipped, then
+sent every 2nd/4th/8th tick, then dropped; the match never waits for them.
+
+    python -m src.net.spectator_server --port 7780
+    python -m src.net.spectator_swarm --clients 300
+"""
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.game.simulation import Simulation
+from src.systems.combat_system import CombatSystem
+from src.systems.input_system import (
+    InputBuffer, LEFT, RIGHT, JUMP, LIGHT, HEAVY, SPECIAL, apply_buttons
+)
+
+MAX_SPARKS = 64        # Snapshot slots; extra sparks are not broadcast
+HEALTH_SCALE = 4       # Health is sent in quarter points
+HISTORY = 64           # Snapshots kept as possible delta baselines
+
+FIGHTER_DTYPE = np.dtype([
+    ("x", "<i2"), ("y", "<i2"),
+    ("health", "<u2"), ("max_health", "<u2"),
+    ("facing", "i1"), ("attack", "i1"), ("attack_frame", "u1"), ("flags", "u1")
+])
+SPARK_DTYPE = np.dtype([
+    ("x", "<i2"), ("y", "<i2"), ("size", "u1"), ("color", "u1", (3,))
+])
+SNAPSHOT_DTYPE = np.dtype([
+    ("frame", "<u4"), ("shake", "u1"), ("spark_count", "u1"), ("round", "<u2"),
+    ("fighters", FIGHTER_DTYPE, (2,)),
+    ("sparks", SPARK_DTYPE, (MAX_SPARKS,))
+])
+
+# Fighter flags
+GROUNDED, STUNNED = 1, 2
+
+# Client -> server
+CLIENT_MESSAGE = struct.Struct("<cI")
+HELLO = b"H"
+ACK = b"K"
+
+# Server -> client: header then payload bytes
+SNAPSHOT = struct.Struct("<cIIII")  # b"D", tick, baseline tick, crc32 of full record, payload length
+NO_BASELINE = 0xFFFFFFFF
+
+# Backpressure
+HIGH_WATER = 128 * 1024  # Skip a client while this much is still queued for it
+LOW_WATER = 16 * 1024
+COARSEN_AFTER = 30       # Consecutive skipped sends before halving a client's rate
+MAX_INTERVAL = 8
+RECOVER_AFTER = 120      # Clean sends before doubling it again
+
+def _i16(value):
+    return max(-32768, min(32767, int(value)))
+
+def quantize(sim, round_number=0):
+    """Fixed-layout snapshot record of a Simulation"""
+    record = np.zeros((), dtype=SNAPSHOT_DTYPE)
+    record["frame"] = sim.frame
+    record["round"] = round_number
+    combat = sim.combat
+    record["shake"] = min(255, max(0, int(combat.screen_shake)))
+    fighters = record["fighters"]
+    for i, fighter in enumerate(sim.fighters):
+        state = combat.states[fighter.combat_id] if fighter.combat_id >= 0 else None
+        fighters[i] = (
+            _i16(fighter.x), _i16(fighter.y),
+            int(fighter.health.current_health * HEALTH_SCALE),
+            int(fighter.health.max_health * HEALTH_SCALE),
+            fighter.facing,
+            state.attack if state else -1,
+            min(255, state.attack_frame) if state else 0,
+            (GROUNDED if fighter.state.grounded else 0) | (STUNNED if fighter.state.is_stunned else 0)
+        )
+    sparks = combat.hit_sparks[-MAX_SPARKS:]
+    record["spark_count"] = len(sparks)
+    slots = record["sparks"]
+    for i, spark in enumerate(sparks):
+        slots[i] = (_i16(spark.x), _i16(spark.y), min(255, int(spark.size)), spark.color)
+    return record.tobytes()
+
+def encode_delta(current, baseline):
+    """XOR against the baseline (zeros for a keyframe), then compress"""
+    now = np.frombuffer(current, dtype=np.uint8)
+    if baseline is not None:
+        now = now ^ np.frombuffer(baseline, dtype=np.uint8)
+    return zlib.compress(now.tobytes(), 1)
+
+def decode_delta(payload, baseline):
+    data = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    if baseline is not None:
+        data = data ^ np.frombuffer(baseline, dtype=np.uint8)
+    return data.tobytes()
+
+def bot_buttons(rng, bits):
+    """Random button mashing, holding directions for a while"""
+    if rng.random() < 0.05:
+        bits = rng.choice((0, LEFT, RIGHT))
+    bits &= ~(JUMP | LIGHT | HEAVY | SPECIAL)
+    if rng.random() < 0.02:
+        bits |= JUMP
+    return bits | rng.choice((0,) * 12 + (LIGHT, HEAVY, SPECIAL))
+
+class Spectator:
+    def __init__(self, writer):
+        self.writer = writer
+        self.acked = None      # Last tick the client confirmed
+        self.interval = 1      # Send every n-th tick
+        self.skipped = 0       # Consecutive backed-up ticks
+        self.clean = 0         # Consecutive sends with a drained buffer
+        self.sent_bytes = 0
+
+class BroadcastStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.sends = 0
+        self.skips = 0
+        self.keyframes = 0
+        self.encodes = 0
+        self.encode_time = 0.0
+        self.bytes = 0
+        self.dropped = 0
+        self.coarsened = 0
+        self.jitter = []
+        self.start = time.perf_counter()
+
+class SpectatorServer:
+    def __init__(self, host="127.0.0.1", port=7780, tick_rate=60, report_every=5.0, seed=None):
+        self.host = host
+        self.port = port
+        self.dt = 1.0 / tick_rate
+        self.report_every = report_every
+        self.clients = {}  # writer -> Spectator
+        self.history = OrderedDict()  # tick -> snapshot record bytes
+        self.tick = 0
+        self.round = 0
+        self.stats = BroadcastStats()
+        self._rng = random.Random(seed)
+        self._template = CombatSystem()
+        self._new_round()
+
+    def _new_round(self):
+        self.sim = Simulation(CombatSystem(self._template.frame_data, self._template.hitbox_shapes))
+        self.inputs = (InputBuffer(), InputBuffer())
+        self._bits = [0, 0]
+        self.round += 1
+
+    async def handle_client(self, reader, writer):
+        client = Spectator(writer)
+        self.clients[writer] = client
+        try:
+            while True:
+                kind, tick = CLIENT_MESSAGE.unpack(await reader.readexactly(CLIENT_MESSAGE.size))
+                if kind == ACK and (client.acked is None or tick > client.acked):
+                    client.acked = tick
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def step_match(self):
+        for i, buffer in enumerate(self.inputs):
+            self._bits[i] = bot_buttons(self._rng, self._bits[i])
+            apply_buttons(buffer, self._bits[i])
+        self.sim.step(self.inputs)
+        if self.sim.finished or self.sim.frame >= 60 * 99:
+            self._new_round()
+
+    def broadcast(self):
+        """Snapshot this tick and send it to every client that can take it"""
+        self.tick += 1
+        record = quantize(self.sim, self.round)
+        self.history[self.tick] = record
+        if len(self.history) > HISTORY:
+            self.history.popitem(last=False)
+        crc = zlib.crc32(record)
+
+        encoded = {}  # Baseline tick -> message, shared by every client on that baseline
+        for writer, client in list(self.clients.items()):
+            if writer.is_closing():
+                continue
+            if self.tick % client.interval:
+                continue
+            if not self._has_room(client):
+                continue
+            baseline = client.acked if client.acked in self.history else None
+            message = encoded.get(baseline)
+            if message is None:
+                start = time.perf_counter()
+                payload = encode_delta(record, self.history[baseline] if baseline is not None else None)
+                message = SNAPSHOT.pack(b"D", self.tick, NO_BASELINE if baseline is None else baseline,
+                                        crc, len(payload)) + payload
+                encoded[baseline] = message
+                self.stats.encodes += 1
+                self.stats.encode_time += time.perf_counter() - start
+                if baseline is None:
+                    self.stats.keyframes += 1
+            writer.write(message)
+            client.sent_bytes += len(message)
+            self.stats.sends += 1
+            self.stats.bytes += len(message)
+
+    def _has_room(self, client):
+        """Per-client backpressure: skip, coarsen, then drop clients that cannot keep up"""
+        pending = client.writer.transport.get_write_buffer_size()
+        if pending <= HIGH_WATER:
+            client.skipped = 0
+            if pending <= LOW_WATER:
+                client.clean += 1
+                if client.interval > 1 and client.clean >= RECOVER_AFTER:
+                    client.interval //= 2
+                    client.clean = 0
+            return True
+
+        client.clean = 0
+        client.skipped += 1
+        self.stats.skips += 1
+        if client.skipped >= COARSEN_AFTER:
+            client.skipped = 0
+            if client.interval >= MAX_INTERVAL:
+                self.stats.dropped += 1
+                client.writer.close()
+                return False
+            client.interval *= 2
+            self.stats.coarsened += 1
+        return False
+
+    async def run_ticks(self):
+        next_tick = time.perf_counter()
+        next_report = next_tick + self.report_every
+        while True:
+            now = time.perf_counter()
+            self.stats.jitter.append(now - next_tick)
+            self.step_match()
+            self.broadcast()
+            self.stats.ticks += 1
+            if now >= next_report:
+                self.report()
+                next_report = now + self.report_every
+            next_tick += self.dt
+            if next_tick < time.perf_counter():
+                next_tick = time.perf_counter()
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    def report(self):
+        stats = self.stats
+        wall = time.perf_counter() - stats.start
+        jitter = np.array(stats.jitter) * 1000 if stats.jitter else np.zeros(1)
+        coarse = sum(1 for c in self.clients.values() if c.interval > 1)
+        encode_ms = stats.encode_time / stats.ticks * 1000 if stats.ticks else 0
+        print(f"{len(self.clients)} spectators ({coarse} coarsened) | {stats.ticks / wall:.0f} ticks/s | "
+              f"{stats.sends / wall:.0f} sends/s {stats.bytes / wall / 1024:.0f} KiB/s | "
+              f"{stats.encodes / max(1, stats.ticks):.1f} encodes/tick ({encode_ms:.2f} ms) "
+              f"{stats.keyframes} keyframes | {stats.skips} skips {stats.coarsened} coarsened "
+              f"{stats.dropped} dropped | jitter p99 {np.percentile(jitter, 99):.2f} ms")
+        stats.reset()
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"Spectator server listening on {self.host}:{self.port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_ticks())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash spectator broadcast server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7780)
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--report-every", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = SpectatorServer(args.host, args.port, args.tick_rate, args.report_every, args.seed)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Local spectator swarm for load testing the spectator server
+
+Each client decodes every snapshot against its own stored baselines,
+checks it against the server's CRC and acks it. A share of clients read
+slowly to exercise the server's backpressure.
+
+    python -m src.net.spectator_swarm --clients 300 --slow 0.1
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import zlib
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.net.spectator_server import (
+    ACK, CLIENT_MESSAGE, HELLO, HISTORY, NO_BASELINE, SNAPSHOT, decode_delta
+)
+
+class SwarmStats:
+    def __init__(self):
+        self.connected = 0
+        self.snapshots = 0
+        self.keyframes = 0
+        self.bytes = 0
+        self.missing_baseline = 0
+        self.corrupt = 0
+        self.disconnected = 0
+
+async def spectator(host, port, stats, deadline, slow_delay):
+    reader, writer = await asyncio.open_connection(host, port)
+    stats.connected += 1
+    writer.write(CLIENT_MESSAGE.pack(HELLO, 0))
+    history = OrderedDict()
+    try:
+        while time.perf_counter() < deadline:
+            header = await reader.readexactly(SNAPSHOT.size)
+            _, tick, baseline, crc, length = SNAPSHOT.unpack(header)
+            payload = await reader.readexactly(length)
+            stats.bytes += SNAPSHOT.size + length
+            if baseline == NO_BASELINE:
+                base = None
+                stats.keyframes += 1
+            else:
+                base = history.get(baseline)
+                if base is None:
+                    stats.missing_baseline += 1
+                    continue
+            record = decode_delta(payload, base)
+            if zlib.crc32(record) != crc:
+                stats.corrupt += 1
+                continue
+            history[tick] = record
+            if len(history) > HISTORY:
+                history.popitem(last=False)
+            stats.snapshots += 1
+            writer.write(CLIENT_MESSAGE.pack(ACK, tick))
+            if slow_delay:
+                await asyncio.sleep(slow_delay)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        stats.disconnected += 1
+    finally:
+        writer.close()
+
+async def run(clients, host, port, duration, slow_share, slow_delay):
+    stats = SwarmStats()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    rng = random.Random(0)
+    tasks = [
+        asyncio.create_task(spectator(host, port, stats, deadline,
+                                      slow_delay if rng.random() < slow_share else 0))
+        for _ in range(clients)
+    ]
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(min(5, max(0.1, deadline - time.perf_counter())))
+        elapsed = time.perf_counter() - start
+        print(f"{stats.connected}/{clients} connected | {stats.snapshots / elapsed:.0f} snapshots/s "
+              f"{stats.bytes / elapsed / 1024:.0f} KiB/s | {stats.keyframes} keyframes | "
+              f"{stats.missing_baseline} missing baselines {stats.corrupt} corrupt | "
+              f"{stats.disconnected} dropped by server")
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        print(f"{len(errors)} spectators failed, first: {errors[0]!r}")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash spectator load generator")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7780)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--slow", type=float, default=0.05, help="Share of clients that read slowly")
+    parser.add_argument("--slow-delay", type=float, default=0.1, help="Seconds a slow client waits per snapshot")
+    args = parser.parse_args(argv)
+    stats = asyncio.run(run(args.clients, args.host, args.port, args.duration, args.slow, args.slow_delay))
+    return 1 if stats.corrupt else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""Indexed, memory-mapped fighter record store
+
+Records live in an append-only data file; an id and tag index is kept
+beside it so a single fighter can be read without parsing the others.
+The index is only a checkpoint: it is rewritten every CHECKPOINT_BYTES
+of log and on close, and committed batches past it are replayed on open.
+db.json remains the interchange format:
+
+    python -m src.storage.fighter_store import db.json
+    python -m src.storage.fighter_store export db.json
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from contextlib import contextmanager
+
+DEFAULT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "store"
+)
+INDEX_VERSION = 1
+# Log bytes appended since the last index write before put/delete rewrites it
+CHECKPOINT_BYTES = 1 << 20
+
+# kind, id length, payload length, crc32 of id + payload
+RECORD_HEADER = struct.Struct("<BHII")
+PUT = 1
+DELETE = 2
+COMMIT = 3
+
+class StoreError(Exception):
+    pass
+
+class FighterStore:
+    """Append-only fighter records with O(1) id lookup and a tag index"""
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        self.data_path = os.path.join(directory, "fighters.dat")
+        self.index_path = os.path.join(directory, "fighters.idx")
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.data_path):
+            open(self.data_path, "wb").close()
+
+        self.offsets = {}  # id -> (payload offset, payload length)
+        self.tags = {}     # tag -> set of ids
+        self._tags_of = {} # id -> set of tags
+        self.data_length = 0
+        self._indexed_length = 0  # data_length covered by the index file
+        self._map = None
+        self._mapped_length = 0
+        self._load_index()
+
+    # Reads
+
+    def get(self, fighter_id):
+        """Fighter record by id, or None"""
+        entry = self.offsets.get(fighter_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        return json.loads(self._view()[offset:offset + length])
+
+    def by_tag(self, tag):
+        """All fighters carrying a tag, without scanning the data file"""
+        return [self.get(fighter_id) for fighter_id in sorted(self.tags.get(tag, ()))]
+
+    def ids(self):
+        return list(self.offsets)
+
+    def __contains__(self, fighter_id):
+        return fighter_id in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _view(self):
+        """mmap of the committed data, remapped when the file has grown"""
+        if self._map is None or self._mapped_length != self.data_length:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self.data_length == 0:
+                return b""
+            with open(self.data_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), self.data_length, access=mmap.ACCESS_READ)
+            self._mapped_length = self.data_length
+        return self._map
+
+    # Writes
+
+    @contextmanager
+    def batch(self):
+        """Group puts/deletes into one atomic append.
+
+        Nothing is visible (or durable) until the block exits cleanly.
+        """
+        batch = _Batch()
+        yield batch
+        if batch.ops:
+            self._commit(batch.ops)
+
+    def put(self, record):
+        with self.batch() as batch:
+            batch.put(record)
+
+    def delete(self, fighter_id):
+        with self.batch() as batch:
+            batch.delete(fighter_id)
+
+    def _commit(self, ops):
+        chunks = []
+        offset = self.data_length
+        pending = []
+        for kind, fighter_id, payload in ops:
+            chunk = _encode(kind, fighter_id, payload)
+            pending.append((kind, fighter_id, payload,
+                            offset + RECORD_HEADER.size + len(fighter_id.encode())))
+            chunks.append(chunk)
+            offset += len(chunk)
+        chunks.append(_encode(COMMIT, "", b""))
+        offset += RECORD_HEADER.size
+
+        with open(self.data_path, "r+b") as f:
+            # Drop any torn tail left by an interrupted batch
+            f.truncate(self.data_length)
+            f.seek(self.data_length)
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+
+        for kind, fighter_id, payload, payload_offset in pending:
+            self._apply(kind, fighter_id, payload, payload_offset)
+        self.data_length = offset
+        if self.data_length - self._indexed_length >= CHECKPOINT_BYTES:
+            self.checkpoint()
+
+    def _apply(self, kind, fighter_id, payload, payload_offset):
+        self.offsets.pop(fighter_id, None)
+        for tag in self._tags_of.pop(fighter_id, ()):
+            self.tags[tag].discard(fighter_id)
+        if kind == PUT:
+            self.offsets[fighter_id] = (payload_offset, len(payload))
+            tags = set(json.loads(payload).get("tags", []))
+            self._tags_of[fighter_id] = tags
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(fighter_id)
+
+    # Index maintenance
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                raise ValueError("index version mismatch")
+            self.offsets = {k: tuple(v) for k, v in index["records"].items()}
+            self.tags = {k: set(v) for k, v in index["tags"].items()}
+            self.data_length = index["data_length"]
+        except (OSError, ValueError, KeyError):
+            self.offsets, self.tags, self.data_length = {}, {}, 0
+        self._indexed_length = self.data_length
+        self._tags_of = {}
+        for tag, ids in self.tags.items():
+            for fighter_id in ids:
+                self._tags_of.setdefault(fighter_id, set()).add(tag)
+
+        # Replay committed batches written after the index was saved
+        if os.path.getsize(self.data_path) > self.data_length:
+            if self._replay():
+                self.checkpoint()
+
+    def _replay(self):
+        base = self.data_length
+        with open(self.data_path, "rb") as f:
+            f.seek(base)
+            tail = f.read()
+        position = 0
+        pending = []
+        replayed = False
+        while position + RECORD_HEADER.size <= len(tail):
+            kind, id_length, payload_length, crc = RECORD_HEADER.unpack_from(tail, position)
+            start = position + RECORD_HEADER.size
+            end = start + id_length + payload_length
+            body = tail[start:end]
+            if end > len(tail) or zlib.crc32(body) != crc or kind not in (PUT, DELETE, COMMIT):
+                break
+            position = end
+            if kind == COMMIT:
+                for args in pending:
+                    self._apply(*args)
+                pending = []
+                self.data_length = base + end
+                replayed = True
+                continue
+            fighter_id = body[:id_length].decode()
+            pending.append((kind, fighter_id, body[id_length:], base + start + id_length))
+        return replayed
+
+    def checkpoint(self):
+        """Write the index so the next open replays nothing"""
+        if self.data_length != self._indexed_length or not os.path.exists(self.index_path):
+            self._write_index()
+
+    def _write_index(self):
+        index = {
+            "version": INDEX_VERSION,
+            "data_length": self.data_length,
+            "records": self.offsets,
+            "tags": {tag: sorted(ids) for tag, ids in self.tags.items() if ids}
+        }
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self._indexed_length = self.data_length
+
+    def compact(self):
+        """Rewrite only live records, dropping superseded versions"""
+        records = [self.get(fighter_id) for fighter_id in self.offsets]
+        self._unmap()
+        for path in (self.data_path, self.index_path):
+            if os.path.exists(path):
+                os.replace(path, path + ".old")
+        open(self.data_path, "wb").close()
+        self.offsets, self.tags, self._tags_of, self.data_length = {}, {}, {}, 0
+        with self.batch() as batch:
+            for record in records:
+                batch.put(record)
+        self._write_index()
+        for path in (self.data_path, self.index_path):
+            if os.path.exists(path + ".old"):
+                os.remove(path + ".old")
+
+    def close(self):
+        self.checkpoint()
+        self._unmap()
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # JSON interchange
+
+    def import_json(self, path):
+        """Load a db.json-style document in one batch"""
+        with open(path) as f:
+            fighters = json.load(f).get("fighters", [])
+        with self.batch() as batch:
+            for record in fighters:
+                batch.put(record)
+        return len(fighters)
+
+    def export_json(self, path):
+        document = {"fighters": [self.get(fighter_id) for fighter_id in self.offsets]}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+        return len(document["fighters"])
+
+class _Batch:
+    def __init__(self):
+        self.ops = []
+
+    def put(self, record):
+        if "id" not in record:
+            raise StoreError(f"Fighter record has no id: {record!r}")
+        payload = json.dumps(record, separators=(",", ":")).encode()
+        self.ops.append((PUT, str(record["id"]), payload))
+
+    def delete(self, fighter_id):
+        self.ops.append((DELETE, str(fighter_id), b""))
+
+def _encode(kind, fighter_id, payload):
+    key = fighter_id.encode()
+    body = key + payload
+    return RECORD_HEADER.pack(kind, len(key), len(payload), zlib.crc32(body)) + body
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash fighter store")
+    parser.add_argument("--store", default=DEFAULT_DIR, help="Store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Import a db.json file").add_argument("path")
+    sub.add_parser("export", help="Export to a db.json file").add_argument("path")
+    sub.add_parser("get", help="Print one fighter").add_argument("id")
+    sub.add_parser("tag", help="Print fighters with a tag").add_argument("tag")
+    sub.add_parser("compact", help="Drop superseded records")
+    args = parser.parse_args(argv)
+
+    store = FighterStore(args.store)
+    try:
+        if args.command == "import":
+            print(f"Imported {store.import_json(args.path)} fighters")
+        elif args.command == "export":
+            print(f"Exported {store.export_json(args.path)} fighters")
+        elif args.command == "get":
+            record = store.get(args.id)
+            if record is None:
+                print(f"No fighter {args.id}")
+                return 1
+            print(json.dumps(record, indent=2))
+        elif args.command == "tag":
+            print(json.dumps(store.by_tag(args.tag), indent=2))
+        elif args.command == "compact":
+            store.compact()
+            print(f"Compacted to {len(store)} fighters")
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""CPU opponent"""
+import random
+
+from .input_system import InputBuffer
+
+class AIController:
+    """Drives one fighter through an InputBuffer a few times a second.
+
+    Decisions are held between updates, the way a player holds buttons,
+    so the controller can run well below the simulation rate. It has its
+    own RNG so thinking never shifts the simulation's random sequence.
+    """
+    def __init__(self, fighter, target, reach=60, aggression=0.6, seed=None):
+        self.fighter = fighter
+        self.target = target
+        self.reach = reach
+        self.aggression = aggression  # Chance to attack per decision when in reach
+        self.buffer = InputBuffer()
+        self.rng = random.Random(seed)
+
+    def update(self):
+        fighter, buffer, rng = self.fighter, self.buffer, self.rng
+        dx = self.target.x - fighter.x
+        toward = 1 if dx > 0 else -1
+        in_reach = abs(dx) <= self.reach
+        # Close in, and turn to face the target when it crosses over
+        approach = not in_reach or fighter.facing != toward
+        buffer.move_left = approach and toward < 0
+        buffer.move_right = approach and toward > 0
+        buffer.jump = self.target.y < fighter.y - 40 and rng.random() < 0.5
+
+        buffer.attack = buffer.heavy = buffer.special = False
+        if in_reach and not approach and rng.random() < self.aggression:
+            roll = rng.random()
+            if roll < 0.15:
+                buffer.special = True
+            elif roll < 0.45:
+                buffer.heavy = True
+            else:
+                buffer.attack = True
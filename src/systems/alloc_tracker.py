@@ -0,0 +1,273 @@
+"""Per-frame allocation tracking with per-system attribution (debug mode)
+
+AllocationTracker wraps system methods and, with tracemalloc running,
+records for each system per frame:
+
+  peak   - transient high-water bytes allocated during its calls
+  bytes  - bytes still alive at the end of the frame
+  blocks - allocations still alive at the end of the frame
+
+The last two come from diffing tracemalloc snapshots between frames and
+walking each new trace's traceback to the innermost tracked system.
+Allocations that outlive the frame are what advance the GC generation
+counters, so they are what budgets are checked against.
+
+Tracked calls may run on several threads, as with Game(threaded=True):
+each thread keeps its own call stack. tracemalloc's peak counter is
+process-wide, though, so a peak measured while another thread allocates
+includes that thread's allocations too.
+
+    python -m src.systems.alloc_tracker 600 --budget CombatSystem.update=20
+"""
+import argparse
+import functools
+import os
+import sys
+import threading
+import tracemalloc
+from collections import defaultdict, deque
+
+PEAK, BYTES, BLOCKS, CALLS = range(4)
+OTHER = "other"
+
+class AllocationBudgetError(AssertionError):
+    pass
+
+def _code_span(func):
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return None
+    lines = [line for _, _, line in code.co_lines() if line is not None]
+    return code.co_filename, min(lines, default=code.co_firstlineno), max(lines, default=code.co_firstlineno)
+
+class AllocationTracker:
+    def __init__(self, budgets=None, window=120, depth=16):
+        self.budgets = dict(budgets or {})  # System label -> max blocks per frame
+        self.window = deque(maxlen=window)
+        self.depth = depth
+        self._frame = defaultdict(lambda: [0, 0, 0, 0])
+        self._local = threading.local()  # Per-thread stack of calls being measured
+        self._lock = threading.Lock()    # Guards _frame across threads
+        self._spans = defaultdict(list)  # filename -> [(first, last, label)]
+        self._labels = {}                # traceback -> label cache
+        self._wrapped = []
+        self._snapshot = None
+        # The tracker's own bookkeeping; checked per diff, far cheaper than filter_traces
+        self._ignored = {tracemalloc.__file__, __file__}
+
+    # Instrumentation
+
+    def wrap(self, owner, method_name, label=None):
+        """Track owner.method_name; owner may be a class (every instance) or one object"""
+        original = getattr(owner, method_name)
+        func = getattr(original, "__func__", original)
+        if label is None:
+            owner_name = owner.__name__ if isinstance(owner, type) else type(owner).__name__
+            label = f"{owner_name}.{method_name}"
+        span = _code_span(func)
+        if span:
+            filename, first, last = span
+            self._spans[filename].append((first, last, label))
+
+        @functools.wraps(func)
+        def tracked(*args, **kwargs):
+            return self.measure(label, func, *args, **kwargs)
+
+        if isinstance(owner, type):
+            previous = owner.__dict__.get(method_name)
+            setattr(owner, method_name, tracked)
+        else:
+            previous = None
+            setattr(owner, method_name, functools.partial(tracked, owner))
+        self._wrapped.append((owner, method_name, previous))
+        return label
+
+    def unwrap_all(self):
+        for owner, method_name, previous in reversed(self._wrapped):
+            if previous is None:
+                delattr(owner, method_name)
+            else:
+                setattr(owner, method_name, previous)
+        self._wrapped.clear()
+
+    def measure(self, label, func, *args, **kwargs):
+        if not tracemalloc.is_tracing():
+            return func(*args, **kwargs)
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        if stack:
+            # Fold the caller's peak so far before resetting it for us
+            stack[-1][1] = max(stack[-1][1], tracemalloc.get_traced_memory()[1])
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        entry = [start, start]
+        stack.append(entry)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], entry[1])
+            with self._lock:
+                stats = self._frame[label]
+                stats[PEAK] += peak - start
+                stats[CALLS] += 1
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+                tracemalloc.reset_peak()
+
+    # Frames
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+        self._snapshot = tracemalloc.take_snapshot()
+        return self
+
+    def stop(self):
+        self.unwrap_all()
+        tracemalloc.stop()
+        self._snapshot = None
+
+    def _attribute(self, traceback):
+        label = self._labels.get(traceback)
+        if label is None:
+            label = OTHER
+            # Innermost tracked system wins
+            for frame in reversed(traceback):
+                for first, last, name in self._spans.get(frame.filename, ()):
+                    if first <= frame.lineno <= last:
+                        label = name
+                        break
+                else:
+                    continue
+                break
+            self._labels[traceback] = label
+        return label
+
+    def end_frame(self):
+        """Close the current frame; call once per frame after drawing"""
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot()
+        diffs = snapshot.compare_to(self._snapshot, "traceback") if self._snapshot is not None else ()
+        with self._lock:
+            for diff in diffs:
+                if diff.count_diff <= 0 or diff.traceback[-1].filename in self._ignored:
+                    continue
+                stats = self._frame[self._attribute(diff.traceback)]
+                stats[BYTES] += max(0, diff.size_diff)
+                stats[BLOCKS] += diff.count_diff
+            self.window.append(dict(self._frame))
+            self._frame.clear()
+        self._snapshot = snapshot
+
+    # Reporting
+
+    def summary(self):
+        """label -> (avg peak bytes, avg bytes, avg blocks, max blocks, calls) per frame over the window"""
+        frames = len(self.window) or 1
+        totals = defaultdict(lambda: [0, 0, 0, 0, 0])
+        for frame in self.window:
+            for label, (peak, size, blocks, calls) in frame.items():
+                total = totals[label]
+                total[0] += peak
+                total[1] += size
+                total[2] += blocks
+                total[3] = max(total[3], blocks)
+                total[4] += calls
+        return {
+            label: (peak / frames, size / frames, blocks / frames, worst, calls / frames)
+            for label, (peak, size, blocks, worst, calls) in totals.items()
+        }
+
+    def report(self, top=10):
+        rows = sorted(self.summary().items(), key=lambda item: (-item[1][2], -item[1][0]))[:top]
+        lines = [f"Allocations per frame over {len(self.window)} frames:",
+                 f"  {'system':32} {'calls':>6} {'peak B':>9} {'kept B':>9} {'blocks':>7} {'max':>5}"]
+        for label, (peak, size, blocks, worst, calls) in rows:
+            budget = self.budgets.get(label)
+            flag = f"  > budget {budget}" if budget is not None and blocks > budget else ""
+            lines.append(f"  {label:32} {calls:6.1f} {peak:9.0f} {size:9.0f} {blocks:7.1f} {worst:5d}{flag}")
+        return "\n".join(lines)
+
+    def check_budgets(self):
+        """(label, blocks per frame, budget) for every system over its budget"""
+        summary = self.summary()
+        violations = []
+        for label, budget in self.budgets.items():
+            blocks = summary.get(label, (0, 0, 0, 0, 0))[2]
+            if blocks > budget:
+                violations.append((label, blocks, budget))
+        return violations
+
+    def assert_within_budget(self):
+        """Test hook: raise AllocationBudgetError if any system is over budget"""
+        violations = self.check_budgets()
+        if violations:
+            raise AllocationBudgetError("; ".join(
+                f"{label} kept {blocks:.1f} allocations/frame (budget {budget})"
+                for label, blocks, budget in violations
+            ))
+
+def instrument_game(tracker, game):
+    """Track the per-frame systems of a src.main.Game"""
+    from ..components.store import ComponentStore
+    from ..components.weapon import WeaponComponent
+    from ..game.simulation import Simulation
+    from .combat_system import CombatSystem
+    from .input_system import InputSystem
+    from .render_system import RenderSystem
+
+    for owner, method_name in (
+        (InputSystem, "process_inputs"),
+        (Simulation, "step"),
+        (CombatSystem, "process_attack"),
+        (CombatSystem, "update"),
+        (ComponentStore, "update"),
+        (WeaponComponent, "update"),
+        (RenderSystem, "update"),
+        (RenderSystem, "draw_frame"),
+        (RenderSystem, "apply_flash"),
+        (type(game), "snapshot")
+    ):
+        tracker.wrap(owner, method_name)
+    return tracker
+
+def parse_budget(text):
+    label, _, blocks = text.partition("=")
+    return label, float(blocks)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-system allocation report for a headless match")
+    parser.add_argument("frames", type=int, nargs="?", default=600)
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[],
+                        metavar="SYSTEM=BLOCKS", help="Max allocations kept per frame")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.main import Game
+
+    game = Game()
+    tracker = AllocationTracker(dict(args.budget), window=args.frames)
+    instrument_game(tracker, game).start()
+    try:
+        for _ in range(args.frames):
+            game.update()
+            game.draw(game.snapshot())
+            tracker.end_frame()
+    finally:
+        tracker.stop()
+    print(tracker.report(args.top))
+    try:
+        tracker.assert_within_budget()
+    except AllocationBudgetError as e:
+        print(f"Over budget: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
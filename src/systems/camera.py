@@ -0,0 +1,53 @@
+"""Scrolling, zooming camera for arenas larger than the screen"""
+import pygame
+
+# Zoom is snapped to this step so the offscreen view surface is reused
+ZOOM_STEP = 0.05
+
+class Camera:
+    def __init__(self, viewport_size, world_size, margin=200, min_zoom=0.5, max_zoom=1.0,
+                 smoothing=0.1):
+        self.viewport_w, self.viewport_h = viewport_size
+        self.world_w, self.world_h = world_size
+        self.margin = margin
+        self.min_zoom = max(min_zoom, self.viewport_w / self.world_w, self.viewport_h / self.world_h)
+        self.max_zoom = max_zoom
+        self.smoothing = smoothing
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = max_zoom
+
+    def follow(self, fighters):
+        """Ease toward framing every fighter with some margin"""
+        xs = [f.x for f in fighters]
+        ys = [f.y for f in fighters]
+        span_w = max(xs) - min(xs) + self.margin * 2
+        span_h = max(ys) - min(ys) + self.margin * 2
+        target_zoom = min(self.max_zoom, self.viewport_w / span_w, self.viewport_h / span_h)
+        target_zoom = max(self.min_zoom, target_zoom)
+        self.zoom += (target_zoom - self.zoom) * self.smoothing
+
+        w, h = self.view_size()
+        center_x = (max(xs) + min(xs)) / 2
+        center_y = (max(ys) + min(ys)) / 2
+        target_x = min(max(center_x - w / 2, 0), self.world_w - w)
+        target_y = min(max(center_y - h / 2, 0), self.world_h - h)
+        self.x += (target_x - self.x) * self.smoothing
+        self.y += (target_y - self.y) * self.smoothing
+        self.x = min(max(self.x, 0), self.world_w - w)
+        self.y = min(max(self.y, 0), self.world_h - h)
+
+    def snapped_zoom(self):
+        return max(self.min_zoom, round(self.zoom / ZOOM_STEP) * ZOOM_STEP)
+
+    def view_size(self):
+        zoom = self.snapped_zoom()
+        return int(self.viewport_w / zoom), int(self.viewport_h / zoom)
+
+    def view(self):
+        """Visible world area as (x, y, w, h)"""
+        w, h = self.view_size()
+        return (int(self.x), int(self.y), w, h)
+
+    def visible(self, rect):
+        return pygame.Rect(self.view()).colliderect(rect)
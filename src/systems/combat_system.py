@@ -5,10 +5,11 @@ import math
 from enum import Enum, auto
 from dataclasses import dataclass
 
-class WeaponType(Enum):
-    SWORD = 1
-    HAMMER = 2
-    SPEAR = 3
+from ..components.weapon import WeaponType
+from .frame_data import (AttackType, Phase, FrameDataTables, apply_weapon_overrides,
+                         load_fighter_specials, load_weapon_overrides)
+from .hitbox_shapes import HitboxShapeCache
+from .quality import FULL_QUALITY, scaled
 
 @dataclass
 class HitSpark:
@@ -18,6 +19,7 @@ class HitSpark:
     color: tuple
     lifetime: int
     velocity: tuple
+    priority: int = 1  # Higher survives eviction when over the spark budget
 
 class AttackResult(Enum):
     NORMAL = auto()
@@ -27,14 +29,19 @@ class AttackResult(Enum):
 
 @dataclass
 class CombatState:
-    last_hit_time: int = 0
+    tables: tuple = ()     # AttackTables indexed by AttackType
+    shapes: tuple = ()     # Per attack: (right, left) HitboxShapes by frame, or None
+    attack: int = -1       # Current AttackType, -1 when idle
+    attack_frame: int = 0
+    connected: bool = False
     combo_count: int = 0
     combo_timer: int = 0
-    last_move: str = ""
-    in_attack_animation: bool = False
+    last_attack: int = -1
+    weapon_type: object = None  # Key for re-fetching tables after a data reload
+    name: str = None
 
 class CombatSystem:
-    def __init__(self):
+    def __init__(self, frame_data=None, hitbox_shapes=None):
         self.hit_sparks = []
         self.screen_shake = 0
         self.weapon_profiles = {
@@ -42,22 +49,47 @@ class CombatSystem:
                 'damage': 15,
                 'knockback': 5,
                 'cooldown': 20,
+                'range': 80,
                 'spark_color': (200, 220, 255),
-                'hit_stop': 3
+                'hit_stop': 3,
+                # (startup, active, recovery) frames
+                'frames': {'light': (4, 3, 10), 'heavy': (8, 4, 16), 'special': (12, 6, 20)}
             },
             WeaponType.HAMMER: {
                 'damage': 25,
                 'knockback': 12,
                 'cooldown': 40,
+                'range': 60,
                 'spark_color': (255, 200, 100),
-                'hit_stop': 8
+                'hit_stop': 8,
+                'frames': {'light': (8, 4, 18), 'heavy': (16, 6, 28), 'special': (20, 8, 32)}
             },
             WeaponType.SPEAR: {
                 'damage': 20,
                 'knockback': 8,
                 'cooldown': 30,
+                'range': 100,
                 'spark_color': (150, 255, 150),
-                'hit_stop': 5
+                'hit_stop': 5,
+                'frames': {'light': (6, 3, 14), 'heavy': (10, 4, 20), 'special': (14, 6, 24)}
+            },
+            WeaponType.WHIP: {
+                'damage': 10,
+                'knockback': 4,
+                'cooldown': 15,
+                'range': 120,
+                'spark_color': (220, 150, 255),
+                'hit_stop': 3,
+                'frames': {'light': (5, 4, 8), 'heavy': (9, 5, 14), 'special': (12, 8, 18)}
+            },
+            WeaponType.GUN: {
+                'damage': 25,
+                'knockback': 6,
+                'cooldown': 60,
+                'range': 200,
+                'spark_color': (255, 255, 150),
+                'hit_stop': 4,
+                'frames': {'light': (10, 2, 20), 'heavy': (16, 2, 30), 'special': (20, 4, 36)}
             }
         }
         self.combo_windows = {
@@ -65,39 +97,137 @@ class CombatSystem:
             "heavy": 45,
             "special": 60
         }
-        self.counter_window = 8  # Frames for counter attacks
-        self.states = {}  # fighter_id: CombatState
+        # Code defaults stay pristine; data/weapon_profiles.json tunes on top
+        self.base_weapon_profiles = self.weapon_profiles
+        if frame_data is None:
+            self.weapon_profiles = apply_weapon_overrides(self.base_weapon_profiles,
+                                                          load_weapon_overrides())
+        else:
+            self.weapon_profiles = dict(frame_data.profiles)
+        # Compiled tables can be shared between many CombatSystems
+        self.frame_data = frame_data or FrameDataTables(
+            self.weapon_profiles, self.combo_windows, load_fighter_specials()
+        )
+        self.hitbox_shapes = hitbox_shapes or HitboxShapeCache()
+        self.states = []  # CombatState indexed by fighter.combat_id
+        self.frame = 0
+        self.telemetry = None  # Optional CombatTelemetry
+        self.sound = None      # Optional SoundSystem
+        self.effects_quality = FULL_QUALITY
+    
+    def register(self, fighter):
+        """Give a fighter a combat slot and its compiled attack tables"""
+        fighter.combat_id = len(self.states)
+        weapon_type = fighter.weapon.weapon_type
+        name = getattr(fighter, 'name', None)
+        tables = self.frame_data.for_fighter(weapon_type, name)
+        self.states.append(CombatState(
+            tables=tables,
+            shapes=tuple(self.hitbox_shapes.for_table(table) for table in tables),
+            weapon_type=weapon_type,
+            name=name
+        ))
+    
+    def swap_frame_data(self, frame_data):
+        """Install recompiled tables; call between frames.
+        
+        An attack in progress continues on its new table, or ends if that
+        table is now shorter than the current frame.
+        """
+        self.frame_data = frame_data
+        self.weapon_profiles = dict(frame_data.profiles)
+        for state in self.states:
+            tables = frame_data.for_fighter(state.weapon_type, state.name)
+            if tables is state.tables:
+                continue
+            state.tables = tables
+            state.shapes = tuple(self.hitbox_shapes.for_table(table) for table in tables)
+            if state.attack >= 0 and state.attack_frame >= len(tables[state.attack]):
+                state.attack = -1
+                state.attack_frame = 0
+    
+    def start_attack(self, fighter, attack_type):
+        """Begin an attack if idle or cancelling the current one into another type.
+        
+        A held button would otherwise restart its own attack every frame
+        of the cancel window, so an attack never cancels into itself.
+        """
+        state = self.states[fighter.combat_id]
+        if state.attack >= 0 and (attack_type == state.attack
+                                  or not state.tables[state.attack].cancel[state.attack_frame]):
+            return False
+        if fighter.state.recovery_frames > 0:
+            return False
+        state.attack = attack_type
+        state.attack_frame = 0
+        state.connected = False
+        return True
     
     def process_attack(self, attacker, defender):
-        """Handle weapon collision and effects"""
-        if not self._check_hit(attacker, defender):
-            self._handle_whiff(attacker)
-            return AttackResult.WHIFF
+        """Handle weapon collision and effects for the attacker's current frame"""
+        if self.telemetry is None and self.sound is None:
+            return self._resolve_attack(attacker, defender)
+        
+        health_before = defender.health.current_health
+        state = self.states[attacker.combat_id]
+        attack = state.attack
+        result = self._resolve_attack(attacker, defender)
+        if result is None:
+            return None
+        if self.telemetry is not None:
+            self.telemetry.record(
+                self.frame, result.value, attacker.combat_id, defender.combat_id,
+                attacker.weapon.weapon_type.value, attack,
+                health_before - defender.health.current_health, state.combo_count
+            )
+        if self.sound is not None:
+            self.sound.play_result(result, attacker.weapon.weapon_type, state.combo_count)
+        return result
+    
+    def _resolve_attack(self, attacker, defender):
+        state = self.states[attacker.combat_id]
+        if state.attack < 0:
+            return None
+        table = state.tables[state.attack]
+        frame = state.attack_frame
+        if table.phases[frame] != Phase.ACTIVE:
+            return None
+        self._add_trail(attacker, table, frame)
+        if state.connected:
+            return None
+        
+        if not self._check_hit(attacker, defender, state):
+            # Whiff once the last active frame passes without contact
+            if frame + 1 >= len(table) or table.phases[frame + 1] != Phase.ACTIVE:
+                self._handle_whiff(attacker)
+                return AttackResult.WHIFF
+            return None
+        state.connected = True
             
-        # Check counter attack
-        current_frame = pygame.time.get_ticks()
-        if (current_frame - self.states[defender.id].last_hit_time < self.counter_window
+        # Check counter attack: defender caught in their own startup
+        defender_state = self.states[defender.combat_id]
+        if (defender_state.attack >= 0
+            and defender_state.tables[defender_state.attack].phases[defender_state.attack_frame] == Phase.STARTUP
             and not defender.state.is_stunned):
-            return self._handle_counter(attacker, defender)
+            return self._handle_counter(attacker, defender, table.damage[frame])
             
         # Check combo
-        if (self.states[attacker.id].combo_timer > 0 
-            and self.states[attacker.id].last_move != attacker.weapon.current_attack_type):
-            return self._handle_combo(attacker, defender)
+        if state.combo_timer > 0 and state.last_attack != state.attack:
+            return self._handle_combo(attacker, defender, table.damage[frame])
             
         # Normal hit
-        return self._handle_normal_hit(attacker, defender)
+        return self._handle_normal_hit(attacker, defender, table, frame)
     
-    def _handle_normal_hit(self, attacker, defender):
+    def _handle_normal_hit(self, attacker, defender, table, frame):
         """Handle normal hit logic"""
-        weapon = self.weapon_profiles[attacker.weapon.type]
+        weapon = self.weapon_profiles[attacker.weapon.weapon_type]
         
         # Apply damage
-        defender.health.take_damage(weapon['damage'])
+        defender.health.take_damage(table.damage[frame])
         
         # Create hit sparks
-        for _ in range(random.randint(5, 10)):
-            self.hit_sparks.append(HitSpark(
+        for _ in range(scaled(random.randint(5, 10), self.effects_quality.spark_scale)):
+            self._add_spark(HitSpark(
                 x=defender.x,
                 y=defender.y,
                 size=random.randint(3, weapon['hit_stop']),
@@ -109,44 +239,49 @@ class CombatSystem:
                 )
             ))
         
-        # Apply knockback
-        direction = 1 if attacker.x < defender.x else -1
-        defender.velocity_x = weapon['knockback'] * direction
+        # Apply knockback unless the defender is in armor frames
+        if not self._is_armored(defender):
+            direction = 1 if attacker.x < defender.x else -1
+            defender.vel_x = table.knockback * direction
         
         # Screen shake
-        self.screen_shake = weapon['hit_stop']
+        self.screen_shake = table.hit_stop
         
-        self.states[attacker.id].combo_timer = self.combo_windows[attacker.weapon.current_attack_type]
-        self.states[attacker.id].last_move = attacker.weapon.current_attack_type
+        state = self.states[attacker.combat_id]
+        state.combo_timer = table.combo_window
+        state.last_attack = state.attack
         return AttackResult.NORMAL
     
-    def _handle_counter(self, attacker, defender):
+    def _handle_counter(self, attacker, defender, damage):
         """Handle counter attack logic"""
         # Reverse knockback
-        defender.health.take_damage(attacker.weapon.damage * 1.5)
-        attacker.health.take_damage(attacker.weapon.damage * 0.5)
+        defender.health.take_damage(damage * 1.5)
+        attacker.health.take_damage(damage * 0.5)
         
         # Dramatic screen shake
         self.screen_shake = 15
         
         # Special counter sparks
-        for _ in range(15):
-            self._create_spark(defender.x, defender.y, (255, 255, 0), 8, 25)
+        for _ in range(scaled(15, self.effects_quality.spark_scale)):
+            self._create_spark(defender.x, defender.y, (255, 255, 0), 8, 25, priority=3)
         
         return AttackResult.COUNTER
     
-    def _handle_combo(self, attacker, defender):
+    def _handle_combo(self, attacker, defender, damage):
         """Handle combo logic"""
+        state = self.states[attacker.combat_id]
+        
         # Bonus damage for combos
-        combo_multiplier = 1 + (self.states[attacker.id].combo_count * 0.2)
-        defender.health.take_damage(attacker.weapon.damage * combo_multiplier)
+        combo_multiplier = 1 + (state.combo_count * 0.2)
+        defender.health.take_damage(damage * combo_multiplier)
         
         # Combo visual feedback
-        for _ in range(5 + self.states[attacker.id].combo_count):
-            self._create_spark(defender.x, defender.y, (0, 255, 255), 5, 20)
+        for _ in range(scaled(5 + state.combo_count, self.effects_quality.spark_scale)):
+            self._create_spark(defender.x, defender.y, (0, 255, 255), 5, 20, priority=2)
         
-        self.states[attacker.id].combo_count += 1
-        self.states[attacker.id].combo_timer = self.combo_windows[attacker.weapon.current_attack_type]
+        state.combo_count += 1
+        state.combo_timer = state.tables[state.attack].combo_window
+        state.last_attack = state.attack
         return AttackResult.COMBO
     
     def _handle_whiff(self, attacker):
@@ -154,27 +289,86 @@ class CombatSystem:
         # Penalize missed attacks
         attacker.state.stamina -= 10
         attacker.state.recovery_frames = 10
+    
+    def _is_armored(self, fighter):
+        state = self.states[fighter.combat_id]
+        return state.attack >= 0 and state.tables[state.attack].armor[state.attack_frame]
+        
+    def _add_trail(self, attacker, table, frame):
+        """Trail the weapon tip, sweeping down the hitbox over the active frames"""
+        box = table.hitbox_rect(frame, attacker.x, attacker.y, attacker.facing)
+        if box is None:
+            return
+        left, top, w, h = box
+        first = table.phases.index(Phase.ACTIVE)
+        active = table.phases.count(Phase.ACTIVE)
+        tip_x = left + w if attacker.facing >= 0 else left
+        tip_y = top + h * (frame - first + 1) / active
+        attacker.weapon.add_trail((attacker.x, tip_y), (tip_x, tip_y))
+    
+    def _check_hit(self, attacker, defender, state):
+        """Check if this frame's attack hitbox collides with defender"""
+        target = defender.hitbox
+        shapes = state.shapes[state.attack]
+        if shapes is None:
+            box = state.tables[state.attack].hitbox_rect(
+                state.attack_frame, attacker.x, attacker.y, attacker.facing)
+            return box is not None and target.colliderect(box)
         
-    def _check_hit(self, attacker, defender):
-        """Check if attack hitbox collides with defender"""
-        if not attacker.attack_hitbox:
+        # Cheap bounding rect first, per-pixel mask only on overlap
+        shape = shapes[0 if attacker.facing >= 0 else 1][state.attack_frame]
+        if shape is None:
+            return False
+        bounds = shape.rect_at(attacker.x, attacker.y)
+        if not target.colliderect(bounds):
             return False
-        return attacker.attack_hitbox.colliderect(defender.hitbox)
+        offset = (target.x - bounds.x, target.y - bounds.y)
+        return shape.mask.overlap(self.hitbox_shapes.body_mask(target.size), offset) is not None
     
-    def _create_spark(self, x, y, color, size, lifetime):
+    def _create_spark(self, x, y, color, size, lifetime, priority=1):
         angle = random.uniform(0, 6.28)
         speed = random.uniform(2, 5)
-        self.hit_sparks.append(HitSpark(
+        self._add_spark(HitSpark(
             x=x,
             y=y,
             size=size,
             color=color,
             lifetime=lifetime,
-            velocity=(math.cos(angle) * speed, math.sin(angle) * speed)
+            velocity=(math.cos(angle) * speed, math.sin(angle) * speed),
+            priority=priority
         ))
     
+    def _add_spark(self, spark):
+        """Add a spark within the live-spark budget, evicting the least important, oldest one"""
+        sparks = self.hit_sparks
+        if len(sparks) < self.effects_quality.max_sparks:
+            sparks.append(spark)
+            return
+        victim = min(range(len(sparks)), key=lambda i: (sparks[i].priority, sparks[i].lifetime))
+        if sparks[victim].priority <= spark.priority:
+            sparks[victim] = spark
+    
+    def set_quality(self, settings):
+        """Switch effect quality, trimming live sparks to the new budget"""
+        self.effects_quality = settings
+        if len(self.hit_sparks) > settings.max_sparks:
+            self.hit_sparks.sort(key=lambda s: (s.priority, s.lifetime), reverse=True)
+            del self.hit_sparks[settings.max_sparks:]
+    
     def update(self):
-        """Update combat effects"""
+        """Advance attack state machines and combat effects"""
+        self.frame += 1
+        for state in self.states:
+            if state.attack >= 0:
+                state.attack_frame += 1
+                if state.attack_frame >= len(state.tables[state.attack]):
+                    state.attack = -1
+                    state.attack_frame = 0
+            if state.combo_timer > 0:
+                state.combo_timer -= 1
+                if state.combo_timer == 0:
+                    state.combo_count = 0
+        
         # Update hit sparks
         for spark in self.hit_sparks[:]:
             spark.lifetime -= 1
@@ -188,12 +382,21 @@ class CombatSystem:
         if self.screen_shake > 0:
             self.screen_shake -= 1
     
-    def draw_effects(self, surface, camera_offset):
-        """Draw combat visual effects"""
+    def draw_effects(self, surface, camera_offset, view=None, scale=1.0):
+        """Draw combat visual effects, skipping sparks outside the world-space view rect.
+        
+        scale maps world pixels to the target surface, e.g. for a low-resolution internal target.
+        """
+        if view is not None:
+            left, top, right, bottom = view.left, view.top, view.right, view.bottom
+        ox, oy = camera_offset
         for spark in self.hit_sparks:
+            if view is not None and not (left - spark.size <= spark.x <= right + spark.size
+                                         and top - spark.size <= spark.y <= bottom + spark.size):
+                continue
             pygame.draw.circle(
                 surface,
                 spark.color,
-                (int(spark.x + camera_offset[0]), int(spark.y + camera_offset[1])),
-                spark.size
+                (int((spark.x + ox) * scale), int((spark.y + oy) * scale)),
+                max(1, round(spark.size * scale))
             )
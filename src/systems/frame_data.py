@@ -0,0 +1,227 @@
+"""Frame data tables compiled from weapon profiles and fighter data"""
+import json
+import os
+from enum import IntEnum
+from dataclasses import dataclass
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data"
+)
+FIGHTER_DATA_PATH = os.path.join(DATA_DIR, "fighters.json")
+# Optional per-weapon tuning on top of CombatSystem.weapon_profiles, e.g.
+#   {"SWORD": {"damage": 18, "frames": {"light": [3, 3, 10]}}}
+WEAPON_DATA_PATH = os.path.join(DATA_DIR, "weapon_profiles.json")
+
+class AttackType(IntEnum):
+    LIGHT = 0
+    HEAVY = 1
+    SPECIAL = 2
+
+class Phase(IntEnum):
+    STARTUP = 0
+    ACTIVE = 1
+    RECOVERY = 2
+
+# Profile keys ("light"/"heavy"/"special") to table index
+ATTACK_KEYS = {
+    "light": AttackType.LIGHT,
+    "heavy": AttackType.HEAVY,
+    "special": AttackType.SPECIAL
+}
+
+ATTACK_DAMAGE_SCALE = {
+    AttackType.LIGHT: 1.0,
+    AttackType.HEAVY: 1.5,
+    AttackType.SPECIAL: 2.0
+}
+
+@dataclass(frozen=True)
+class AttackTable:
+    """Per-frame data for one attack; every tuple is indexed by attack frame"""
+    name: str
+    phases: tuple
+    hitboxes: tuple  # (dx, dy, w, h) facing right, None outside active frames
+    damage: tuple
+    cancel: tuple    # True where the attack may cancel into another
+    armor: tuple     # True where the attacker cannot be knocked back
+    knockback: int
+    hit_stop: int
+    combo_window: int
+    pattern: str = "box"
+
+    def __len__(self):
+        return len(self.phases)
+
+    def hitbox_rect(self, frame, x, y, facing):
+        """World-space (left, top, w, h) for this frame, or None"""
+        box = self.hitboxes[frame]
+        if box is None:
+            return None
+        dx, dy, w, h = box
+        left = x + dx if facing >= 0 else x - dx - w
+        return (left, y + dy, w, h)
+
+def compile_attack(name, profile, attack_type, startup, active, recovery,
+                   combo_window, armor_frames=0, pattern="box"):
+    """Expand startup/active/recovery counts into per-frame tables"""
+    total = startup + active + recovery
+    reach = profile.get('range', 60)
+    damage = profile['damage'] * ATTACK_DAMAGE_SCALE[attack_type]
+    box = (15, -25, reach, 40)
+
+    phases, hitboxes, damages, cancel, armor = [], [], [], [], []
+    for frame in range(total):
+        if frame < startup:
+            phase = Phase.STARTUP
+        elif frame < startup + active:
+            phase = Phase.ACTIVE
+        else:
+            phase = Phase.RECOVERY
+        phases.append(phase)
+        hitboxes.append(box if phase == Phase.ACTIVE else None)
+        damages.append(damage if phase == Phase.ACTIVE else 0)
+        # Cancel from the last active frame through the first half of recovery
+        cancel.append(startup + active - 1 <= frame < startup + active + recovery // 2)
+        armor.append(frame < armor_frames)
+
+    return AttackTable(
+        name=name,
+        phases=tuple(phases),
+        hitboxes=tuple(hitboxes),
+        damage=tuple(damages),
+        cancel=tuple(cancel),
+        armor=tuple(armor),
+        knockback=profile['knockback'],
+        hit_stop=profile['hit_stop'],
+        combo_window=combo_window,
+        pattern=pattern
+    )
+
+def compile_weapon(weapon_name, profile, combo_windows):
+    """Tuple of AttackTables indexed by AttackType"""
+    tables = [None] * len(AttackType)
+    for key, attack_type in ATTACK_KEYS.items():
+        startup, active, recovery = profile['frames'][key]
+        tables[attack_type] = compile_attack(
+            f"{weapon_name.lower()}_{key}", profile, attack_type,
+            startup, active, recovery, combo_windows[key]
+        )
+    return tuple(tables)
+
+def compile_special(base, spec):
+    """Override a weapon's special with a fighters.json `special` block"""
+    frames = int(spec.get('frames', len(base)))
+    startup = max(1, frames // 4)
+    active = max(1, frames // 3)
+    recovery = max(0, frames - startup - active)
+    profile = {
+        'damage': max(base.damage) / ATTACK_DAMAGE_SCALE[AttackType.SPECIAL],
+        'range': base.hitboxes[base.phases.index(Phase.ACTIVE)][2],
+        'knockback': base.knockback,
+        'hit_stop': base.hit_stop
+    }
+    return compile_attack(
+        spec.get('name', base.name), profile, AttackType.SPECIAL,
+        startup, active, recovery, base.combo_window,
+        armor_frames=int(spec.get('armorFrames', 0)),
+        pattern=spec.get('hitboxPattern', "box")
+    )
+
+def parse_fighter_specials(data):
+    return {name: entry['special'] for name, entry in data.items() if 'special' in entry}
+
+def load_fighter_specials(path=FIGHTER_DATA_PATH):
+    """Fighter name -> `special` block from data/fighters.json"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load fighter data: {e}")
+        return {}
+    return parse_fighter_specials(data)
+
+def load_weapon_overrides(path=WEAPON_DATA_PATH):
+    """Weapon name -> profile overrides from data/weapon_profiles.json, {} if absent or invalid"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            overrides = json.load(f)
+        validate_weapon_overrides(overrides)
+    except (OSError, ValueError) as e:
+        print(f"Could not load weapon overrides: {e}")
+        return {}
+    return overrides
+
+def validate_weapon_overrides(overrides):
+    """ValueError unless overrides looks like {"SWORD": {"damage": 18, "frames": {"light": [3, 3, 10]}}}"""
+    if not isinstance(overrides, dict):
+        raise ValueError(f"weapon overrides must be an object, not {type(overrides).__name__}")
+    for weapon, override in overrides.items():
+        if not isinstance(override, dict):
+            raise ValueError(f"{weapon}: override must be an object, not {type(override).__name__}")
+        frames = override.get('frames', {})
+        if not isinstance(frames, dict):
+            raise ValueError(f"{weapon}: frames must be an object, not {type(frames).__name__}")
+        for attack, counts in frames.items():
+            if (not isinstance(counts, (list, tuple)) or len(counts) != 3
+                    or not all(isinstance(count, int) and count >= 0 for count in counts)):
+                raise ValueError(f"{weapon}: frames.{attack} must be [startup, active, recovery], "
+                                 f"got {counts!r}")
+
+def apply_weapon_overrides(weapon_profiles, overrides):
+    """Copy of weapon_profiles with overrides merged in, keyed by WeaponType name"""
+    validate_weapon_overrides(overrides)
+    merged = {}
+    for weapon_type, profile in weapon_profiles.items():
+        override = overrides.get(weapon_type.name, {})
+        profile = {**profile, **{k: v for k, v in override.items() if k != 'frames'}}
+        profile['frames'] = {
+            **profile['frames'],
+            **{k: tuple(v) for k, v in override.get('frames', {}).items()}
+        }
+        if 'spark_color' in override:
+            profile['spark_color'] = tuple(override['spark_color'])
+        merged[weapon_type] = profile
+    return merged
+
+class FrameDataTables:
+    """Compiled attack tables for every weapon plus per-fighter specials.
+    
+    Passing the tables being replaced as previous reuses every compiled
+    table whose inputs did not change, so a data edit only recompiles the
+    weapons and fighters it touches.
+    """
+    def __init__(self, weapon_profiles, combo_windows, fighter_specials=None, previous=None):
+        self.profiles = dict(weapon_profiles)
+        self.combo_windows = dict(combo_windows)
+        self.fighters = dict(fighter_specials or {})
+        self.weapons = {}
+        self._compiled = {}
+        self.recompiled = 0
+
+        same_windows = previous is not None and previous.combo_windows == self.combo_windows
+        for weapon_type, profile in self.profiles.items():
+            if same_windows and previous.profiles.get(weapon_type) == profile:
+                self.weapons[weapon_type] = previous.weapons[weapon_type]
+            else:
+                self.weapons[weapon_type] = compile_weapon(weapon_type.name, profile, combo_windows)
+                self.recompiled += 1
+        if previous is not None:
+            for (weapon_type, name), tables in previous._compiled.items():
+                if (self.weapons.get(weapon_type) is previous.weapons[weapon_type]
+                        and self.fighters.get(name) == previous.fighters.get(name)):
+                    self._compiled[(weapon_type, name)] = tables
+
+    def for_fighter(self, weapon_type, name=None):
+        """Attack tables for a fighter, with its data-driven special if any"""
+        tables = self.weapons[weapon_type]
+        spec = self.fighters.get(name)
+        if spec is None:
+            return tables
+        key = (weapon_type, name)
+        if key not in self._compiled:
+            tables = list(tables)
+            tables[AttackType.SPECIAL] = compile_special(tables[AttackType.SPECIAL], spec)
+            self._compiled[key] = tuple(tables)
+        return self._compiled[key]
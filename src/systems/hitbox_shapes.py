@@ -0,0 +1,191 @@
+"""Hitbox shape compiler with memory and disk caches"""
+import hashlib
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pygame
+
+from .frame_data import Phase
+
+SHAPE_VERSION = 1
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache", "hitboxes"
+)
+
+# Shapes are drawn around an anchor at the fighter's shoulder
+ANCHOR_Y = -10
+
+@dataclass(frozen=True)
+class HitboxShape:
+    mask: object  # pygame.mask.Mask
+    dx: int       # Bounding rect offset from (fighter.x, fighter.y)
+    dy: int
+    w: int
+    h: int
+
+    def rect_at(self, x, y):
+        return pygame.Rect(int(x) + self.dx, int(y) + self.dy, self.w, self.h)
+
+    def __reduce__(self):
+        # Masks do not pickle; replay keyframes carry the shapes of attacks in progress
+        return _shape_from_bits, (_mask_bits(self.mask), self.dx, self.dy, self.w, self.h)
+
+def _draw_forward_arc(surface, reach, t):
+    """Sector sweeping from overhead to low-forward as t goes 0..1"""
+    center = (reach, reach)
+    sweep_end = -90 + 135 * t
+    sweep_start = max(-90, sweep_end - 70)
+    points = [center]
+    steps = 12
+    for i in range(steps + 1):
+        angle = math.radians(sweep_start + (sweep_end - sweep_start) * i / steps)
+        points.append((center[0] + reach * math.cos(angle), center[1] + reach * math.sin(angle)))
+    if len(points) >= 3:
+        pygame.draw.polygon(surface, (255, 255, 255, 255), points)
+
+def _draw_grab(surface, reach, t):
+    """Short reach, tall box hugging the body"""
+    grab_reach = min(reach, 45)
+    pygame.draw.rect(surface, (255, 255, 255, 255), (reach + 10, reach - 25, grab_reach, 50))
+
+def _draw_thrust(surface, reach, t):
+    """Narrow line extending to full reach"""
+    length = max(1, int(reach * (0.5 + 0.5 * t)))
+    pygame.draw.rect(surface, (255, 255, 255, 255), (reach + 10, reach - 6, length, 12))
+
+PATTERNS = {
+    "forward arc": _draw_forward_arc,
+    "grab": _draw_grab,
+    "thrust": _draw_thrust
+}
+
+def _compile_shape(pattern, reach, t, facing):
+    size = reach * 2 + 1
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    PATTERNS[pattern](surface, reach, t)
+    if facing < 0:
+        surface = pygame.transform.flip(surface, True, False)
+    full = pygame.mask.from_surface(surface)
+    rects = full.get_bounding_rects()
+    if not rects:
+        return None
+    bounds = rects[0].unionall(rects[1:])
+
+    # Crop the mask down to its bounding rect
+    mask = pygame.mask.Mask(bounds.size)
+    mask.draw(full, (-bounds.x, -bounds.y))
+    return HitboxShape(mask, bounds.x - reach, bounds.y - reach + ANCHOR_Y, bounds.w, bounds.h)
+
+def _mask_bits(mask):
+    return np.packbits(pygame.surfarray.array_red(mask.to_surface()) > 0)
+
+def _mask_from_bits(bits, size):
+    alpha = np.unpackbits(bits)[:size[0] * size[1]].reshape(size) * 255
+    surface = pygame.surfarray.make_surface(np.dstack([alpha] * 3))
+    return pygame.mask.from_threshold(surface, (255, 255, 255), (1, 1, 1, 255))
+
+def _shape_from_bits(bits, dx, dy, w, h):
+    return HitboxShape(_mask_from_bits(bits, (w, h)), dx, dy, w, h)
+
+class HitboxShapeCache:
+    """Compiles hitboxPattern shapes per frame and facing, cached in memory and on disk"""
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.sets = {}  # (pattern, reach, active_frames) -> (right, left) shape tuples
+        self._body_masks = {}
+
+    def __getstate__(self):
+        # Pickled as part of a replay keyframe; the caches refill on demand
+        return {"cache_dir": self.cache_dir}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"])
+
+    def for_table(self, table):
+        """(right, left) tuples of HitboxShape indexed by attack frame, or None for plain boxes"""
+        if table.pattern not in PATTERNS:
+            return None
+        active = [i for i, phase in enumerate(table.phases) if phase == Phase.ACTIVE]
+        if not active:
+            return None
+        reach = table.hitboxes[active[0]][2]
+        shapes = self._shape_set(table.pattern, reach, len(active))
+
+        # Spread the per-active-frame shapes over the table's frame index
+        by_facing = []
+        for facing_shapes in shapes:
+            frames = [None] * len(table)
+            for n, frame in enumerate(active):
+                frames[frame] = facing_shapes[n]
+            by_facing.append(tuple(frames))
+        return tuple(by_facing)
+
+    def body_mask(self, size):
+        """Solid mask for a defender's hurtbox"""
+        if size not in self._body_masks:
+            self._body_masks[size] = pygame.mask.Mask(size, fill=True)
+        return self._body_masks[size]
+
+    def _shape_set(self, pattern, reach, active_frames):
+        key = (pattern, reach, active_frames)
+        if key not in self.sets:
+            shapes = self._load(key)
+            if shapes is None:
+                shapes = tuple(
+                    tuple(_compile_shape(pattern, reach, (n + 1) / active_frames, facing)
+                          for n in range(active_frames))
+                    for facing in (1, -1)
+                )
+                self._save(key, shapes)
+            self.sets[key] = shapes
+        return self.sets[key]
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr((SHAPE_VERSION,) + key).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.npz")
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                shapes = []
+                for facing in range(2):
+                    row = []
+                    for n in range(key[2]):
+                        rect = data[f"rect_{facing}_{n}"]
+                        if rect[2] == 0:
+                            row.append(None)
+                            continue
+                        dx, dy, w, h = (int(v) for v in rect)
+                        mask = _mask_from_bits(data[f"bits_{facing}_{n}"], (w, h))
+                        row.append(HitboxShape(mask, dx, dy, w, h))
+                    shapes.append(tuple(row))
+                return tuple(shapes)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring hitbox cache {path}: {e}")
+            return None
+
+    def _save(self, key, shapes):
+        arrays = {}
+        for facing, row in enumerate(shapes):
+            for n, shape in enumerate(row):
+                if shape is None:
+                    arrays[f"rect_{facing}_{n}"] = np.zeros(4, dtype=np.int32)
+                    arrays[f"bits_{facing}_{n}"] = np.zeros(0, dtype=np.uint8)
+                else:
+                    arrays[f"rect_{facing}_{n}"] = np.array(
+                        (shape.dx, shape.dy, shape.w, shape.h), dtype=np.int32)
+                    arrays[f"bits_{facing}_{n}"] = _mask_bits(shape.mask)
+        path = self._path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not write hitbox cache {path}: {e}")
@@ -13,9 +13,27 @@ class InputBuffer:
     move_right: bool = False
     jump: bool = False
     attack: bool = False
+    heavy: bool = False
     special: bool = False
     buffer_time: int = 0  # Frames to buffer input
 
+# Button bits, as packed by the net protocol, replays and shared memory
+LEFT, RIGHT, JUMP, LIGHT, HEAVY, SPECIAL = (1 << i for i in range(6))
+
+def apply_buttons(buffer, bits):
+    buffer.move_left = bool(bits & LEFT)
+    buffer.move_right = bool(bits & RIGHT)
+    buffer.jump = bool(bits & JUMP)
+    buffer.attack = bool(bits & LIGHT)
+    buffer.heavy = bool(bits & HEAVY)
+    buffer.special = bool(bits & SPECIAL)
+
+def read_buttons(buffer):
+    """Inverse of apply_buttons"""
+    return ((LEFT if buffer.move_left else 0) | (RIGHT if buffer.move_right else 0)
+            | (JUMP if buffer.jump else 0) | (LIGHT if buffer.attack else 0)
+            | (HEAVY if buffer.heavy else 0) | (SPECIAL if buffer.special else 0))
+
 class InputSystem:
     def __init__(self):
         self.control_schemes = {
@@ -55,10 +73,18 @@ class InputSystem:
         }
         
         self.gamepads = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+        # player_id -> external source, e.g. a bot's shared-memory InputRing
+        self.sources = {}
+        # Keyboard state sampled by the thread that pumps events; None reads it here
+        self.keys = None
+
+    def bind_source(self, player_id, source):
+        """Let source.poll(buffer) drive a player; it returns False while it has no input yet"""
+        self.sources[player_id] = source
     
     def process_inputs(self):
         """Process all inputs and update buffers"""
-        keys = pygame.key.get_pressed()
+        keys = self.keys if self.keys is not None else pygame.key.get_pressed()
         
         # Process keyboard inputs
         for player in ["player1", "player2"]:
@@ -70,6 +96,7 @@ class InputSystem:
                 buffer.move_right = any(keys[key] for key in scheme["right"])
                 buffer.jump = any(keys[key] for key in scheme["jump"])
                 buffer.attack = any(keys[key] for key in scheme["light_attack"])
+                buffer.heavy = any(keys[key] for key in scheme["heavy_attack"])
                 buffer.special = any(keys[key] for key in scheme["special"])
                 
                 # Input buffering
@@ -82,6 +109,10 @@ class InputSystem:
         for gamepad in self.gamepads:
             # Implement axis/button checks
             pass
+
+        # External sources override the keyboard once they have sent anything
+        for player, source in self.sources.items():
+            source.poll(self.buffers[player])
     
     def get_input_state(self, player_id):
         """Get processed input state for a player"""
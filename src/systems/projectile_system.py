@@ -0,0 +1,180 @@
+"""Pooled, vectorized projectile system"""
+import numpy as np
+import pygame
+from enum import IntEnum
+
+class ProjectileKind(IntEnum):
+    ARROW = 0
+    FIREBALL = 1
+
+# Hitbox (width, height) per kind
+PROJECTILE_SIZES = np.array([
+    (15, 5),   # ARROW
+    (25, 25)   # FIREBALL
+], dtype=np.float32)
+
+def render_sprite(kind, direction):
+    """Draw one projectile sprite; returns (surface, offset from position)"""
+    if kind == ProjectileKind.FIREBALL:
+        sprite = pygame.Surface((25, 25), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (255, 100, 0), (12, 12), 12)
+        pygame.draw.circle(sprite, (255, 200, 0), (12, 12), 8)
+        return sprite, (-12, -12)
+    sprite = pygame.Surface((26, 7), pygame.SRCALPHA)
+    pygame.draw.line(sprite, (100, 100, 100), (15, 3), (0, 3), 2)
+    pygame.draw.polygon(sprite, (200, 200, 200), [(15, 0), (15, 6), (25, 3)])
+    if direction < 0:
+        sprite = pygame.transform.flip(sprite, True, False)
+    return sprite, ((-15, -3) if direction > 0 else (-10, -3))
+
+class ProjectilePool:
+    """Fixed-capacity projectile storage with one array per attribute.
+
+    Motion, expiry and projectile-vs-fighter hits run over whole arrays,
+    so cost barely grows with the number of live projectiles.
+    """
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.direction = np.zeros(capacity, dtype=np.float32)
+        self.speed = np.zeros(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.owner = np.full(capacity, -1, dtype=np.int16)
+        self.lifetime = np.zeros(capacity, dtype=np.int16)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.high = 0  # One past the highest slot ever used
+        self.owners = []  # owner id -> object
+        self._owner_ids = {}
+        self._sprites = {}
+
+    def owner_id(self, owner):
+        """Stable small integer for an owning fighter"""
+        if id(owner) not in self._owner_ids:
+            self._owner_ids[id(owner)] = len(self.owners)
+            self.owners.append(owner)
+        return self._owner_ids[id(owner)]
+
+    def spawn(self, x, y, direction, speed, damage, owner,
+              kind=ProjectileKind.ARROW, lifetime=60):
+        """Spawn a single projectile; returns False when the pool is full"""
+        return self.spawn_many(x, [y], direction, speed, damage, owner, kind, lifetime) > 0
+
+    def spawn_many(self, x, y, direction, speed, damage, owner,
+                   kind=ProjectileKind.ARROW, lifetime=60):
+        """Spawn a burst; array arguments broadcast against each other"""
+        x, y, direction, speed, damage = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float32), np.asarray(y, dtype=np.float32),
+            np.asarray(direction, dtype=np.float32), np.asarray(speed, dtype=np.float32),
+            np.asarray(damage, dtype=np.float32)
+        )
+        count = x.size
+        slots = np.flatnonzero(~self.alive)[:count]
+        if len(slots) < count:
+            print(f"Projectile pool full, dropping {count - len(slots)}")
+            count = len(slots)
+        if count == 0:
+            return 0
+
+        self.x[slots] = x.ravel()[:count]
+        self.y[slots] = y.ravel()[:count]
+        self.direction[slots] = direction.ravel()[:count]
+        self.speed[slots] = speed.ravel()[:count]
+        self.damage[slots] = damage.ravel()[:count]
+        self.owner[slots] = self.owner_id(owner)
+        self.lifetime[slots] = lifetime
+        self.kind[slots] = kind
+        self.alive[slots] = True
+        self.high = max(self.high, int(slots[-1]) + 1)
+        return count
+
+    def update(self, stage=None):
+        """Move every live projectile and expire old ones, and any inside a stage's solids"""
+        n = self.high
+        if n == 0:
+            return
+        alive = self.alive[:n]
+        self.x[:n] += self.speed[:n] * self.direction[:n] * alive
+        self.lifetime[:n] -= alive
+        alive &= self.lifetime[:n] > 0
+        if stage is not None:
+            moving = np.flatnonzero(alive)
+            alive[moving[stage.solid_at(self.x[moving], self.y[moving])]] = False
+
+        # Shrink the active range once its tail has emptied
+        live = np.flatnonzero(alive)
+        self.high = int(live[-1]) + 1 if len(live) else 0
+
+    def collide(self, fighters, hitboxes):
+        """Bulk projectile-vs-fighter test.
+
+        fighters: owner objects; hitboxes: matching (left, top, w, h) rects.
+        Each projectile hits at most one fighter and is removed. Returns the
+        total damage dealt to each fighter, in order.
+        """
+        totals = np.zeros(len(fighters), dtype=np.float32)
+        n = self.high
+        live = np.flatnonzero(self.alive[:n])
+        if len(live) == 0 or not fighters:
+            return totals
+
+        boxes = np.asarray(hitboxes, dtype=np.float32)
+        sizes = PROJECTILE_SIZES[self.kind[live]]
+        left = self.x[live] - sizes[:, 0] / 2
+        top = self.y[live] - sizes[:, 1] / 2
+
+        # (projectiles, fighters) overlap matrix
+        hit = ((left[:, None] < boxes[None, :, 0] + boxes[None, :, 2])
+               & (left[:, None] + sizes[:, 0, None] > boxes[None, :, 0])
+               & (top[:, None] < boxes[None, :, 1] + boxes[None, :, 3])
+               & (top[:, None] + sizes[:, 1, None] > boxes[None, :, 1]))
+        fighter_ids = np.array([self.owner_id(f) for f in fighters], dtype=np.int16)
+        hit &= self.owner[live][:, None] != fighter_ids[None, :]
+
+        hit_rows = hit.any(axis=1)
+        if not hit_rows.any():
+            return totals
+        target = hit.argmax(axis=1)[hit_rows]
+        slots = live[hit_rows]
+        totals += np.bincount(target, weights=self.damage[slots], minlength=len(fighters))
+        self.alive[slots] = False
+        return totals
+
+    def clear(self):
+        self.alive[:] = False
+        self.high = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.high]))
+
+    def _sprite(self, kind, direction):
+        """Pre-rendered sprite and its offset from the projectile position"""
+        key = (kind, direction)
+        if key not in self._sprites:
+            self._sprites[key] = render_sprite(kind, direction)
+        return self._sprites[key]
+
+    def load_sprites(self, sprites):
+        """Use sprites baked elsewhere, e.g. cut from a preloaded atlas"""
+        self._sprites.update(sprites)
+
+    def draw(self, screen, camera_offset=(0, 0), view=None):
+        """Draw live projectiles inside the world-space view with one batched blits call"""
+        n = self.high
+        visible = self.alive[:n]
+        if view is not None:
+            # Cull with a margin covering the largest sprite
+            visible = (visible & (self.x[:n] >= view.left - 25) & (self.x[:n] <= view.right + 25)
+                       & (self.y[:n] >= view.top - 25) & (self.y[:n] <= view.bottom + 25))
+        live = np.flatnonzero(visible)
+        if len(live) == 0:
+            return
+        ox, oy = camera_offset
+        batch = []
+        for kind, direction, x, y in zip(self.kind[live].tolist(),
+                                         self.direction[live].tolist(),
+                                         self.x[live].tolist(), self.y[live].tolist()):
+            sprite, (dx, dy) = self._sprite(kind, 1 if direction >= 0 else -1)
+            batch.append((sprite, (x + dx + ox, y + dy + oy)))
+        screen.blits(batch, doreturn=False)
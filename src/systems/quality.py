@@ -0,0 +1,83 @@
+"""Adaptive effect quality driven by frame time
+
+QualityGovernor watches a rolling window of frame times and steps the
+effect quality down as soon as the window average blows the frame
+budget, and back up only after a sustained stretch of headroom, so the
+level does not flap around the threshold.
+"""
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+
+class QualityLevel(IntEnum):
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+@dataclass(frozen=True)
+class QualitySettings:
+    spark_scale: float   # Multiplier on sparks spawned per hit
+    max_sparks: int      # Hard cap on live sparks; extras evict the least important
+    trail_scale: float   # Multiplier on weapon trail lifetime
+    aa_limbs: bool       # aaline instead of line for stick limbs
+    glow: bool           # Head glow surfaces
+    flash: bool          # Hit flash and screen flash overlays
+
+QUALITY_SETTINGS = {
+    QualityLevel.HIGH: QualitySettings(1.0, 400, 1.0, True, True, True),
+    QualityLevel.MEDIUM: QualitySettings(0.5, 160, 0.6, False, True, True),
+    QualityLevel.LOW: QualitySettings(0.25, 60, 0.35, False, False, False)
+}
+
+FULL_QUALITY = QUALITY_SETTINGS[QualityLevel.HIGH]
+
+def scaled(count, scale):
+    """Scale an effect count, keeping at least one so hits stay visible"""
+    return max(1, round(count * scale))
+
+class QualityGovernor:
+    def __init__(self, budget_ms=1000 / 60, window=30, upgrade_ratio=0.7,
+                 upgrade_after=120, level=QualityLevel.HIGH):
+        self.budget_ms = budget_ms
+        self.upgrade_ratio = upgrade_ratio  # Average must fall below budget * ratio...
+        self.upgrade_after = upgrade_after  # ...for this many frames to step up
+        self.level = QualityLevel(level)
+        self.frame_times = deque(maxlen=window)
+        self._total = 0.0
+        self._headroom_frames = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return QUALITY_SETTINGS[self.level]
+
+    def record(self, frame_ms):
+        """Add one frame's work time; returns True when the level changed"""
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self._total -= self.frame_times[0]
+        self.frame_times.append(frame_ms)
+        self._total += frame_ms
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = self._total / len(self.frame_times)
+        if average > self.budget_ms:
+            self._headroom_frames = 0
+            if self.level > QualityLevel.LOW:
+                return self._set_level(self.level - 1)
+        elif average < self.budget_ms * self.upgrade_ratio:
+            self._headroom_frames += 1
+            if self._headroom_frames >= self.upgrade_after and self.level < QualityLevel.HIGH:
+                return self._set_level(self.level + 1)
+        else:
+            self._headroom_frames = 0
+        return False
+
+    def _set_level(self, level):
+        self.level = QualityLevel(level)
+        self.changes += 1
+        # Judge the new level on its own frames only
+        self.frame_times.clear()
+        self._total = 0.0
+        self._headroom_frames = 0
+        return True
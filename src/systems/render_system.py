@@ -4,6 +4,10 @@ import math
 from dataclasses import dataclass
 import random
 
+from .camera import Camera
+from .quality import FULL_QUALITY
+from .stage import SOLID
+
 @dataclass
 class ScreenEffect:
     shake_intensity: float
@@ -11,11 +15,23 @@ class ScreenEffect:
     duration: int
 
 class RenderSystem:
-    def __init__(self):
+    def __init__(self, viewport_size=(1280, 720), world_size=None, internal_size=None,
+                 smooth=False, hud_native=True):
         self.effects = []
-        self.camera_offset = [0, 0]
+        self.camera = Camera(viewport_size, world_size or viewport_size)
+        # World drawing resolution; fill and draw cost scales with its pixel count
+        self.internal_size = tuple(internal_size or viewport_size)
+        self.smooth = smooth          # smoothscale instead of scale when upscaling
+        self.hud_native = hud_native  # Health bars at window resolution when upscaling
+        self._target = None
+        self.camera_offset = [0, 0]  # Screen shake
         self.screen_shake = 0
         self.debug_font = pygame.font.SysFont('Arial', 16)
+        self.effects_quality = FULL_QUALITY
+        self.hud = None  # Prebuilt overlay, replaced whole by update_hud
+        self.stage = None  # Static geometry drawn under everything else
+        # Cosmetic randomness stays off the simulation's RNG, whatever rate effects run at
+        self.rng = random.Random()
     
     def add_effect(self, effect_type, intensity=1.0, duration=30, color=(255,255,255)):
         """Add visual effect"""
@@ -24,27 +40,29 @@ class RenderSystem:
         elif effect_type == "flash":
             self.effects.append(ScreenEffect(0, color, duration))
     
-    def update(self):
-        """Update effects"""
+    def update(self, frames=1):
+        """Update effects; frames is how many game frames this call covers"""
         # Update screen shake
         if self.screen_shake > 0:
             self.camera_offset = [
-                random.uniform(-self.screen_shake, self.screen_shake),
-                random.uniform(-self.screen_shake, self.screen_shake)
+                self.rng.uniform(-self.screen_shake, self.screen_shake),
+                self.rng.uniform(-self.screen_shake, self.screen_shake)
             ]
-            self.screen_shake *= 0.9
+            self.screen_shake *= 0.9 ** frames
             if self.screen_shake < 0.1:
                 self.screen_shake = 0
                 self.camera_offset = [0, 0]
         
         # Update other effects
         for effect in self.effects[:]:
-            effect.duration -= 1
+            effect.duration -= frames
             if effect.duration <= 0:
                 self.effects.remove(effect)
     
     def apply_flash(self, surface):
         """Apply screen flash effects"""
+        if not self.effects_quality.flash:
+            return
         for effect in self.effects:
             if effect.flash_color:
                 flash_surf = pygame.Surface(surface.get_size())
@@ -52,13 +70,100 @@ class RenderSystem:
                 flash_surf.set_alpha(150 * (effect.duration / effect.duration))
                 surface.blit(flash_surf, (0, 0))
 
+    def render_target(self, screen):
+        """Surface to draw the world into: the screen at native resolution, else a reused internal target"""
+        if self.internal_size == screen.get_size():
+            return screen
+        if self._target is None:
+            self._target = pygame.Surface(self.internal_size).convert(screen) if pygame.display.get_init() \
+                else pygame.Surface(self.internal_size)
+        return self._target
+
+    def present(self, screen, target):
+        """Upscale the internal target onto the screen once per frame"""
+        if target is not screen:
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(target, screen.get_size(), screen)
+
+    def draw_frame(self, screen, snapshot):
+        """Draw a FrameSnapshot produced by the simulation, culled to the camera view.
+        
+        World coordinates map to the render target through the view, so camera
+        zoom and internal resolution are one scale factor.
+        """
+        view = pygame.Rect(snapshot.view)
+        target = self.render_target(screen)
+        target.fill((0, 0, 0))
+        k = target.get_width() / view.w
+        ox = snapshot.camera_offset[0] - view.x
+        oy = snapshot.camera_offset[1] - view.y
+        left, top, right, bottom = view.left, view.top, view.right, view.bottom
+        if self.stage is not None:
+            for seg_left, seg_top, seg_right, seg_bottom, kind in self.stage.query(view):
+                pygame.draw.rect(target, (90, 90, 110) if kind == SOLID else (150, 150, 180),
+                                 ((seg_left + ox) * k, (seg_top + oy) * k,
+                                  (seg_right - seg_left) * k, (seg_bottom - seg_top) * k))
+        for x, y, size, color in snapshot.sparks:
+            if left - size <= x <= right + size and top - size <= y <= bottom + size:
+                pygame.draw.circle(target, color, (int((x + ox) * k), int((y + oy) * k)),
+                                   max(1, round(size * k)))
+        for fighter in snapshot.fighters:
+            if fighter.trail is not None:
+                self._draw_trail(target, fighter.trail, view, ox, oy, k)
+        native_hud = self.hud_native and target is not screen
+        visible = [f for f in snapshot.fighters
+                   if view.colliderect((f.x - 20, f.y - 50, 40, 80))]
+        for fighter in visible:
+            self._draw_body(target, (fighter.x + ox) * k, (fighter.y + oy) * k, fighter.is_player,
+                            fighter.current_health / fighter.max_health, k, health_bar=not native_hud)
+        self.present(screen, target)
+
+        if native_hud:
+            # Crisp health bars drawn after the upscale, at window resolution
+            k = screen.get_width() / view.w
+            for fighter in visible:
+                self._draw_health_bar(screen, (fighter.x + ox) * k, (fighter.y + oy) * k,
+                                      fighter.current_health / fighter.max_health, k)
+        hud = self.hud
+        if hud is not None:
+            screen.blit(hud, (0, 0))
+
+    def update_hud(self, fighters, combat):
+        """Rebuild the health/combo overlay; text rendering is slow, so call only on change.
+        
+        The new surface is swapped in whole, so a render thread never sees it half drawn.
+        """
+        width = self.camera.viewport_w
+        hud = pygame.Surface((width, 28), pygame.SRCALPHA)
+        for i, fighter in enumerate(fighters):
+            combo = combat.states[fighter.combat_id].combo_count if fighter.combat_id >= 0 else 0
+            text = f"P{i + 1}  {fighter.health.current_health:.0f}" + (f"  {combo} HIT" if combo > 1 else "")
+            label = self.debug_font.render(text, True, (255, 255, 255))
+            hud.blit(label, (10 if i == 0 else width - label.get_width() - 10, 6))
+        self.hud = hud
+
     def draw_fighter(self, screen, fighter):
+        fighter.weapon.draw_trails(screen, (0, 0))
+        self._draw_body(screen, fighter.x, fighter.y, fighter.is_player,
+                        fighter.health.current_health / fighter.health.max_health)
+
+    def _draw_trail(self, target, trail, view, ox, oy, k):
+        points, color = trail
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        if max(xs) < view.left or min(xs) > view.right or max(ys) < view.top or min(ys) > view.bottom:
+            return
+        pygame.draw.lines(target, color, False, [((x + ox) * k, (y + oy) * k) for x, y in points],
+                          max(1, round(3 * k)))
+
+    def _draw_body(self, screen, x, y, is_player, health_pct, scale=1.0, health_bar=True):
         # Draw fighter body
-        color = (0, 100, 255) if fighter.is_player else (255, 50, 50)
-        pygame.draw.rect(screen, color, (fighter.x - 15, fighter.y - 30, 30, 60))
-        
-        # Draw health bar
-        health_pct = fighter.health.current_health / fighter.health.max_health
-        bar_width = 40 * health_pct
-        pygame.draw.rect(screen, (255, 0, 0), (fighter.x - 20, fighter.y - 50, 40, 5))
-        pygame.draw.rect(screen, (0, 255, 0), (fighter.x - 20, fighter.y - 50, bar_width, 5))
+        color = (0, 100, 255) if is_player else (255, 50, 50)
+        pygame.draw.rect(screen, color, (x - 15 * scale, y - 30 * scale, 30 * scale, 60 * scale))
+        if health_bar:
+            self._draw_health_bar(screen, x, y, health_pct, scale)
+
+    def _draw_health_bar(self, screen, x, y, health_pct, scale=1.0):
+        bar = (x - 20 * scale, y - 50 * scale, 40 * scale, max(1, 5 * scale))
+        pygame.draw.rect(screen, (255, 0, 0), bar)
+        pygame.draw.rect(screen, (0, 255, 0), (bar[0], bar[1], bar[2] * health_pct, bar[3]))
@@ -0,0 +1,214 @@
+"""Procedural combat sounds and pooled mixer channels
+
+Hit, whiff, counter and combo sounds are synthesized per weapon with
+NumPy at startup, cached on disk by parameter hash, and played through a
+fixed set of mixer channels with voice stealing.
+"""
+import hashlib
+import os
+from enum import IntEnum
+
+import numpy as np
+import pygame
+
+from ..components.weapon import WeaponType
+
+SYNTH_VERSION = 1
+MIXER_DEFAULTS = (44100, -16, 2)  # What pygame.mixer.init() opens without pre_init
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".cache", "sounds"
+)
+
+class SoundEvent(IntEnum):
+    HIT = 0
+    WHIFF = 1
+    COUNTER = 2
+    COMBO = 3
+
+# AttackResult name -> sound
+RESULT_EVENTS = {
+    "NORMAL": SoundEvent.HIT,
+    "WHIFF": SoundEvent.WHIFF,
+    "COUNTER": SoundEvent.COUNTER,
+    "COMBO": SoundEvent.COMBO
+}
+
+# Higher priorities may steal channels from lower ones
+EVENT_PRIORITY = {
+    SoundEvent.WHIFF: 1,
+    SoundEvent.HIT: 2,
+    SoundEvent.COMBO: 2,
+    SoundEvent.COUNTER: 3
+}
+
+WEAPON_VOICES = {
+    WeaponType.SWORD: {'freq': 880, 'noise': 0.3, 'decay': 18},
+    WeaponType.HAMMER: {'freq': 110, 'noise': 0.5, 'decay': 10},
+    WeaponType.SPEAR: {'freq': 440, 'noise': 0.35, 'decay': 16},
+    WeaponType.WHIP: {'freq': 1200, 'noise': 0.6, 'decay': 25},
+    WeaponType.GUN: {'freq': 200, 'noise': 0.8, 'decay': 30}
+}
+
+EVENT_SHAPES = {
+    SoundEvent.HIT: {'duration': 0.15, 'pitch': 1.0, 'noise': 1.0, 'sweep': -0.3, 'volume': 0.8, 'harmonic': 0},
+    SoundEvent.WHIFF: {'duration': 0.12, 'pitch': 2.0, 'noise': 1.6, 'sweep': 0.8, 'volume': 0.4, 'harmonic': 0},
+    SoundEvent.COUNTER: {'duration': 0.3, 'pitch': 1.5, 'noise': 0.8, 'sweep': -0.5, 'volume': 1.0, 'harmonic': 1.5},
+    SoundEvent.COMBO: {'duration': 0.12, 'pitch': 1.25, 'noise': 0.7, 'sweep': 0.2, 'volume': 0.8, 'harmonic': 2.0}
+}
+
+# Combo hits rise two semitones per step, capped here
+COMBO_STEPS = 10
+
+def voice_params(weapon_type, event, combo_step=0):
+    voice = WEAPON_VOICES[weapon_type]
+    shape = EVENT_SHAPES[event]
+    return (
+        ('freq', voice['freq'] * shape['pitch'] * 2 ** (combo_step * 2 / 12)),
+        ('noise', min(1.0, voice['noise'] * shape['noise'])),
+        ('decay', voice['decay']),
+        ('duration', shape['duration']),
+        ('sweep', shape['sweep']),
+        ('volume', shape['volume']),
+        ('harmonic', shape['harmonic'])
+    )
+
+def synthesize(params, sample_rate, channels):
+    """Render params to an int16 (samples, channels) array"""
+    p = dict(params)
+    count = int(p['duration'] * sample_rate)
+    t = np.arange(count, dtype=np.float64) / sample_rate
+    freq = p['freq'] * (1 + p['sweep'] * t / p['duration'])
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+    tone = np.sin(phase)
+    if p['harmonic']:
+        tone = 0.6 * tone + 0.4 * np.sin(phase * p['harmonic'])
+
+    # Seed noise from the parameters so cached and fresh renders match
+    seed = int(hashlib.sha1(repr(params).encode()).hexdigest()[:8], 16)
+    noise = np.random.default_rng(seed).uniform(-1, 1, count)
+    wave = (1 - p['noise']) * tone + p['noise'] * noise
+
+    envelope = np.exp(-t * p['decay']) * np.minimum(1.0, t / 0.005)
+    mono = (wave * envelope * p['volume'] * 32767 * 0.8).astype(np.int16)
+    if channels == 1:
+        return mono
+    return np.ascontiguousarray(np.repeat(mono[:, None], channels, axis=1))
+
+def to_mixer_format(samples, size):
+    """Convert int16 samples to the mixer's sample format (pygame.mixer.get_init()[1])"""
+    if size == -16:
+        return samples
+    if size == 16:
+        return (samples.astype(np.int32) + 32768).astype(np.uint16)
+    if size == -8:
+        return (samples >> 8).astype(np.int8)
+    if size == 8:
+        return ((samples >> 8) + 128).astype(np.uint8)
+    if abs(size) == 32:
+        # SDL's 32-bit mixer format is float; pygame reports it as -32
+        return (samples / 32768).astype(np.float32)
+    raise ValueError(f"Unsupported mixer sample format {size}")
+
+class SoundBank:
+    """Synthesized sounds keyed by (weapon, event, combo step)"""
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.sounds = {}
+
+    def prepare(self, sample_rate, size, channels):
+        """(mixer format, key -> sample array); NumPy and file I/O only, so safe off the main thread"""
+        samples = {}
+        for weapon_type in WEAPON_VOICES:
+            for event in SoundEvent:
+                steps = COMBO_STEPS if event == SoundEvent.COMBO else 1
+                for step in range(steps):
+                    params = voice_params(weapon_type, event, step)
+                    samples[(weapon_type, event, step)] = self._load_or_synthesize(
+                        params, sample_rate, size, channels)
+        return (sample_rate, size, channels), samples
+
+    def build(self, sample_rate, size, channels, prepared=None):
+        """Make mixer Sounds, from prepared arrays if they match the mixer's format"""
+        if prepared is None or prepared[0] != (sample_rate, size, channels):
+            prepared = self.prepare(sample_rate, size, channels)
+        for key, samples in prepared[1].items():
+            self.sounds[key] = pygame.sndarray.make_sound(samples)
+
+    def get(self, weapon_type, event, combo=1):
+        """combo is the hit's combo_count; the first combo hit (count 1) is step 0"""
+        step = min(max(combo - 1, 0), COMBO_STEPS - 1) if event == SoundEvent.COMBO else 0
+        return self.sounds.get((weapon_type, event, step))
+
+    def _load_or_synthesize(self, params, sample_rate, size, channels):
+        key = repr((SYNTH_VERSION, sample_rate, size, channels, params))
+        path = os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest()[:16] + ".npy")
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass
+        samples = to_mixer_format(synthesize(params, sample_rate, channels), size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = path + ".tmp.npy"
+            np.save(tmp, samples)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not cache sound {path}: {e}")
+        return samples
+
+class SoundSystem:
+    """Plays combat sounds through a fixed pool of mixer channels"""
+    def __init__(self, channels=16, prepared=None):
+        self.enabled = False
+        self.bank = SoundBank()
+        self.channels = []
+        self._priority = []
+        self._started = []
+        self._clock = 0
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            sample_rate, size, mixer_channels = pygame.mixer.get_init()
+            pygame.mixer.set_num_channels(channels)
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self._priority = [0] * channels
+            self._started = [0] * channels
+            self.bank.build(sample_rate, size, mixer_channels, prepared)
+            self.enabled = True
+        except (pygame.error, TypeError, ValueError) as e:
+            print(f"Sound disabled: {e}")
+
+    def play(self, weapon_type, event, combo=0):
+        """Play a cached sound, stealing the least important voice if all are busy"""
+        if not self.enabled:
+            return False
+        sound = self.bank.get(weapon_type, event, combo)
+        if sound is None:
+            return False
+        priority = EVENT_PRIORITY[event]
+
+        slot = -1
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                slot = i
+                break
+        if slot < 0:
+            # Steal the lowest-priority voice, oldest first
+            slot = min(range(len(self.channels)),
+                       key=lambda i: (self._priority[i], self._started[i]))
+            if self._priority[slot] > priority:
+                return False
+
+        self._clock += 1
+        self._priority[slot] = priority
+        self._started[slot] = self._clock
+        self.channels[slot].play(sound)
+        return True
+
+    def play_result(self, result, weapon_type, combo=0):
+        """Play the sound for an AttackResult"""
+        event = RESULT_EVENTS.get(result.name)
+        if event is not None:
+            self.play(weapon_type, event, combo)
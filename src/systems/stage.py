@@ -0,0 +1,190 @@
+"""Stage geometry and world collision
+
+A stage is a set of axis-aligned segments: solid blocks (floors, walls,
+ceilings) and one-way floors, which only stop bodies falling onto them
+from above. Each stage is compiled once into a static uniform grid whose
+cells list the segments overlapping them, so a collision query only
+looks at the cells around a body. Per-fighter cost stays flat whether a
+stage has five segments or five hundred.
+
+    python -m src.systems.stage 500
+"""
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from .frame_data import DATA_DIR
+
+STAGE_DATA_PATH = os.path.join(DATA_DIR, "stages.json")
+SOLID, ONE_WAY = 0, 1
+KINDS = {"solid": SOLID, "one_way": ONE_WAY}
+CELL_SIZE = 128
+# Body boxes relative to the body's position: (left, top, right, bottom)
+FIGHTER_BOX = (-15, -30, 15, 30)
+
+class StageGrid:
+    """Static uniform grid over segment rects (left, top, right, bottom)"""
+    def __init__(self, rects, size, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, -(-int(size[0]) // cell_size))
+        self.rows = max(1, -(-int(size[1]) // cell_size))
+        cells = [[] for _ in range(self.cols * self.rows)]
+        for i, (left, top, right, bottom) in enumerate(rects):
+            for cell in self._cells(left, top, right, bottom):
+                cells[cell].append(i)
+        self.cells = [tuple(ids) for ids in cells]
+        # The same lists padded with -1, for vectorized point queries
+        width = max(1, max(len(ids) for ids in cells))
+        self.padded = np.full((len(cells), width), -1, dtype=np.int32)
+        for cell, ids in enumerate(cells):
+            self.padded[cell, :len(ids)] = ids
+
+    def _cells(self, left, top, right, bottom):
+        size = self.cell_size
+        c0 = min(self.cols - 1, max(0, int(left // size)))
+        c1 = min(self.cols - 1, max(0, int(right // size)))
+        r0 = min(self.rows - 1, max(0, int(top // size)))
+        r1 = min(self.rows - 1, max(0, int(bottom // size)))
+        return [row * self.cols + col for row in range(r0, r1 + 1) for col in range(c0, c1 + 1)]
+
+    def query(self, left, top, right, bottom):
+        """Ids of segments in the cells covering a rect, each once"""
+        cells = self._cells(left, top, right, bottom)
+        if len(cells) == 1:
+            return self.cells[cells[0]]
+        return tuple(dict.fromkeys(i for cell in cells for i in self.cells[cell]))
+
+    def point_candidates(self, x, y):
+        """(points, max per cell) segment ids for arrays of points, -1 padded"""
+        col = np.clip((x // self.cell_size).astype(np.int32), 0, self.cols - 1)
+        row = np.clip((y // self.cell_size).astype(np.int32), 0, self.rows - 1)
+        return self.padded[row * self.cols + col]
+
+class Stage:
+    def __init__(self, name, size, segments, spawns=((300, 360), (900, 360)), cell_size=CELL_SIZE):
+        """segments: (kind, (x, y, w, h)) pairs"""
+        self.name = name
+        self.size = tuple(size)
+        self.spawns = [tuple(spawn) for spawn in spawns]
+        self.segments = [(x, y, x + w, y + h, kind) for kind, (x, y, w, h) in segments]
+        self.rects = np.array([s[:4] for s in self.segments], dtype=np.float32).reshape(-1, 4)
+        self.kinds = np.array([s[4] for s in self.segments], dtype=np.int8)
+        self.grid = StageGrid([s[:4] for s in self.segments], self.size, cell_size)
+
+    def query(self, rect):
+        """Segments (left, top, right, bottom, kind) near a (x, y, w, h) rect, e.g. for drawing"""
+        x, y, w, h = rect
+        return [self.segments[i] for i in self.grid.query(x, y, x + w, y + h)]
+
+    def move_body(self, body, box=FIGHTER_BOX):
+        """Advance body by its velocity, x then y, stopping at segments.
+
+        Solids block from every side; one-way floors only catch a body whose
+        feet were above them. Zeroes the blocked velocity component and
+        returns whether the body ended up standing on something.
+        """
+        bl, bt, br, bb = box
+        x, y, vx, vy = body.x, body.y, body.vel_x, body.vel_y
+        segments = self.segments
+
+        # Horizontal: walls and the sides of solid blocks
+        nx = x + vx
+        if vx:
+            for i in self.grid.query(min(x, nx) + bl, y + bt, max(x, nx) + br, y + bb):
+                left, top, right, bottom, kind = segments[i]
+                if kind != SOLID or y + bb <= top or y + bt >= bottom:
+                    continue
+                if vx > 0 and x + br <= left < nx + br:
+                    nx, vx = left - br, 0
+                elif vx < 0 and x + bl >= right > nx + bl:
+                    nx, vx = right - bl, 0
+
+        # Vertical: landing, head bumps, and standing still on a floor
+        ny = y + vy
+        grounded = False
+        for i in self.grid.query(nx + bl, min(y, ny) + bt, nx + br, max(y, ny) + bb + 1):
+            left, top, right, bottom, kind = segments[i]
+            if nx + br <= left or nx + bl >= right:
+                continue
+            if vy >= 0 and y + bb <= top <= ny + bb:
+                ny, vy, grounded = top - bb, 0, True
+            elif vy < 0 and kind == SOLID and y + bt >= bottom > ny + bt:
+                ny, vy = bottom - bt, 0
+
+        body.x, body.y, body.vel_x, body.vel_y = nx, ny, vx, vy
+        return grounded
+
+    def solid_at(self, x, y):
+        """Boolean mask of points inside solid segments; one-way floors let projectiles through"""
+        ids = self.grid.point_candidates(x, y)
+        valid = ids >= 0
+        rects = self.rects[np.where(valid, ids, 0)]
+        inside = (valid & (self.kinds[np.where(valid, ids, 0)] == SOLID)
+                  & (rects[..., 0] <= x[:, None]) & (x[:, None] < rects[..., 2])
+                  & (rects[..., 1] <= y[:, None]) & (y[:, None] < rects[..., 3]))
+        return inside.any(axis=1)
+
+def load_stages(path=STAGE_DATA_PATH):
+    """Stage name -> Stage from the stage data file"""
+    with open(path) as f:
+        data = json.load(f)
+    return {
+        name: Stage(name, spec["size"],
+                    [(KINDS[segment["kind"]], segment["rect"]) for segment in spec["segments"]],
+                    spec.get("spawns", ((300, 360), (900, 360))))
+        for name, spec in data.items()
+    }
+
+_stages = None
+
+def get_stage(name="arena"):
+    """Shared compiled stage; stages are static, so every match can use the same one"""
+    global _stages
+    if _stages is None:
+        _stages = load_stages()
+    return _stages[name]
+
+def generate_stage(count, size=(3840, 1440), seed=0):
+    """Flat arena plus count - 3 random platforms, for stress tests"""
+    rng = random.Random(seed)
+    width, height = size
+    segments = [
+        (SOLID, (0, height - 160, width, 160)),
+        (SOLID, (0, 0, 40, height)),
+        (SOLID, (width - 40, 0, 40, height))
+    ]
+    for _ in range(max(0, count - 3)):
+        w = rng.randint(60, 300)
+        kind = ONE_WAY if rng.random() < 0.7 else SOLID
+        segments.append((kind, (rng.randint(40, width - 40 - w), rng.randint(100, height - 260),
+                                w, 16 if kind == ONE_WAY else 40)))
+    return Stage(f"generated-{count}", size, segments, ((300, height - 190), (900, height - 190)))
+
+def benchmark(count=500, frames=20000):
+    """Per-fighter move cost on a flat stage vs a crowded one"""
+    class Body:
+        def __init__(self, x, y):
+            self.x, self.y, self.vel_x, self.vel_y = x, y, 0.0, 0.0
+
+    for stage in (generate_stage(3), generate_stage(count)):
+        rng = random.Random(1)
+        bodies = [Body(x, y) for x, y in stage.spawns]
+        start = time.perf_counter()
+        landings = 0
+        for frame in range(frames):
+            for body in bodies:
+                if frame % 60 == 0:
+                    body.vel_x = rng.uniform(-5, 5)
+                    body.vel_y = -10 if rng.random() < 0.5 else body.vel_y
+                body.vel_y += 0.5
+                landings += stage.move_body(body)
+        per_move = (time.perf_counter() - start) / (frames * len(bodies)) * 1e6
+        print(f"{len(stage.segments):4d} segments: {per_move:.2f} us per fighter move "
+              f"({landings / (frames * len(bodies)):.0%} grounded)")
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
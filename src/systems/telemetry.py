@@ -0,0 +1,276 @@
+"""Columnar combat telemetry log and offline analyzer
+
+Events are appended to preallocated column arrays; full buffers are
+handed to a background thread that writes them as column-major .sctl
+files. The analyzer memory-maps those files, so it never parses text.
+
+    python -m src.systems.telemetry analyze telemetry/
+"""
+import argparse
+import glob
+import os
+import queue
+import re
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"SCTL"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")  # magic, version, event count
+ALIGN = 8
+
+# Column name -> dtype, in on-disk order
+COLUMNS = (
+    ("frame", np.uint32),
+    ("result", np.uint8),     # AttackResult value
+    ("attacker", np.uint16),  # fighter.combat_id
+    ("defender", np.uint16),
+    ("weapon", np.uint8),     # WeaponType value
+    ("attack", np.int8),      # AttackType value
+    ("damage", np.float32),
+    ("combo", np.uint16)
+)
+
+# Mirrors AttackResult; kept here so the analyzer needs no pygame
+RESULT_NAMES = {1: "NORMAL", 2: "COUNTER", 3: "WHIFF", 4: "COMBO"}
+WHIFF = 3
+COMBO = 4
+
+# Files written by CombatTelemetry: combat-<session>-<sequence>.sctl
+SESSION_FILE = re.compile(r"combat-(.+)-\d+\.sctl$")
+
+DEFAULT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "telemetry"
+)
+
+def _padded(nbytes):
+    return (nbytes + ALIGN - 1) // ALIGN * ALIGN
+
+class EventBuffer:
+    """One preallocated block of columns"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS}
+        self.count = 0
+
+class CombatTelemetry:
+    """Appends combat events to columnar buffers, flushed on a background thread"""
+    def __init__(self, directory=DEFAULT_DIR, capacity=65536, buffers=4):
+        self.directory = directory
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.dropped = 0
+        self._sequence = 0
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        for _ in range(buffers):
+            self._free.put(EventBuffer(capacity))
+        self._current = self._free.get()
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._flush_loop, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def record(self, frame, result, attacker, defender, weapon, attack, damage, combo):
+        """Append one event; never blocks the game loop"""
+        buffer = self._current
+        if buffer is None:
+            buffer = self._next_buffer()
+            if buffer is None:
+                self.dropped += 1
+                return
+        i = buffer.count
+        columns = buffer.columns
+        columns["frame"][i] = frame
+        columns["result"][i] = result
+        columns["attacker"][i] = attacker
+        columns["defender"][i] = defender
+        columns["weapon"][i] = weapon
+        columns["attack"][i] = attack
+        columns["damage"][i] = damage
+        columns["combo"][i] = combo
+        buffer.count = i + 1
+        if buffer.count == buffer.capacity:
+            self._full.put(buffer)
+            self._current = None
+
+    def _next_buffer(self):
+        try:
+            self._current = self._free.get_nowait()
+        except queue.Empty:
+            return None
+        return self._current
+
+    def flush(self):
+        """Hand the partially filled buffer to the writer"""
+        if self._current is not None and self._current.count:
+            self._full.put(self._current)
+            self._current = None
+
+    def close(self):
+        self.flush()
+        self._full.put(None)
+        self._thread.join()
+        if self.dropped:
+            print(f"Telemetry dropped {self.dropped} events (writer fell behind)")
+
+    def _flush_loop(self):
+        while True:
+            buffer = self._full.get()
+            if buffer is None:
+                return
+            try:
+                self._write(buffer)
+            except OSError as e:
+                print(f"Telemetry write failed: {e}")
+            buffer.count = 0
+            self._free.put(buffer)
+
+    def _write(self, buffer):
+        name = f"combat-{self.session}-{self._sequence:05d}.sctl"
+        self._sequence += 1
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, buffer.count))
+            f.write(b"\0" * (_padded(HEADER.size) - HEADER.size))
+            for column, _ in COLUMNS:
+                data = buffer.columns[column][:buffer.count].tobytes()
+                f.write(data)
+                f.write(b"\0" * (_padded(len(data)) - len(data)))
+        os.replace(path + ".tmp", path)
+
+def open_events(path):
+    """Memory-map one .sctl file as a dict of read-only columns"""
+    with open(path, "rb") as f:
+        magic, version, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a v{VERSION} combat telemetry file")
+    columns = {}
+    offset = _padded(HEADER.size)
+    for name, dtype in COLUMNS:
+        if count:
+            columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            columns[name] = np.zeros(0, dtype=dtype)
+        offset += _padded(count * np.dtype(dtype).itemsize)
+    return columns
+
+def _combo_lengths(events):
+    """Hits per finished combo chain (opening hit included)"""
+    order = np.lexsort((events["frame"], events["attacker"]))
+    result = events["result"][order]
+    attacker = events["attacker"][order]
+    is_combo = result == COMBO
+    next_continues = np.zeros_like(is_combo)
+    next_continues[:-1] = is_combo[1:] & (attacker[1:] == attacker[:-1])
+    ends = is_combo & ~next_continues
+    return events["combo"][order][ends].astype(np.int64) + 1
+
+def session_of(path):
+    """Session a telemetry file belongs to; files not named by CombatTelemetry stand alone"""
+    match = SESSION_FILE.match(os.path.basename(path))
+    return match.group(1) if match else path
+
+def analyze(paths, fps=60):
+    """Aggregate DPS, whiff rates and combo lengths across telemetry files.
+
+    Frames and combat ids restart with every session, so play time and
+    combo chains are worked out per session (across all of its files) and
+    per-fighter stats are keyed by (session, combat id).
+    """
+    sessions = {}
+    for path in paths:
+        sessions.setdefault(session_of(path), []).append(path)
+
+    weapon_attempts = np.zeros(0, dtype=np.int64)
+    weapon_whiffs = np.zeros(0, dtype=np.int64)
+    combo_hist = np.zeros(0, dtype=np.int64)
+    results = np.zeros(max(RESULT_NAMES) + 1, dtype=np.int64)
+    dps, whiff_rate = {}, {}
+    seconds = 0.0
+    total = 0
+
+    def grow(acc, counts):
+        if len(counts) > len(acc):
+            acc = np.pad(acc, (0, len(counts) - len(acc)))
+        acc[:len(counts)] += counts
+        return acc
+
+    for session, files in sessions.items():
+        parts = [events for events in map(open_events, sorted(files)) if len(events["frame"])]
+        if not parts:
+            continue
+        if len(parts) == 1:
+            events = parts[0]
+        else:
+            events = {name: np.concatenate([part[name] for part in parts]) for name, _ in COLUMNS}
+        total += len(events["frame"])
+        attacker = events["attacker"]
+        is_whiff = events["result"] == WHIFF
+
+        span = (int(events["frame"].max()) - int(events["frame"].min()) + 1) / fps
+        seconds += span
+        damage = np.bincount(attacker, weights=events["damage"])
+        attempts = np.bincount(attacker)
+        whiffs = np.bincount(attacker, weights=is_whiff)
+        for i in np.flatnonzero(attempts):
+            dps[(session, int(i))] = float(damage[i] / span)
+            whiff_rate[(session, int(i))] = float(whiffs[i] / attempts[i])
+
+        weapon_attempts = grow(weapon_attempts, np.bincount(events["weapon"]))
+        weapon_whiffs = grow(weapon_whiffs,
+                             np.bincount(events["weapon"], weights=is_whiff).astype(np.int64))
+        combo_hist = grow(combo_hist, np.bincount(_combo_lengths(events)))
+        results = grow(results, np.bincount(events["result"]))
+
+    return {
+        "events": total,
+        "sessions": len(sessions),
+        "seconds": seconds,
+        "results": {RESULT_NAMES[i]: int(c) for i, c in enumerate(results) if i in RESULT_NAMES},
+        "dps": dps,
+        "whiff_rate": whiff_rate,
+        "weapon_whiff_rate": {i: float(weapon_whiffs[i] / weapon_attempts[i])
+                              for i in range(len(weapon_attempts)) if weapon_attempts[i]},
+        "combo_lengths": {i: int(c) for i, c in enumerate(combo_hist) if c}
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StickClash combat telemetry tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("analyze", help="Summarize .sctl telemetry files")
+    report.add_argument("paths", nargs="*", default=[DEFAULT_DIR],
+                        help="Files or directories (default: telemetry/)")
+    report.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.sctl"))))
+        else:
+            files.append(path)
+    if not files:
+        print("No telemetry files found")
+        return 1
+
+    start = time.perf_counter()
+    stats = analyze(files, fps=args.fps)
+    elapsed = time.perf_counter() - start
+
+    print(f"{stats['events']} events from {len(files)} files in {stats['sessions']} sessions "
+          f"({stats['seconds']:.1f}s of play) in {elapsed:.2f}s")
+    print("Results:", ", ".join(f"{k} {v}" for k, v in stats["results"].items()))
+    for (session, fighter), dps in stats["dps"].items():
+        print(f"  {session} fighter {fighter}: {dps:.2f} DPS, "
+              f"{stats['whiff_rate'][session, fighter]:.1%} whiffs")
+    for weapon, rate in stats["weapon_whiff_rate"].items():
+        print(f"  weapon {weapon}: {rate:.1%} whiffs")
+    print("Combo lengths:", ", ".join(f"{k} hits x{v}" for k, v in stats["combo_lengths"].items()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
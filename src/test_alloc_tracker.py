@@ -0,0 +1,81 @@
+"""AllocationTracker budgets and per-thread attribution"""
+import threading
+
+import pytest
+
+from src.systems.alloc_tracker import AllocationBudgetError, AllocationTracker
+
+class Hoarder:
+    """Keeps `per_call` new objects alive on every call"""
+    def __init__(self, per_call):
+        self.per_call = per_call
+        self.kept = []
+
+    def update(self):
+        self.kept.extend([object() for _ in range(self.per_call)])
+
+class Clean:
+    def update(self):
+        return sum([i for i in range(100)])
+
+@pytest.fixture
+def tracker():
+    tracker = AllocationTracker()
+    yield tracker
+    tracker.stop()
+
+def run_frames(tracker, systems, frames=10):
+    tracker.start()
+    for _ in range(frames):
+        for system in systems:
+            system.update()
+        tracker.end_frame()
+
+def test_within_budget_passes(tracker):
+    tracker.budgets = {"Clean.update": 5}
+    tracker.wrap(Clean, "update")
+    run_frames(tracker, [Clean()])
+    tracker.assert_within_budget()
+    assert tracker.summary()["Clean.update"][4] == 1.0  # One call per frame
+
+def test_over_budget_raises(tracker):
+    tracker.budgets = {"Hoarder.update": 5, "Clean.update": 5}
+    tracker.wrap(Hoarder, "update")
+    tracker.wrap(Clean, "update")
+    run_frames(tracker, [Hoarder(50), Clean()])
+    with pytest.raises(AllocationBudgetError, match="Hoarder.update") as error:
+        tracker.assert_within_budget()
+    assert "Clean.update" not in str(error.value)
+    assert [label for label, _, _ in tracker.check_budgets()] == ["Hoarder.update"]
+
+def test_allocations_go_to_the_innermost_system(tracker):
+    class Outer:
+        def __init__(self):
+            self.inner = Hoarder(50)
+
+        def update(self):
+            self.inner.update()
+
+    tracker.budgets = {"Outer.update": 5}
+    tracker.wrap(Outer, "update")
+    tracker.wrap(Hoarder, "update")
+    run_frames(tracker, [Outer()])
+    tracker.assert_within_budget()
+    assert tracker.summary()["Hoarder.update"][2] >= 50
+
+def test_calls_on_other_threads_keep_their_own_stack(tracker):
+    tracker.wrap(Hoarder, "update")
+    tracker.wrap(Clean, "update")
+    hoarder, clean = Hoarder(20), Clean()
+    tracker.start()
+    for _ in range(5):
+        worker = threading.Thread(target=lambda: [clean.update() for _ in range(50)])
+        worker.start()
+        hoarder.update()
+        worker.join()
+        tracker.end_frame()
+    summary = tracker.summary()
+    assert summary["Hoarder.update"][4] == 1.0
+    assert summary["Clean.update"][4] == 50.0
+    assert summary["Hoarder.update"][2] >= 20
+    assert summary["Clean.update"][2] < 5
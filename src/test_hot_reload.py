@@ -0,0 +1,68 @@
+"""Frame data hot reload: bad data files are skipped, good ones swap in"""
+import json
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+
+from src.systems.combat_system import CombatSystem
+from src.systems.frame_data import load_weapon_overrides
+from src.systems.hot_reload import FrameDataReloader
+
+BAD_OVERRIDES = [
+    [1, 2],
+    {"SWORD": 5},
+    {"SWORD": {"frames": [3, 3, 10]}},
+    {"SWORD": {"frames": {"light": [3, 3]}}},
+    {"SWORD": {"frames": {"light": [3, -1, 10]}}},
+]
+
+@pytest.fixture
+def reloader(tmp_path):
+    combat = CombatSystem()
+    return FrameDataReloader([combat], str(tmp_path / "fighters.json"), str(tmp_path / "weapons.json"))
+
+def write_overrides(reloader, overrides):
+    with open(reloader.paths[1], "w") as f:
+        json.dump(overrides, f)
+
+@pytest.mark.parametrize("overrides", BAD_OVERRIDES)
+def test_invalid_overrides_skip_the_reload(reloader, overrides):
+    combat = reloader.combat_systems[0]
+    tables = combat.frame_data
+    write_overrides(reloader, overrides)
+    assert reloader.reload() is False
+    assert reloader.apply() is False
+    assert combat.frame_data is tables
+    assert reloader.reloads == 0
+
+@pytest.mark.parametrize("overrides", BAD_OVERRIDES)
+def test_invalid_overrides_load_as_empty(tmp_path, overrides):
+    path = tmp_path / "weapons.json"
+    path.write_text(json.dumps(overrides))
+    assert load_weapon_overrides(str(path)) == {}
+
+def test_half_saved_file_skips_the_reload(reloader):
+    with open(reloader.paths[1], "w") as f:
+        f.write('{"SWORD": {"damage": ')
+    assert reloader.reload() is False
+    assert reloader.apply() is False
+
+def test_valid_overrides_swap_in_at_apply(reloader):
+    combat = reloader.combat_systems[0]
+    tables = combat.frame_data
+    write_overrides(reloader, {"SWORD": {"damage": 18, "frames": {"light": [3, 3, 10]}}})
+    assert reloader.reload() is True
+    assert combat.frame_data is tables  # Nothing changes until the frame boundary
+    assert reloader.apply() is True
+    assert combat.frame_data is not tables
+    assert reloader.reloads == 1
+    assert reloader.apply() is False
+
+def test_bad_save_after_good_one_keeps_the_pending_tables(reloader):
+    write_overrides(reloader, {"SWORD": {"damage": 18}})
+    assert reloader.reload() is True
+    write_overrides(reloader, {"SWORD": {"frames": {"light": "fast"}}})
+    assert reloader.reload() is False
+    assert reloader.apply() is True
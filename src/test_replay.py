@@ -0,0 +1,95 @@
+"""Replay recording, file round trip, determinism and keyframes"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from src.game.replay import HEADER, Replay, ReplayFormatError, ReplayPlayer
+from src.systems.input_system import (
+    HEAVY, JUMP, LEFT, LIGHT, RIGHT, SPECIAL, InputBuffer, apply_buttons, read_buttons
+)
+
+FRAMES = 360
+
+@pytest.fixture(scope="module", autouse=True)
+def pygame_session():
+    pygame.init()
+    yield
+    pygame.quit()
+
+@pytest.fixture(scope="module")
+def replay():
+    """A scrappy match: both players close in, then stand and mash attacks"""
+    rng = random.Random(7)
+    replay = Replay(seed=1234, names=("Ghostblade", None))
+    p1, p2 = InputBuffer(), InputBuffer()
+    for frame in range(FRAMES):
+        walk = frame < 62
+        apply_buttons(p1, (RIGHT if walk else 0) | rng.choice((0, 0, 0, LIGHT, HEAVY, SPECIAL)))
+        apply_buttons(p2, (LEFT if walk else 0) | rng.choice((0, 0, 0, LIGHT, HEAVY, JUMP)))
+        replay.record(p1, p2)
+    return replay
+
+def play(player, until=None):
+    """State after every step from the player's current frame on"""
+    states = []
+    while not player.done and (until is None or player.frame < until):
+        player.step()
+        render = player.render
+        states.append(repr((player.snapshot(), render.screen_shake, render.camera_offset, random.getstate())))
+    return states
+
+def test_buttons_round_trip():
+    buffer = InputBuffer()
+    for bits in range(64):
+        apply_buttons(buffer, bits)
+        assert read_buttons(buffer) == bits
+
+def test_file_round_trip(replay, tmp_path):
+    path = str(tmp_path / "match.scr")
+    replay.save(path)
+    loaded = Replay.load(path)
+    assert (loaded.seed, loaded.fps, loaded.names) == (replay.seed, replay.fps, replay.names)
+    assert loaded.buttons == replay.buttons
+    assert len(loaded) == FRAMES
+
+def test_load_rejects_bad_files(replay, tmp_path):
+    path = tmp_path / "match.scr"
+    replay.save(str(path))
+    data = path.read_bytes()
+    for name, content in (("short", data[:HEADER.size - 1]),
+                          ("magic", b"XXXX" + data[4:]),
+                          ("frames", data[:-4])):
+        bad = tmp_path / f"{name}.scr"
+        bad.write_bytes(content)
+        with pytest.raises(ReplayFormatError):
+            Replay.load(str(bad))
+
+def test_playback_is_deterministic(replay):
+    player = ReplayPlayer(replay)
+    first = play(player)
+    second = play(ReplayPlayer(replay))
+    assert len(first) == FRAMES
+    assert first == second
+    # Hits landed, so the comparison covered combat and not just walking
+    assert all(fighter.health.current_health < fighter.health.max_health for fighter in player.sim.fighters)
+
+def test_fighter_names_reach_the_simulation(replay):
+    player = ReplayPlayer(replay)
+    assert [fighter.name for fighter in player.sim.fighters] == list(replay.names)
+
+@pytest.mark.parametrize("start", [0, 1, 61, 97, 200])
+def test_keyframe_resumes_exactly(replay, start):
+    straight = play(ReplayPlayer(replay))
+    player = ReplayPlayer(replay)
+    play(player, until=start)
+    keyframe = player.keyframe()
+
+    resumed = ReplayPlayer(replay)
+    resumed.restore(keyframe)
+    assert resumed.frame == start
+    assert play(resumed) == straight[start:]
@@ -0,0 +1,154 @@
+"""Shared-memory game state: seqlock reads, input rings and block ownership"""
+import os
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.net.shared_state import (
+    BLOCK_SIZE, HEADER_DTYPE, MAGIC, RING_CAPACITY, VERSION,
+    SharedStateError, SharedStateReader, SharedStateWriter
+)
+from src.systems.input_system import HEAVY, JUMP, LEFT, LIGHT, RIGHT, InputBuffer, read_buttons
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def name():
+    return f"stickclash-test-{os.getpid()}"
+
+@pytest.fixture
+def writer(name):
+    writer = SharedStateWriter(name)
+    yield writer
+    writer.close()
+
+@pytest.fixture
+def reader(writer):
+    reader = SharedStateReader(writer.name)
+    yield reader
+    reader.close()
+
+def fake_fighter(value):
+    """Every published field derived from value, so a torn read shows up as a mismatch"""
+    return SimpleNamespace(
+        x=value, y=value, vel_x=value, vel_y=value, combat_id=-1, facing=1,
+        health=SimpleNamespace(current_health=value, max_health=value),
+        weapon=SimpleNamespace(cooldown=int(value), cooldown_max=int(value)),
+        state=SimpleNamespace(grounded=True, is_stunned=False, recovery_frames=int(value) % 65536)
+    )
+
+def test_reader_sees_published_frame(writer, reader):
+    writer.publish(7, [fake_fighter(1.0), fake_fighter(2.0)], None)
+    frame, published, fighters = reader.read()
+    assert frame == 7 and published > 0
+    assert list(fighters["x"]) == [1.0, 2.0]
+    assert list(fighters["attack"]) == [-1, -1]
+
+def test_reads_are_never_torn(writer, reader):
+    stop = threading.Event()
+
+    def publish():
+        frame = 1
+        while not stop.is_set():
+            writer.publish(frame, [fake_fighter(float(frame)), fake_fighter(float(frame))], None)
+            frame += 1
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    try:
+        for _ in range(5000):
+            frame, _, fighters = reader.read()
+            if frame:
+                assert np.all(fighters["x"] == frame)
+                assert np.all(fighters["health"] == fighters["vel_y"])
+    finally:
+        stop.set()
+        thread.join()
+    assert int(writer.header["seq"]) % 2 == 0
+
+def test_wait_frame_times_out(writer, reader):
+    writer.publish(3, [fake_fighter(0.0), fake_fighter(0.0)], None)
+    assert reader.wait_frame(3, timeout=0.01) is None
+    assert reader.wait_frame(2, timeout=0.01)[0] == 3
+
+def test_ring_polls_nothing_until_a_bot_sends(writer, reader):
+    buffer = InputBuffer(attack=True)
+    assert writer.inputs[1].poll(buffer) is False
+    assert buffer.attack  # Left alone for the keyboard
+    reader.inputs[1].push(LEFT)
+    assert writer.inputs[1].poll(buffer) is True
+    assert read_buttons(buffer) == LEFT
+
+def test_ring_keeps_latest_direction_and_every_press(writer, reader):
+    bot, game = reader.inputs[0], writer.inputs[0]
+    for bits in (LEFT | LIGHT, LEFT, RIGHT | JUMP, RIGHT):
+        assert bot.push(bits)
+    assert game.consume() == RIGHT | LIGHT | JUMP
+    # Directions are held until the bot says otherwise; presses are not
+    assert game.consume() == RIGHT
+    bot.push(HEAVY)
+    assert game.consume() == HEAVY
+
+def test_ring_refuses_pushes_when_full(writer, reader):
+    bot, game = reader.inputs[0], writer.inputs[0]
+    assert all(bot.push(LEFT, frame) for frame in range(RING_CAPACITY))
+    assert not bot.push(RIGHT)
+    assert game.consume() == LEFT
+    assert bot.push(RIGHT)
+    assert game.consume() == RIGHT
+
+def test_players_have_separate_rings(writer, reader):
+    reader.inputs[0].push(LEFT)
+    reader.inputs[1].push(RIGHT)
+    assert writer.inputs[0].consume() == LEFT
+    assert writer.inputs[1].consume() == RIGHT
+
+def test_reader_rejects_foreign_block(name):
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name, create=True, size=BLOCK_SIZE)
+    try:
+        with pytest.raises(SharedStateError):
+            SharedStateReader(name)
+        with pytest.raises(SharedStateError, match="not a version"):
+            SharedStateWriter(name)
+    finally:
+        block.close()
+        block.unlink()
+
+def test_second_writer_refuses_a_live_block(name):
+    code = (f"from src.net.shared_state import SharedStateWriter; w = SharedStateWriter({name!r}); "
+            f"print('up', flush=True); input(); w.close()")
+    game = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, env={**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"})
+    try:
+        assert game.stdout.readline().strip() == b"up"
+        with pytest.raises(SharedStateError, match=f"process {game.pid}"):
+            SharedStateWriter(name)
+        # The running game's block is untouched
+        reader = SharedStateReader(name)
+        assert int(reader.header["writer_pid"]) == game.pid
+        reader.close()
+    finally:
+        game.communicate(b"\n", timeout=10)
+
+def test_writer_replaces_a_stale_block(name):
+    from multiprocessing import shared_memory
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    # What a crashed game leaves behind: a valid block nobody is writing
+    block = shared_memory.SharedMemory(name, create=True, size=BLOCK_SIZE)
+    header = np.ndarray((), HEADER_DTYPE, block.buf, 0)
+    header["magic"], header["version"], header["writer_pid"], header["frame"] = MAGIC, VERSION, dead.pid, 99
+    del header
+    block.close()
+
+    writer = SharedStateWriter(name)
+    try:
+        assert int(writer.header["writer_pid"]) == os.getpid()
+        assert int(writer.header["frame"]) == 0  # A fresh block, not the stale one
+    finally:
+        writer.close()
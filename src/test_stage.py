@@ -0,0 +1,126 @@
+"""Stage collision: landing, one-way floors, walls and the segment grid"""
+import random
+
+import pytest
+
+from src.systems.stage import FIGHTER_BOX, ONE_WAY, SOLID, Stage, generate_stage
+
+BOTTOM = FIGHTER_BOX[3]
+TOP = FIGHTER_BOX[1]
+
+class Body:
+    def __init__(self, x, y, vel_x=0.0, vel_y=0.0):
+        self.x, self.y, self.vel_x, self.vel_y = x, y, vel_x, vel_y
+
+@pytest.fixture
+def stage():
+    return Stage("test", (1280, 720), [
+        (SOLID, (0, 600, 1280, 120)),     # Ground, top at y=600
+        (SOLID, (0, 0, 40, 720)),         # Left wall
+        (SOLID, (1240, 0, 40, 720)),      # Right wall
+        (ONE_WAY, (400, 400, 200, 16)),   # Platform, top at y=400
+        (SOLID, (800, 300, 200, 40)),     # Block, underside at y=340
+    ], cell_size=64)
+
+def fall(stage, body, frames=120, gravity=0.5):
+    grounded = False
+    for _ in range(frames):
+        if not grounded:
+            body.vel_y += gravity
+        grounded = stage.move_body(body)
+    return grounded
+
+def test_lands_on_ground_without_sinking(stage):
+    body = Body(200, 100)
+    assert fall(stage, body)
+    assert body.y + BOTTOM == 600
+    assert body.vel_y == 0
+
+def test_fast_fall_does_not_tunnel(stage):
+    body = Body(200, 500, vel_y=300)
+    assert stage.move_body(body)
+    assert body.y + BOTTOM == 600
+
+def test_standing_stays_grounded(stage):
+    body = Body(200, 600 - BOTTOM)
+    for _ in range(10):
+        assert stage.move_body(body)
+    assert body.y == 600 - BOTTOM
+
+def test_walking_off_a_ledge_falls(stage):
+    body = Body(590, 400 - BOTTOM, vel_x=5)
+    assert stage.move_body(body)  # Still over the platform edge
+    for _ in range(5):
+        grounded = stage.move_body(body)
+    assert not grounded
+
+def test_one_way_floor_catches_from_above(stage):
+    body = Body(500, 300)
+    assert fall(stage, body)
+    assert body.y + BOTTOM == 400
+
+def test_one_way_floor_lets_jumps_through(stage):
+    body = Body(500, 600 - BOTTOM, vel_y=-20)
+    peak = body.y
+    for _ in range(40):
+        body.vel_y += 0.5
+        stage.move_body(body)
+        peak = min(peak, body.y)
+    assert peak + BOTTOM < 400  # Feet rose above the platform
+    assert fall(stage, body)
+    assert body.y + BOTTOM == 400  # And came down on top of it
+
+def test_one_way_floor_does_not_block_sideways(stage):
+    # Feet below the platform top, walking through its side
+    body = Body(380, 410 - TOP, vel_x=10)
+    for _ in range(10):
+        body.vel_y = 0
+        stage.move_body(body)
+    assert body.x == 480
+
+def test_walls_stop_horizontal_movement(stage):
+    body = Body(1200, 600 - BOTTOM, vel_x=50)
+    stage.move_body(body)
+    assert body.x + FIGHTER_BOX[2] == 1240
+    assert body.vel_x == 0
+    body.vel_x = -2000
+    stage.move_body(body)
+    assert body.x + FIGHTER_BOX[0] == 40
+
+def test_solid_block_bumps_heads(stage):
+    body = Body(900, 600 - BOTTOM, vel_y=-45)
+    for _ in range(5):
+        stage.move_body(body)
+    assert body.y + TOP == 340
+    assert body.vel_y == 0
+
+def test_grid_query_matches_brute_force():
+    stage = generate_stage(300, seed=4)
+    rng = random.Random(4)
+    for _ in range(200):
+        x, y = rng.uniform(0, 3800), rng.uniform(0, 1400)
+        w, h = rng.uniform(1, 300), rng.uniform(1, 300)
+        near = set(stage.query((x, y, w, h)))
+        for segment in stage.segments:
+            left, top, right, bottom, _ = segment
+            if left <= x + w and x <= right and top <= y + h and y <= bottom:
+                assert segment in near
+
+def test_fighters_land_and_jump_in_a_match():
+    from src.game.simulation import Simulation
+    from src.systems.input_system import InputBuffer
+
+    sim = Simulation()
+    idle, jump = (InputBuffer(), InputBuffer()), (InputBuffer(jump=True), InputBuffer())
+    for _ in range(240):
+        sim.step(idle)
+    p1 = sim.fighters[0]
+    assert all(f.state.grounded for f in sim.fighters)
+    floor = p1.y
+    sim.step(jump)
+    heights = []
+    for _ in range(120):
+        sim.step(idle)
+        heights.append(p1.y)
+    assert min(heights) < floor - 50
+    assert p1.state.grounded and p1.y == floor